@@ -45,6 +45,10 @@ setup(
         "stackprinter",
         "typing-extensions"
     ],
+    extras_require={  # Optional
+        "columnar": ["numpy"],
+        "orjson": ["orjson"],
+    },
     entry_points={  # Optional
         'console_scripts': [
             'crypto-dom-tests=tests.run:run_tests',
@@ -0,0 +1,21 @@
+import os
+
+from crypto_dom._lazy import attach
+
+
+# exchange packages are imported on first access
+__getattr__, __dir__ = attach(__name__, __path__)
+
+
+def install_stackprinter(style: str = "darkbg2") -> None:
+    """Format uncaught exceptions with stackprinter
+
+    Opt-in, modules no longer install the hook at import time.
+    Also installed on import if the `CRYPTO_DOM_STACKPRINTER` environment variable is set.
+    """
+    import stackprinter
+    stackprinter.set_excepthook(style=style)
+
+
+if os.environ.get("CRYPTO_DOM_STACKPRINTER"):
+    install_stackprinter()
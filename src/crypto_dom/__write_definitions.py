@@ -0,0 +1,24 @@
+import typing
+
+
+def _write_literal_definitions(filename: str, name: str, values: typing.Iterable[str]):
+    """write a module defining the type `name`, restricted to `values`
+
+    Static type checkers see a `Literal` of all values, at runtime the type is a `HashedLiteral`
+    of the same values (membership checked with a hash lookup instead of a Literal of thousands of values)
+    """
+
+    lines = [f"{4*' '}'{str(x)}',\n" for x in values]
+
+    with open(filename, "w") as file:
+        file.write("# This file is auto-generated\n\n")
+        file.write("import typing\n\n")
+        file.write("from typing_extensions import Literal\n\n")
+        file.write("from crypto_dom.definitions import hashed_literal\n\n\n")
+        file.write(f"_{name} = Literal[\n")
+        file.writelines(lines)
+        file.write("]\n\n")
+        file.write("if typing.TYPE_CHECKING:\n")
+        file.write(f"    {name} = _{name}\n")
+        file.write("else:\n")
+        file.write(f"    {name} = hashed_literal(\"{name}\", _{name}.__args__)\n")
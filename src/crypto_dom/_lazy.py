@@ -0,0 +1,62 @@
+import importlib
+import pkgutil
+import sys
+import typing
+
+
+# ============================================================
+# LAZY PACKAGES
+# ============================================================
+
+
+# Endpoint modules import pydantic and the (large) symbol/pair definitions.
+# Packages only load them on first attribute access (PEP 562 module `__getattr__`),
+# so `import crypto_dom.kraken` stays cheap for short lived processes.
+
+
+def attach(
+        package: str,
+        path: typing.Iterable[str],
+        attributes: typing.Optional[typing.Mapping[str, str]] = None
+    ) -> typing.Tuple[typing.Callable[[str], typing.Any], typing.Callable[[], typing.List[str]]]:
+    """`__getattr__` and `__dir__` for a lazy package
+
+    Args:
+    -----
+        package : str
+            Name of the package (`__name__`)
+        path : Iterable[str]
+            Path of the package (`__path__`), public submodules are imported on first access
+        attributes : Mapping[str, str]
+            Attribute names mapped to the module defining them (optional)
+
+    Usage:
+    ------
+        __getattr__, __dir__ = attach(__name__, __path__, {"ErrorResponse": "crypto_dom.kraken._response"})
+    """
+
+    attributes = dict(attributes or {})
+    submodules: typing.Optional[typing.FrozenSet[str]] = None
+
+    def _submodules() -> typing.FrozenSet[str]:
+        nonlocal submodules
+        if submodules is None:
+            submodules = frozenset(m.name for m in pkgutil.iter_modules(path) if not m.name.startswith("_"))
+        return submodules
+
+    def __getattr__(name: str) -> typing.Any:
+        if name in attributes:
+            value = getattr(importlib.import_module(attributes[name]), name)
+        elif name in _submodules():
+            value = importlib.import_module(f"{package}.{name}")
+        else:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+        # next lookups do not go through `__getattr__`
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> typing.List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(attributes) | _submodules())
+
+    return __getattr__, __dir__
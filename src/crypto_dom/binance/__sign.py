@@ -1,13 +1,15 @@
-import time
 from urllib.parse import urlencode
 import hashlib
 import hmac
 import os
+import typing
 
 
 from dotenv import load_dotenv
 load_dotenv()
 
+from crypto_dom.binance.clock import ClockSync, CLOCK
+
 
 class EmptyEnv(Exception):
     pass
@@ -17,7 +19,6 @@ def get_keys():
     
     environ = {k: v for k, v in dict(os.environ).items()}
     creds = {k: v for k, v in environ.items() if any(i in k for i in ["BINANCE_API_KEY", "BINANCE_API_SECRET"])}
-    print("Env Creds", creds)
 
     if not creds:
         raise EmptyEnv("Missing credentiels in .env file")
@@ -29,12 +30,9 @@ def get_keys():
         if "KEY" in k:
             # TODO length for api-key is always the same, same for api-secret
             # TODO we should test for the length to make sure the user has pasted the full key
-            # print("Length of key/secret", v, len(v))
             pair = (v, creds[k.replace("API_KEY", "API_SECRET")])
             key_pairs.add(pair)
 
-    # print('Returned set', key_pairs)
-    
     # returns a set of tuples (key, secret)
     return key_pairs
 
@@ -42,10 +40,7 @@ def get_keys():
 # see: https://binance-docs.github.io/apidocs/spot/en/#signed-trade-user_data-and-margin-endpoint-security
 def auth_signature(url: str, data: dict, *, secret: str):
 
-    sorted_data = sorted([(k, v) for k, v in data.items()], reverse=False)
-    # print("Sorted data", sorted_data, "\n")
-    postdata = urlencode(sorted_data)
-    # print("Query String", postdata, "\n")
+    postdata = urlencode(sorted(data.items()))
     signature = hmac.new(
             secret.encode(),
             postdata.encode(),
@@ -56,12 +51,8 @@ def auth_signature(url: str, data: dict, *, secret: str):
 
 
 def auth_payload(url: str, data: dict, *, secret: str):
-    sorted_data = sorted([(k, v) for k, v in data.items()], reverse=False)
-    sig = auth_signature(url, data, secret=secret)
-    sorted_data.append(("signature", sig))
 
-    print("Query String", sorted_data, "\n")
-    return sorted_data 
+    return [*sorted(data.items()), ("signature", auth_signature(url, data, secret=secret))]
 
 
 def auth_headers(key: str):
@@ -70,5 +61,66 @@ def auth_headers(key: str):
     }
 
 
-def auth_timestamp():
-    return int(time.time()*10**3)
\ No newline at end of file
+def auth_timestamp(clock: typing.Optional[ClockSync] = None):
+    "server time in milliseconds, estimated by `clock` (default = the shared `binance.clock.CLOCK`)"
+    return (clock or CLOCK).timestamp()
+
+
+# methods sending the signed payload as query string, others send it as body
+_QUERY_METHODS = frozenset(["GET", "DELETE"])
+
+
+class Signer:
+    """Signs Binance SIGNED requests with one API key
+
+    The payload is urlencoded once, in the given order, and the signature
+    (from a copy of the keyed HMAC) is appended to those exact bytes.
+    Parameters already in the query string of the url are signed with the payload.
+
+    Usage:
+    ------
+        signer = Signer(key, secret)
+        r = await client.safe_request(METHOD, URL, t_in=Request, t_out=BinanceFull(Response()), params={**params, "timestamp": auth_timestamp()}, signer=signer)
+
+    Note:
+    -----
+        `timestamp` (and `recvWindow`) are part of the payload, they are not added by the signer.
+    """
+
+    __slots__ = ("key", "_hmac")
+
+    def __init__(self, key: str, secret: str):
+        self.key = key
+        self._hmac = hmac.new(secret.encode(), digestmod=hashlib.sha256)
+
+    def signature(self, payload: bytes) -> str:
+        signature = self._hmac.copy()
+        signature.update(payload)
+        return signature.hexdigest()
+
+    def sign(
+            self,
+            method: str,
+            url: str,
+            data: typing.Mapping,
+            headers: typing.Optional[typing.Mapping] = None,
+        ) -> typing.Tuple[str, typing.Optional[bytes], typing.Dict[str, str]]:
+        "(url, body, headers) of the request to send"
+
+        headers = {**(headers or {}), **auth_headers(self.key)}
+
+        # the signature covers the query string of the url too (`totalParams` in the doc)
+        base, _, query = url.partition("?")
+        payload = urlencode(data)
+
+        if method.upper() in _QUERY_METHODS:
+            payload = "&".join(filter(None, (query, payload)))
+            signature = self.signature(payload.encode())
+            return f"{base}?{payload}&signature={signature}" if payload else f"{base}?signature={signature}", None, headers
+
+        signature = self.signature(f"{query}{payload}".encode())
+        payload = f"{payload}&signature={signature}" if payload else f"signature={signature}"
+        return url, payload.encode(), {**headers, "Content-Type": "application/x-www-form-urlencoded"}
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}:{self.key[:8]}...>"
@@ -3,6 +3,7 @@ import json
 
 import httpx
 
+from crypto_dom.__write_definitions import _write_literal_definitions
 from crypto_dom.binance.market_data.exchange_info import URL
 
 
@@ -19,12 +20,7 @@ async def _write_binance_assets(folder):
         with open(f'{folder}_data_assets.json', 'w') as file:
             json.dump(symbols_data, file)
         
-        with open(f"{folder}_definitions_assets.py", "w") as file:
-            file.write("# This file is auto-generated\n\n")
-            file.write("from typing_extensions import Literal\n\n")
-            file.write("ASSET = Literal[\n")
-            file.writelines(map(lambda x: f"{4*' '}'{str(x)}',\n", assets))
-            file.write("]")
+        _write_literal_definitions(f"{folder}_definitions_assets.py", "ASSET", assets)
 
 
 if __name__ == "__main__":
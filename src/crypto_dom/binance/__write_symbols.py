@@ -3,7 +3,79 @@ import json
 
 import httpx
 
+from crypto_dom.__write_definitions import _write_literal_definitions
 from crypto_dom.binance.market_data.exchange_info import URL
+from crypto_dom.symbol_store import write_store
+
+
+# binary store fields (see `crypto_dom.symbol_store`)
+# filters are flattened, fields missing for a symbol are stored as missing
+_SYMBOL_FIELDS = [
+    ("symbol", "str"),
+    ("status", "str"),
+    ("baseAsset", "asset"),
+    ("quoteAsset", "asset"),
+    ("baseAssetPrecision", "u8"),
+    ("quotePrecision", "u8"),
+    ("quoteAssetPrecision", "u8"),
+    ("baseCommissionPrecision", "u8"),
+    ("quoteCommissionPrecision", "u8"),
+    ("icebergAllowed", "bool"),
+    ("ocoAllowed", "bool"),
+    ("quoteOrderQtyMarketAllowed", "bool"),
+    ("isSpotTradingAllowed", "bool"),
+    ("isMarginTradingAllowed", "bool"),
+    # PRICE_FILTER
+    ("minPrice", "dec"),
+    ("maxPrice", "dec"),
+    ("tickSize", "dec"),
+    # PERCENT_PRICE
+    ("multiplierUp", "dec"),
+    ("multiplierDown", "dec"),
+    ("avgPriceMins", "i32"),
+    # LOT_SIZE
+    ("minQty", "dec"),
+    ("maxQty", "dec"),
+    ("stepSize", "dec"),
+    # MIN_NOTIONAL
+    ("minNotional", "dec"),
+    ("applyToMarket", "bool"),
+    ("notionalAvgPriceMins", "i32"),
+    # ICEBERG_PARTS
+    ("icebergParts", "i32"),
+    # MARKET_LOT_SIZE
+    ("marketMinQty", "dec"),
+    ("marketMaxQty", "dec"),
+    ("marketStepSize", "dec"),
+    # MAX_NUM_ORDERS, MAX_NUM_ALGO_ORDERS, MAX_POSITION
+    ("maxNumOrders", "i32"),
+    ("maxNumAlgoOrders", "i32"),
+    ("maxPosition", "dec"),
+]
+
+
+# filter keys that clash between filters
+_FILTER_RENAMES = {
+    ("MIN_NOTIONAL", "avgPriceMins"): "notionalAvgPriceMins",
+    ("ICEBERG_PARTS", "limit"): "icebergParts",
+    ("MARKET_LOT_SIZE", "minQty"): "marketMinQty",
+    ("MARKET_LOT_SIZE", "maxQty"): "marketMaxQty",
+    ("MARKET_LOT_SIZE", "stepSize"): "marketStepSize",
+}
+
+
+def _symbol_row(symbol_data: dict) -> dict:
+    row = {k: v for k, v in symbol_data.items() if k != "filters"}
+    for _filter in symbol_data["filters"]:
+        for k, v in _filter.items():
+            if k != "filterType":
+                row[_FILTER_RENAMES.get((_filter["filterType"], k), k)] = v
+    return row
+
+
+def _write_binance_symbols_store(filename: str, symbols_data: list):
+    write_store(filename, "binance_symbols", "symbol", _SYMBOL_FIELDS, map(_symbol_row, symbols_data))
+
 
 async def _write_binance_symbols(folder):
 
@@ -16,13 +88,11 @@ async def _write_binance_symbols(folder):
         with open(f"{folder}_data_symbols.json", "w") as file:
             json.dump(symbols_data, file)
 
-        with open(f"{folder}_definitions_symbols.py", "w") as file:
-            file.write("# This file is auto-generated\n\n")
-            file.write("from typing_extensions import Literal\n\n")
-            file.write("SYMBOL = Literal[\n")
-            file.writelines(map(lambda x: f"{4*' '}'{str(x)}',\n", symbols_list))
-            file.write("]")
+        # binary store
+        _write_binance_symbols_store(f"{folder}_data_symbols.bin", symbols_data)
+
+        _write_literal_definitions(f"{folder}_definitions_symbols.py", "SYMBOL", symbols_list)
 
 
 if __name__ == "__main__":
-    asyncio.run(_write_binance_symbols())
\ No newline at end of file
+    asyncio.run(_write_binance_symbols())
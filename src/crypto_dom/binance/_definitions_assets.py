@@ -1,8 +1,13 @@
 # This file is auto-generated
 
+import typing
+
 from typing_extensions import Literal
 
-ASSET = Literal[
+from crypto_dom.definitions import hashed_literal
+
+
+_ASSET = Literal[
     'BNBDOWN',
     'AAVEDOWN',
     'LEND',
@@ -430,4 +435,9 @@ ASSET = Literal[
     'APPC',
     'XRPUP',
     'RSR',
-]
\ No newline at end of file
+]
+
+if typing.TYPE_CHECKING:
+    ASSET = _ASSET
+else:
+    ASSET = hashed_literal("ASSET", _ASSET.__args__)
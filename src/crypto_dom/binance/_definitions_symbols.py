@@ -1,8 +1,13 @@
 # This file is auto-generated
 
+import typing
+
 from typing_extensions import Literal
 
-SYMBOL = Literal[
+from crypto_dom.definitions import hashed_literal
+
+
+_SYMBOL = Literal[
     'ETHBTC',
     'LTCBTC',
     'BNBBTC',
@@ -1508,4 +1513,9 @@ SYMBOL = Literal[
     'KEEPBNB',
     'KEEPBUSD',
     'KEEPUSDT',
-]
\ No newline at end of file
+]
+
+if typing.TYPE_CHECKING:
+    SYMBOL = _SYMBOL
+else:
+    SYMBOL = hashed_literal("SYMBOL", _SYMBOL.__args__)
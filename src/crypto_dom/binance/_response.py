@@ -0,0 +1,102 @@
+import typing
+
+import pydantic
+
+from crypto_dom.result import Err, Ok
+from crypto_dom.validation import MODE, ValidationPolicy, get_policy
+
+
+
+class ErrorResponse(pydantic.BaseModel):
+    """Error Model for API and SAPI endpoints
+
+    Note:
+    -----
+        Different for WAPI !!!
+    """
+
+    code: int
+    msg: str
+
+
+
+class BinanceFull:
+    """Full response model (error or result) for Binance endpoints
+
+    Args:
+    -----
+        success_model :
+            Response model of the endpoint
+        validation : str enum or ValidationPolicy
+            [strict, sampled, trusted] (optional)
+            default = strict, every response is fully validated
+
+    Usage:
+    ------
+        model = BinanceFull(Response(), validation="trusted")
+        result = model(JSON_response_content)
+    """
+
+    def __init__(self, success_model, validation: typing.Union[MODE, ValidationPolicy] = "strict"):
+        self.success_model = success_model
+        self.validation = get_policy(validation)
+
+    def __call__(self, full_response: dict):
+        
+        # check if response is a dict
+        # if its a list we know for sure it was not an error
+        if hasattr(full_response, "keys"):
+            # check if response is an error
+            if "code" in full_response.keys():
+                if full_response["msg"]:
+                    try:
+                        _err = ErrorResponse(**full_response)
+                        return Err(_err)
+
+                    except pydantic.ValidationError as e:
+                        return Err(e)
+
+                else:
+                    return Err(f"No error message : {full_response}")
+            
+            elif not full_response:
+                return Err(f"Empty response: {full_response}")
+
+
+        # its either a list, or a dict that isnt an error msg
+        if True:
+            try:
+                # pydantic models are unpacked, wrappers around pydantic that we defined are called
+                # depending on the policy, the result might be built without validation
+                _res = self.validation(self.success_model, full_response)
+                return Ok(_res)
+
+            except pydantic.ValidationError as e:
+                return Err(e)
+    
+
+if __name__ == "__main__":
+
+    import asyncio
+    import httpx
+    from crypto_dom.binance.market_data.depth import METHOD, URL, Request, Response
+
+    payload = {
+        "symbol": "DOTUSDT",
+        "limit": 10
+    }
+
+    async def book():
+        async with httpx.AsyncClient() as client:
+
+            r = await client.request(METHOD, URL, params=payload)
+            rjson = r.json()
+
+            try:
+                _model = BinanceFull(Response())
+                _valid = _model(rjson)
+                print(_valid)
+            except pydantic.ValidationError as e:
+                print(e)
+
+    asyncio.run(book())
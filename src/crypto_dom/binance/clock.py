@@ -0,0 +1,221 @@
+import asyncio
+import collections
+import math
+import time
+import typing
+
+from crypto_dom.result import Result, Err
+from crypto_dom.binance._response import BinanceFull
+from crypto_dom.binance.market_data import check_server_time
+
+
+# ============================================================
+# CLOCK SYNC
+# ============================================================
+
+
+# doc: https://binance-docs.github.io/apidocs/spot/en/#timing-security
+#
+# A SIGNED request is rejected with -1021 if its `timestamp` is more than 1000ms ahead
+# of the server time, or older than `recvWindow` (default 5000ms) when it is received.
+# With a skewed local clock, every signed request fails, or only those with a long round trip.
+#
+# Each probe of the server time gives a sample:
+#   round trip : received - sent
+#   offset     : server time - (sent + received) / 2
+# The offset error of a sample is at most half its round trip, so the estimate follows
+# the sample with the shortest round trip of the last `window` ones (NTP clock filter),
+# smoothed with an exponential moving average. The jitter is the RMS distance
+# of the window offsets to the estimate.
+
+
+# recvWindow bounds accepted by the exchange (see `definitions.RECV_WINDOW`)
+MIN_RECV_WINDOW = 1000
+MAX_RECV_WINDOW = 60000
+
+
+class _Sample(typing.NamedTuple):
+    round_trip: float
+    offset: float
+
+
+class ClockSync:
+    """Estimate of the offset between the local clock and the Binance server time
+
+    Args:
+    -----
+        window : int
+            Samples kept for the clock filter and jitter (default = 8)
+        alpha : float
+            Smoothing factor of the offset, 1 = no smoothing (default = 0.3)
+        clock : Callable[[], float]
+            Local time in seconds
+            default = time.time
+
+    Counters:
+    ---------
+        offset : float
+            Seconds to add to the local time to get the server time
+        round_trip : float
+            Seconds, round trip of the sample followed by the estimate
+        jitter : float
+            Seconds
+        samples : int
+
+    Usage:
+    ------
+        clock = ClockSync()
+        async with HttypeClient.httpx() as client:
+            await clock.start(client)
+            params = {..., "timestamp": clock.timestamp(), "recvWindow": clock.recv_window()}
+            ...
+            await clock.stop()
+
+        # signed payloads built with `binance.__sign.auth_timestamp` use the shared `CLOCK`
+        await CLOCK.start(client)
+
+    Note:
+    -----
+        Until the first sample, the offset is 0 and timestamps are the local time.
+        Server times can also be given with `observe`, for ex from a fresh exchangeInfo response,
+        but not from a cached one.
+    """
+
+    def __init__(
+            self,
+            window: int = 8,
+            alpha: float = 0.3,
+            clock: typing.Callable[[], float] = time.time,
+        ):
+        if window < 1:
+            raise ValueError(f"window must be a positive integer - Given: {window}")
+        if not 0 < alpha <= 1:
+            raise ValueError(f"alpha must be in ]0, 1] - Given: {alpha}")
+
+        self.alpha = alpha
+        self.clock = clock
+
+        self.offset = 0.0
+        self.round_trip = 0.0
+        self.jitter = 0.0
+        self.samples = 0
+
+        self._window: typing.Deque[_Sample] = collections.deque(maxlen=window)
+        self._task: typing.Optional[asyncio.Task] = None
+
+    # ---- estimate
+
+    def observe(self, sent: float, server_time: int, received: float) -> None:
+        """add a sample
+
+        Args:
+        -----
+            sent, received : float
+                Local times (seconds, from `clock`) around the request
+            server_time : int
+                Server time in milliseconds
+        """
+
+        round_trip = received - sent
+        if round_trip < 0:
+            return
+
+        self._window.append(_Sample(round_trip, server_time / 1000 - (sent + received) / 2))
+        best = min(self._window)
+
+        if not self.samples:
+            self.offset = best.offset
+        else:
+            self.offset += self.alpha * (best.offset - self.offset)
+        self.round_trip = best.round_trip
+        self.jitter = math.sqrt(sum((s.offset - self.offset) ** 2 for s in self._window) / len(self._window))
+        self.samples += 1
+
+    def now(self) -> float:
+        "estimated server time, seconds"
+        return self.clock() + self.offset
+
+    def timestamp(self) -> int:
+        "estimated server time, milliseconds"
+        return int(self.now() * 1000)
+
+    def recv_window(self, factor: float = 4.0, margin: int = 100) -> int:
+        """recvWindow (milliseconds) covering the delivery delay of a request
+
+        a round trip (half for the delivery, half for the offset error)
+        + `factor` * jitter + `margin` milliseconds, within the bounds of the exchange
+        """
+
+        window = math.ceil((self.round_trip + factor * self.jitter) * 1000) + margin
+        return min(max(window, MIN_RECV_WINDOW), MAX_RECV_WINDOW)
+
+    # ---- probes
+
+    async def sync(self, client) -> Result:
+        """probe the server time once with `client` (see `crypto_dom.client.HttypeClient`)
+
+        Returns the Result of the request
+        """
+
+        sent = self.clock()
+        result = await client.safe_request(
+            check_server_time.METHOD, check_server_time.URL,
+            t_out=BinanceFull(check_server_time.Response()), coalesce=False
+        )
+        received = self.clock()
+
+        if result.is_ok():
+            content = result.value.safe_content
+            if isinstance(content, Err):
+                return content
+            self.observe(sent, content.value.serverTime, received)
+        return result
+
+    async def start(self, client, interval: float = 60.0, burst: int = 4) -> None:
+        """fill the window with `burst` probes, then probe every `interval` seconds in the background
+
+        Failed probes are skipped
+        """
+
+        for _ in range(burst):
+            await self.sync(client)
+
+        self._cancel()
+        self._task = asyncio.ensure_future(self._run(client, interval))
+
+    async def _run(self, client, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await self.sync(client)
+
+    def _cancel(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def stop(self) -> None:
+        "stop the background probes"
+
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def stats(self) -> typing.Dict[str, typing.Union[int, float]]:
+        return {
+            "offset": self.offset,
+            "round_trip": self.round_trip,
+            "jitter": self.jitter,
+            "samples": self.samples,
+            "recv_window": self.recv_window(),
+        }
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}:offset {self.offset*1000:+.1f}ms rtt {self.round_trip*1000:.1f}ms jitter {self.jitter*1000:.1f}ms>"
+
+
+# shared by `binance.__sign.auth_timestamp`
+CLOCK = ClockSync()
@@ -0,0 +1,59 @@
+from typing_extensions import Literal
+
+
+# doc: https://binance-docs.github.io/apidocs/spot/en/#error-codes
+
+ERROR_CODE = Literal[
+    # General server or network issues
+    -1000,      # UNKNOWN
+    -1001,      # DISCONNECTED: internal error, unable to process the request, try again
+    -1002,      # UNAUTHORIZED
+    -1003,      # TOO_MANY_REQUESTS: too many requests queued, or request weight limit exceeded
+    -1006,      # UNEXPECTED_RESP: the execution status is unknown
+    -1007,      # TIMEOUT: timeout waiting for the backend server, the execution status is unknown
+    -1014,      # UNKNOWN_ORDER_COMPOSITION
+    -1015,      # TOO_MANY_ORDERS: order rate limit exceeded
+    -1016,      # SERVICE_SHUTTING_DOWN
+    -1020,      # UNSUPPORTED_OPERATION
+    -1021,      # INVALID_TIMESTAMP: timestamp outside of the recvWindow, or ahead of the server time
+    -1022,      # INVALID_SIGNATURE
+
+    # Request issues
+    -1100,      # ILLEGAL_CHARS
+    -1101,      # TOO_MANY_PARAMETERS
+    -1102,      # MANDATORY_PARAM_EMPTY_OR_MALFORMED
+    -1103,      # UNKNOWN_PARAM
+    -1104,      # UNREAD_PARAMETERS
+    -1105,      # PARAM_EMPTY
+    -1106,      # PARAM_NOT_REQUIRED
+    -1111,      # BAD_PRECISION
+    -1112,      # NO_DEPTH
+    -1114,      # TIF_NOT_REQUIRED
+    -1115,      # INVALID_TIF
+    -1116,      # INVALID_ORDER_TYPE
+    -1117,      # INVALID_SIDE
+    -1118,      # EMPTY_NEW_CL_ORD_ID
+    -1119,      # EMPTY_ORG_CL_ORD_ID
+    -1120,      # BAD_INTERVAL
+    -1121,      # BAD_SYMBOL
+    -1125,      # INVALID_LISTEN_KEY
+    -1127,      # MORE_THAN_XX_HOURS
+    -1128,      # OPTIONAL_PARAMS_BAD_COMBO
+    -1130,      # INVALID_PARAMETER
+
+    # Order issues
+    -2010,      # NEW_ORDER_REJECTED
+    -2011,      # CANCEL_REJECTED
+    -2013,      # NO_SUCH_ORDER
+    -2014,      # BAD_API_KEY_FMT
+    -2015,      # REJECTED_MBX_KEY
+    -2016,      # NO_TRADING_WINDOW
+]
+
+
+# the request was not processed, it can be sent again
+RATE_LIMIT_CODES = frozenset([-1003, -1015])
+NOT_PROCESSED_CODES = frozenset([-1001, -1016, -1021])
+
+# the request may have been executed
+UNKNOWN_STATUS_CODES = frozenset([-1000, -1006, -1007])
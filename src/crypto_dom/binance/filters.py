@@ -0,0 +1,383 @@
+import typing
+from decimal import Decimal, ROUND_CEILING, ROUND_FLOOR, ROUND_HALF_EVEN
+
+from typing_extensions import Literal
+
+from crypto_dom.columnar import require_numpy
+
+
+# ============================================================
+# PRE-TRADE FILTERS
+# ============================================================
+
+
+# doc: https://binance-docs.github.io/apidocs/spot/en/#filters
+
+# Symbol filters from `exchangeInfo` (PRICE_FILTER, LOT_SIZE, MIN_NOTIONAL ...) are compiled
+# into integer ticks and steps, so orders can be checked and quantized before sending them,
+# instead of finding out from the exchange rejecting the order.
+#
+# Prices and quantities are converted to integers in units of 10**-decimals,
+# where decimals is the largest number of decimals of the symbol's price (or quantity) filters.
+#
+# Filters depending on account state (MAX_NUM_ORDERS, MAX_NUM_ALGO_ORDERS, MAX_POSITION)
+# are not checked.
+
+
+ROUNDING = Literal["down", "up", "nearest"]
+
+_ROUNDING = {"down": ROUND_FLOOR, "up": ROUND_CEILING, "nearest": ROUND_HALF_EVEN}
+
+
+class FilterError(ValueError):
+    """Order does not pass the symbol filters
+
+    Attributes:
+    -----------
+        symbol : str
+        violations : Tuple[Tuple[str, str], ...]
+            (filterType, message) for each failed filter
+    """
+
+    def __init__(self, symbol: str, violations: typing.Sequence[typing.Tuple[str, str]]):
+        self.symbol = symbol
+        self.violations = tuple(violations)
+        super().__init__(f"{symbol} order does not pass filters: " + "; ".join(f"{f}: {m}" for f, m in self.violations))
+
+
+class GridQuantized(typing.NamedTuple):
+    "Quantized order grid, `valid` flags the orders passing price, lot size and notional filters"
+    prices: "np.ndarray"
+    quantities: "np.ndarray"
+    valid: "np.ndarray"
+
+
+def _decimals(*values: typing.Optional[Decimal]) -> int:
+    return max([-v.normalize().as_tuple().exponent for v in values if v is not None] + [0])
+
+
+def _units(value: typing.Any, decimals: int) -> typing.Optional[int]:
+    "`value` in units of 10**-decimals, None if it has more decimals"
+    scaled = Decimal(value).scaleb(decimals)
+    integral = scaled.to_integral_value()
+    if scaled != integral:
+        return None
+    return int(integral)
+
+
+class _Range:
+    "min, max and step (integer units) of a price or quantity filter, 0 means no constraint"
+
+    __slots__ = ("min", "max", "step")
+
+    def __init__(self, min_: typing.Any, max_: typing.Any, step: typing.Any, decimals: int):
+        self.min = _units(min_ or 0, decimals)
+        self.max = _units(max_ or 0, decimals)
+        self.step = _units(step or 0, decimals)
+
+    def errors(self, units: typing.Optional[int], name: str, value: typing.Any) -> typing.List[str]:
+        errors = []
+        if units is None:
+            return [f"{name} {value} has too many decimals"]
+        if self.min and units < self.min:
+            errors.append(f"{name} {value} is below minimum")
+        if self.max and units > self.max:
+            errors.append(f"{name} {value} is above maximum")
+        if self.step and (units - self.min) % self.step:
+            errors.append(f"{name} {value} is not a multiple of the step")
+        return errors
+
+
+# tolerance (in steps) of float grid values sitting on a step
+_GRID_EPSILON = 1e-9
+
+
+def _grid_units(np: typing.Any, values: typing.Any, decimals: int, _range: _Range, rounding: ROUNDING) -> "np.ndarray":
+    "float `values` rounded once to the steps of `_range`, in integer units"
+
+    scaled = np.asarray(values, dtype=np.float64) * 10 ** decimals
+    if not _range.step:
+        return np.rint(scaled).astype(np.int64)
+
+    steps = (scaled - _range.min) / _range.step
+    if rounding == "down":
+        steps = np.floor(steps + _GRID_EPSILON)
+    elif rounding == "up":
+        steps = np.ceil(steps - _GRID_EPSILON)
+    else:
+        # ties to even, as ROUND_HALF_EVEN
+        down = np.floor(steps + _GRID_EPSILON)
+        tie = np.abs(steps - down - 0.5) < _GRID_EPSILON
+        steps = np.where(tie, down + down % 2, np.rint(steps))
+    return _range.min + steps.astype(np.int64) * _range.step
+
+
+class SymbolFilters:
+    """Compiled filters of a symbol
+
+    Args:
+    -----
+        symbol : str
+        filters : List[dict]
+            Filters of the symbol as returned by `exchangeInfo`
+
+    Usage:
+    ------
+        filters = SymbolFilters("ETHBTC", symbol_info["filters"])
+        filters.check({"side": "BUY", "type": "LIMIT", "price": "0.03", "quantity": "1.5"})
+        price, qty = filters.quantize("0.0312345", "1.23456")
+    """
+
+    def __init__(self, symbol: str, filters: typing.Iterable[typing.Mapping[str, typing.Any]]):
+        self.symbol = symbol
+        self.filters = {f["filterType"]: f for f in filters}
+
+        price = self.filters.get("PRICE_FILTER", {})
+        lot = self.filters.get("LOT_SIZE", {})
+        market_lot = self.filters.get("MARKET_LOT_SIZE", {})
+        notional = self.filters.get("MIN_NOTIONAL", {})
+        percent = self.filters.get("PERCENT_PRICE", {})
+        iceberg = self.filters.get("ICEBERG_PARTS", {})
+
+        def dec(f, key):
+            return Decimal(f[key]) if f.get(key) is not None else None
+
+        self.tick_size = dec(price, "tickSize")
+        self.step_size = dec(lot, "stepSize")
+
+        self.price_decimals = _decimals(dec(price, "minPrice"), dec(price, "maxPrice"), self.tick_size)
+        self.qty_decimals = _decimals(
+            dec(lot, "minQty"), dec(lot, "maxQty"), self.step_size,
+            dec(market_lot, "minQty"), dec(market_lot, "maxQty"), dec(market_lot, "stepSize"),
+        )
+
+        self.price = _Range(price.get("minPrice"), price.get("maxPrice"), price.get("tickSize"), self.price_decimals)
+        self.lot = _Range(lot.get("minQty"), lot.get("maxQty"), lot.get("stepSize"), self.qty_decimals)
+        self.market_lot = _Range(market_lot.get("minQty"), market_lot.get("maxQty"), market_lot.get("stepSize"), self.qty_decimals)
+
+        # notional in units of 10**-(price_decimals + qty_decimals), the scale of price * qty
+        self.min_notional_value = Decimal(notional.get("minNotional") or 0)
+        self.min_notional = _units(self.min_notional_value, self.price_decimals + self.qty_decimals)
+        self.notional_applies_to_market = bool(notional.get("applyToMarket", False))
+
+        self.multiplier_up = dec(percent, "multiplierUp")
+        self.multiplier_down = dec(percent, "multiplierDown")
+        self.iceberg_parts = iceberg.get("limit")
+
+    # ---- checks
+
+    def violations(self, order: typing.Any, avg_price: typing.Any = None) -> typing.List[typing.Tuple[str, str]]:
+        """(filterType, message) for each filter `order` does not pass
+
+        Args:
+        -----
+            order : Mapping or object
+                Fields as in `new_order.Request`: type, price, quantity, quoteOrderQty, stopPrice, icebergQty
+            avg_price : Decimal
+                Current average price (optional)
+                Needed for PERCENT_PRICE and for MIN_NOTIONAL of market orders, skipped otherwise
+        """
+
+        get = order.get if hasattr(order, "get") else lambda k: getattr(order, k, None)
+
+        order_type = get("type")
+        price = get("price")
+        stop_price = get("stopPrice")
+        quantity = get("quantity")
+        iceberg_qty = get("icebergQty")
+        is_market = order_type == "MARKET"
+
+        violations = []
+
+        price_units = None
+        for name, value in (("price", price), ("stopPrice", stop_price)):
+            if value is None:
+                continue
+            units = _units(value, self.price_decimals)
+            if name == "price":
+                price_units = units
+            violations.extend(("PRICE_FILTER", e) for e in self.price.errors(units, name, value))
+
+        qty_units = None
+        if quantity is not None:
+            qty_units = _units(quantity, self.qty_decimals)
+            violations.extend(("LOT_SIZE", e) for e in self.lot.errors(qty_units, "quantity", quantity))
+            if is_market:
+                violations.extend(("MARKET_LOT_SIZE", e) for e in self.market_lot.errors(qty_units, "quantity", quantity))
+
+        if self.min_notional and qty_units is not None:
+            # market orders are checked against the average price, if the filter applies to them
+            if is_market:
+                notional_price = avg_price if self.notional_applies_to_market else None
+                notional_units = None if notional_price is None else _units(notional_price, self.price_decimals)
+            else:
+                notional_price, notional_units = price, price_units
+
+            if notional_units is None and notional_price is not None:
+                # price with more decimals than the filters
+                below = Decimal(notional_price) * Decimal(quantity) < self.min_notional_value
+            else:
+                below = notional_units is not None and notional_units * qty_units < self.min_notional
+            if below:
+                violations.append(("MIN_NOTIONAL", f"notional {Decimal(quantity) * Decimal(notional_price)} is below minimum"))
+
+        if avg_price is not None and price is not None and self.multiplier_up is not None:
+            avg_price = Decimal(avg_price)
+            if not avg_price * self.multiplier_down <= Decimal(price) <= avg_price * self.multiplier_up:
+                violations.append(("PERCENT_PRICE", f"price {price} is out of range of average price {avg_price}"))
+
+        if iceberg_qty is not None and quantity is not None and self.iceberg_parts:
+            # ceil(quantity / icebergQty)
+            parts = -(-Decimal(quantity) // Decimal(iceberg_qty))
+            if parts > self.iceberg_parts:
+                violations.append(("ICEBERG_PARTS", f"{parts} iceberg parts, maximum is {self.iceberg_parts}"))
+
+        return violations
+
+    def check(self, order: typing.Any, avg_price: typing.Any = None) -> None:
+        """raise FilterError if `order` does not pass the filters (see `violations`)"""
+        violations = self.violations(order, avg_price)
+        if violations:
+            raise FilterError(self.symbol, violations)
+
+    # ---- quantization
+
+    def quantize_price(self, price: typing.Any, rounding: ROUNDING = "nearest") -> Decimal:
+        "round `price` to the tick size (relative to the minimum price)"
+
+        if not self.price.step:
+            return Decimal(price)
+
+        offset = Decimal(price).scaleb(self.price_decimals) - self.price.min
+        ticks = int((offset / self.price.step).to_integral_value(_ROUNDING[rounding]))
+        return Decimal(self.price.min + ticks * self.price.step).scaleb(-self.price_decimals)
+
+    def quantize_qty(self, quantity: typing.Any, market: bool = False) -> Decimal:
+        "round `quantity` down to the step size"
+
+        lot = self.market_lot if market and self.market_lot.step else self.lot
+        if not lot.step:
+            return Decimal(quantity)
+
+        offset = Decimal(quantity).scaleb(self.qty_decimals) - lot.min
+        steps = int((offset / lot.step).to_integral_value(ROUND_FLOOR))
+        return Decimal(lot.min + steps * lot.step).scaleb(-self.qty_decimals)
+
+    def quantize(self, price: typing.Any, quantity: typing.Any, rounding: ROUNDING = "nearest") -> typing.Tuple[Decimal, Decimal]:
+        "(price rounded to the tick size, quantity rounded down to the step size)"
+        return self.quantize_price(price, rounding), self.quantize_qty(quantity)
+
+    def quantize_grid(
+            self,
+            prices: typing.Any,
+            quantities: typing.Any,
+            rounding: ROUNDING = "nearest"
+        ) -> GridQuantized:
+        """vectorized `quantize` of a whole order grid (requires numpy)
+
+        Args:
+        -----
+            prices : array-like of float
+            quantities : array-like of float
+                same length as `prices`, or a scalar
+            rounding : str enum
+                [down, up, nearest] rounding of prices to the tick size
+
+        Note:
+        -----
+            Inputs are floats: values within 1e-9 step of a step are taken as on it,
+            so the results match `quantize` of their shortest decimal representation
+        """
+
+        np = require_numpy()
+
+        price_scale = 10 ** self.price_decimals
+        qty_scale = 10 ** self.qty_decimals
+
+        price_units = _grid_units(np, prices, self.price_decimals, self.price, rounding)
+        qty_units = _grid_units(np, quantities, self.qty_decimals, self.lot, "down")
+        qty_units = np.broadcast_to(qty_units, price_units.shape)
+
+        valid = np.ones(price_units.shape, dtype=bool)
+        for units, _range in ((price_units, self.price), (qty_units, self.lot)):
+            if _range.min:
+                valid &= units >= _range.min
+            if _range.max:
+                valid &= units <= _range.max
+        if self.min_notional:
+            # compared in floats, the product of int64 units could overflow
+            valid &= price_units.astype(np.float64) * qty_units >= self.min_notional
+
+        return GridQuantized(
+            prices=price_units / price_scale,
+            quantities=qty_units / qty_scale,
+            valid=valid,
+        )
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}:{self.symbol}>"
+
+
+class FilterEngine:
+    """Compiled filters of all symbols
+
+    Usage:
+    ------
+        engine = FilterEngine.from_exchange_info(exchange_info_json)
+        engine.check({"symbol": "ETHBTC", "side": "BUY", "type": "LIMIT", "price": "0.03", "quantity": "1.5"})
+        price, qty = engine.quantize("ETHBTC", "0.0312345", "1.23456")
+    """
+
+    def __init__(self, symbols: typing.Iterable[SymbolFilters] = ()):
+        self.symbols: typing.Dict[str, SymbolFilters] = {s.symbol: s for s in symbols}
+
+    @classmethod
+    def from_exchange_info(cls, exchange_info: typing.Any) -> "FilterEngine":
+        "from an `exchangeInfo` response (JSON content or validated model), or its `symbols` list"
+
+        symbols = exchange_info
+        if hasattr(exchange_info, "get"):
+            symbols = exchange_info["symbols"]
+        elif hasattr(exchange_info, "symbols"):
+            symbols = exchange_info.symbols
+
+        def _filters(info):
+            if hasattr(info, "get"):
+                return info["symbol"], info["filters"]
+            return info.symbol, info.filters
+
+        return cls(SymbolFilters(*_filters(info)) for info in symbols)
+
+    @classmethod
+    def from_symbol_store(cls, store: typing.Any) -> "FilterEngine":
+        "from a binary symbol store (see `crypto_dom.symbol_store`)"
+
+        engine = cls()
+        for symbol in store:
+            record = store[symbol]
+            engine.symbols[symbol] = SymbolFilters(symbol, [
+                {"filterType": "PRICE_FILTER", "minPrice": record["minPrice"], "maxPrice": record["maxPrice"], "tickSize": record["tickSize"]},
+                {"filterType": "LOT_SIZE", "minQty": record["minQty"], "maxQty": record["maxQty"], "stepSize": record["stepSize"]},
+                {"filterType": "MARKET_LOT_SIZE", "minQty": record["marketMinQty"], "maxQty": record["marketMaxQty"], "stepSize": record["marketStepSize"]},
+                {"filterType": "MIN_NOTIONAL", "minNotional": record["minNotional"], "applyToMarket": record["applyToMarket"]},
+                {"filterType": "PERCENT_PRICE", "multiplierUp": record["multiplierUp"], "multiplierDown": record["multiplierDown"]},
+                {"filterType": "ICEBERG_PARTS", "limit": record["icebergParts"]},
+            ])
+        return engine
+
+    def __getitem__(self, symbol: str) -> SymbolFilters:
+        return self.symbols[symbol]
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.symbols
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def check(self, order: typing.Any, avg_price: typing.Any = None) -> None:
+        "raise FilterError if `order` does not pass the filters of its symbol"
+        symbol = order.get("symbol") if hasattr(order, "get") else order.symbol
+        self.symbols[symbol].check(order, avg_price)
+
+    def quantize(self, symbol: str, price: typing.Any, quantity: typing.Any, rounding: ROUNDING = "nearest") -> typing.Tuple[Decimal, Decimal]:
+        return self.symbols[symbol].quantize(price, quantity, rounding)
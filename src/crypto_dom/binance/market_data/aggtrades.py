@@ -3,11 +3,10 @@ from datetime import date
 from decimal import Decimal
 
 import pydantic
-import stackprinter
-stackprinter.set_excepthook(style="darkbg2")
 
 from crypto_dom.definitions import TIMESTAMP_MS
 from crypto_dom.binance.definitions import SYMBOL
+from crypto_dom.validation import construct_model
 
 
 # ============================================================
@@ -152,6 +151,10 @@ class Response:
         # print("Returning model", test, "\n")
         return test.data
 
+    def construct(self, response):
+        "build the response model without validation (see `crypto_dom.validation.ValidationPolicy`)"
+        return construct_model(_AggTradesResp, {"data": response}).data
+
 
 
 
@@ -0,0 +1,59 @@
+import pydantic
+
+from crypto_dom.definitions import TIMESTAMP_MS
+
+
+# ============================================================
+# CHECK SERVER TIME
+# ============================================================
+
+
+# doc: https://binance-docs.github.io/apidocs/spot/en/#check-server-time
+
+URL = "https://api.binance.com/api/v3/time"
+METHOD = "GET"
+WEIGHT = 1
+
+
+# ------------------------------
+# Sample Response (doc)
+# ------------------------------
+
+
+# {
+#   "serverTime": 1499827319559
+# }
+
+
+# ------------------------------
+# Request Model
+# ------------------------------
+
+
+# no parameters
+
+
+# ------------------------------
+# Response Model
+# ------------------------------
+
+
+class _ServerTimeResp(pydantic.BaseModel):
+
+    serverTime: TIMESTAMP_MS
+
+
+#  this class is just to be consistent with our API
+class Response:
+    """Validated Response for endpoint https://api.binance.com/api/v3/time
+
+    Type: pydantic.BaseModel
+
+    Model Fields:
+    -------------
+        serverTime : int
+            Timestamp in milliseconds
+    """
+
+    def __new__(_cls):
+        return _ServerTimeResp
@@ -2,11 +2,10 @@ import typing
 from decimal import Decimal
 
 import pydantic
-import stackprinter
-stackprinter.set_excepthook(style="darkbg2")
 
 from crypto_dom.definitions import COUNT, TIMESTAMP_MS
 from crypto_dom.binance.definitions import SYMBOL
+from crypto_dom.validation import construct_model
 
 
 # ============================================================
@@ -174,6 +173,14 @@ class Response:
         if isinstance(response, dict):
             _valid = _24hTicker(**response)
             return _valid
+
+    def construct(self, response):
+        "build the response model without validation (see `crypto_dom.validation.ValidationPolicy`)"
+        if isinstance(response, list):
+            return construct_model(_24hTickers, {"data": response}).data
+
+        if isinstance(response, dict):
+            return construct_model(_24hTicker, response)
         
 
 
@@ -2,9 +2,7 @@ import typing
 from decimal import Decimal
 
 import pydantic
-import stackprinter
 from typing_extensions import Literal
-stackprinter.set_excepthook(style="darkbg2")
 
 from crypto_dom.binance.definitions import TIMEFRAME, SYMBOL
 
@@ -64,6 +62,21 @@ class Request(pydantic.BaseModel):
     limit: typing.Optional[Literal[5, 10, 20, 50, 100, 500, 1000, 5000]]
 
 
+# ------------------------------
+# Weight
+# ------------------------------
+
+
+# weight of each limit, the default limit is 100
+_LIMIT_WEIGHTS = {5: 1, 10: 1, 20: 1, 50: 1, 100: 1, 500: 5, 1000: 10, 5000: 50}
+
+
+def get_weight(params: typing.Optional[typing.Mapping] = None) -> int:
+    "weight of a request with query `params` (see `WEIGHT`)"
+    limit = (params or {}).get("limit")
+    return _LIMIT_WEIGHTS[int(limit)] if limit is not None else 1
+
+
 # ------------------------------
 # Response Model
 # ------------------------------
@@ -3,8 +3,6 @@ from decimal import Decimal
 
 from typing_extensions import Literal
 import pydantic
-import stackprinter
-stackprinter.set_excepthook(style="darkbg2")
 
 from crypto_dom.definitions import TIMESTAMP_MS
 from crypto_dom.binance.definitions import ORDER_TYPE, RATE_LIMIT_TYPE, RATE_LIMIT_INTERVAL, SYMBOL_PERMISSIONS, SYMBOL_STATUS, SYMBOL, ASSET
@@ -3,11 +3,11 @@ from datetime import date
 from decimal import Decimal
 
 import pydantic
-import stackprinter
-stackprinter.set_excepthook(style="darkbg2")
 
+from crypto_dom.columnar import require_numpy, to_matrix, to_column, check_column
 from crypto_dom.definitions import COUNT, TIMESTAMP_MS
 from crypto_dom.binance.definitions import TIMEFRAME, SYMBOL
+from crypto_dom.validation import construct_model
 
 
 # ============================================================
@@ -135,10 +135,58 @@ class _KlinesResp(pydantic.BaseModel):
     data: typing.Tuple[_Candle, ...]
 
 
+class KlineColumns(typing.NamedTuple):
+    """Contiguous array per column, for `Response(columnar=True)`
+
+    Fields:
+    -------
+        open_time, close_time : int64
+            Timestamps in milliseconds
+        open, high, low, close, volume, quote_volume, taker_buy_base_volume, taker_buy_quote_volume : float64
+        trades : int64
+            Number of trades
+    """
+
+    open_time: "np.ndarray"
+    open: "np.ndarray"
+    high: "np.ndarray"
+    low: "np.ndarray"
+    close: "np.ndarray"
+    volume: "np.ndarray"
+    close_time: "np.ndarray"
+    quote_volume: "np.ndarray"
+    trades: "np.ndarray"
+    taker_buy_base_volume: "np.ndarray"
+    taker_buy_quote_volume: "np.ndarray"
+
+
+# (index in candle, dtype), index 11 is ignored
+_COLUMNS = {
+    "open_time": (0, "int64"),
+    "open": (1, "float64"),
+    "high": (2, "float64"),
+    "low": (3, "float64"),
+    "close": (4, "float64"),
+    "volume": (5, "float64"),
+    "close_time": (6, "int64"),
+    "quote_volume": (7, "float64"),
+    "trades": (8, "int64"),
+    "taker_buy_base_volume": (9, "float64"),
+    "taker_buy_quote_volume": (10, "float64"),
+}
+
+
 class Response:
     """Validated Response for endpoint https://api.binance.com/api/v3/klines
 
-    Type: Tuple of Tuples
+    Type: Tuple of Tuples, or KlineColumns if `columnar`
+
+    Args:
+    -----
+        columnar : bool
+            Decode into one numpy array per column instead of validating each candle (requires numpy)
+            Checks row arity, non-negative values and strictly increasing open times in bulk
+            default = False
 
     Tuple Fields:
     -------------
@@ -169,12 +217,49 @@ class Response:
 
     """
 
+    def __init__(self, columnar: bool = False):
+        if columnar:
+            require_numpy()
+        self.columnar = columnar
+
     def __call__(self, response):
+        if self.columnar:
+            return self._decode_columns(response)
+
         # print("Calling with response", response, "`\n")
         test = _KlinesResp(data=response)
         # print("Returning model", test, "\n")
         return test.data
 
+    def construct(self, response):
+        "build the response model without validation (see `crypto_dom.validation.ValidationPolicy`)"
+        if self.columnar:
+            return self._decode_columns(response)
+        return construct_model(_KlinesResp, {"data": response}).data
+
+    @staticmethod
+    def _decode_columns(response) -> KlineColumns:
+
+        np = require_numpy()
+
+        # errors have the same model and location as when validating with `_KlinesResp`
+        model = _KlinesResp
+        loc = ("data",)
+        matrix = to_matrix(response, 12, model=model, loc=loc)
+
+        columns = {}
+        for name, (index, dtype) in _COLUMNS.items():
+            values = to_column(matrix, index, dtype, model=model, loc=loc)
+            check_column(values, ~(values >= 0), "ensure this value is greater than or equal to 0, got {value}", index=index, model=model, loc=loc)
+            columns[name] = values
+
+        open_time = columns["open_time"]
+        decreasing = np.zeros(len(open_time), dtype=bool)
+        decreasing[1:] = np.diff(open_time) <= 0
+        check_column(open_time, decreasing, "open time {value} is not greater than previous open time", index=0, model=model, loc=loc)
+
+        return KlineColumns(**columns)
+
 
 
 
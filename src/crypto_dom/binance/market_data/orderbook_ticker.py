@@ -2,10 +2,9 @@ import typing
 from decimal import Decimal
 
 import pydantic
-import stackprinter
-stackprinter.set_excepthook(style="darkbg2")
 
 from crypto_dom.binance.definitions import SYMBOL
+from crypto_dom.validation import construct_model
 
 
 # ============================================================
@@ -122,6 +121,14 @@ class Response:
         if isinstance(response, dict):
             _valid = _OrderBookTicker(**response)
             return _valid
+
+    def construct(self, response):
+        "build the response model without validation (see `crypto_dom.validation.ValidationPolicy`)"
+        if isinstance(response, list):
+            return construct_model(_OrderBookTickers, {"data": response}).data
+
+        if isinstance(response, dict):
+            return construct_model(_OrderBookTicker, response)
         
 
 
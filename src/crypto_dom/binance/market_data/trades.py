@@ -2,11 +2,10 @@ import typing
 from decimal import Decimal
 
 import pydantic
-import stackprinter
-stackprinter.set_excepthook(style="darkbg2")
 
 from crypto_dom.definitions import TIMESTAMP_MS
 from crypto_dom.binance.definitions import SYMBOL
+from crypto_dom.validation import construct_model
 
 
 # ============================================================
@@ -104,6 +103,10 @@ class Response:
         _valid = _TradesResp(data=response)
         return _valid.data
 
+    def construct(self, response):
+        "build the response model without validation (see `crypto_dom.validation.ValidationPolicy`)"
+        return construct_model(_TradesResp, {"data": response}).data
+
 
 
 
@@ -0,0 +1,324 @@
+import asyncio
+import functools
+import importlib
+import pkgutil
+import time
+import typing
+
+from crypto_dom.binance.definitions import RATE_LIMIT_TYPE, RATE_LIMIT_INTERVAL
+
+
+# ============================================================
+# RATE LIMITER
+# ============================================================
+
+
+# doc: https://binance-docs.github.io/apidocs/spot/en/#limits
+#
+# Binance limits the weight of requests (REQUEST_WEIGHT), the number of orders (ORDERS)
+# and the number of requests (RAW_REQUEST) over intervals given by `exchangeInfo.rateLimits`.
+# Going over a limit returns 429, repeatedly going over it gets the IP banned (418).
+#
+# The limiter keeps a token bucket per limit and debits each request before it is sent,
+# using the `WEIGHT` constant (or `get_weight` function) of the endpoint module.
+# Requests that would overflow a bucket wait, in order, until it has refilled.
+#
+# Responses report the weight and orders counted by the exchange for the IP / account
+# (`X-MBX-USED-WEIGHT-1M`, `X-MBX-ORDER-COUNT-10S` ...), including requests of other processes:
+# `update` lowers the buckets to match, so processes sharing an IP throttle themselves.
+
+
+INTERVAL_SECONDS = {"SECOND": 1, "MINUTE": 60, "DAY": 86400}
+
+# interval letters of the usage headers
+_HEADER_INTERVALS = {"S": 1, "M": 60, "H": 3600, "D": 86400}
+
+_USAGE_HEADERS = {
+    "x-mbx-used-weight-": "REQUEST_WEIGHT",
+    "x-mbx-order-count-": "ORDERS",
+}
+
+# (rateLimitType, interval, intervalNum, limit), as given by exchangeInfo
+DEFAULT_RATE_LIMITS = (
+    ("REQUEST_WEIGHT", "MINUTE", 1, 1200),
+    ("ORDERS", "SECOND", 10, 100),
+    ("ORDERS", "DAY", 1, 200000),
+    ("RAW_REQUEST", "MINUTE", 5, 6100),
+)
+
+# requests counted by the ORDERS limits
+ORDER_ENDPOINTS = frozenset([
+    ("POST", "https://api.binance.com/api/v3/order"),
+    ("POST", "https://api.binance.com/api/v3/order/oco"),
+])
+
+_ENDPOINT_PACKAGES = (
+    "crypto_dom.binance.market_data",
+    "crypto_dom.binance.spot_account",
+    "crypto_dom.binance.wallet",
+)
+
+Weight = typing.Union[int, typing.Callable[[typing.Optional[typing.Mapping]], int]]
+
+
+@functools.lru_cache(maxsize=None)
+def endpoint_weights() -> typing.Dict[typing.Tuple[str, str], Weight]:
+    """(METHOD, URL) of each endpoint module mapped to its `get_weight` function or `WEIGHT`
+
+    Endpoint modules are imported on first use
+    """
+
+    weights = {}
+    for package_name in _ENDPOINT_PACKAGES:
+        package = importlib.import_module(package_name)
+        for info in pkgutil.iter_modules(package.__path__):
+            if info.name.startswith("_"):
+                continue
+            module = importlib.import_module(f"{package_name}.{info.name}")
+            weight = getattr(module, "get_weight", getattr(module, "WEIGHT", None))
+            if weight is not None and hasattr(module, "URL"):
+                weights[(module.METHOD, module.URL)] = weight
+    return weights
+
+
+def get_weight(method: str, url: typing.Any, params: typing.Optional[typing.Mapping] = None, default: int = 1) -> int:
+    "weight of a request, `default` for unknown endpoints"
+
+    weight = endpoint_weights().get((method.upper(), str(url).split("?", 1)[0]), default)
+    return weight(params) if callable(weight) else weight
+
+
+def parse_usage_headers(headers: typing.Mapping[str, str]) -> typing.Dict[str, typing.Dict[str, int]]:
+    """usage reported by a response, per rate limit type and interval
+
+    Usage:
+    ------
+        parse_usage_headers({"X-MBX-USED-WEIGHT-1M": "23", "X-MBX-ORDER-COUNT-10S": "1"})
+        # {"REQUEST_WEIGHT": {"1M": 23}, "ORDERS": {"10S": 1}}
+    """
+
+    usage: typing.Dict[str, typing.Dict[str, int]] = {}
+    for name, value in headers.items():
+        name = name.lower()
+        if not name.startswith("x-mbx-"):
+            continue
+        for prefix, rate_limit_type in _USAGE_HEADERS.items():
+            if name.startswith(prefix):
+                try:
+                    usage.setdefault(rate_limit_type, {})[name[len(prefix):].upper()] = int(value)
+                except ValueError:
+                    pass
+                break
+    return usage
+
+
+def interval_seconds(interval: str) -> typing.Optional[int]:
+    "seconds of a header interval (for ex 1M, 10S), None if invalid"
+    try:
+        return int(interval[:-1]) * _HEADER_INTERVALS[interval[-1]]
+    except (KeyError, ValueError, IndexError):
+        return None
+
+
+class TokenBucket:
+    """Token bucket refilled continuously, up to `capacity` tokens per `period` seconds
+
+    Args:
+    -----
+        rate_limit_type : str enum
+            [REQUEST_WEIGHT, ORDERS, RAW_REQUEST]
+        capacity : int
+            Limit over the period
+        period : float
+            Seconds
+    """
+
+    __slots__ = ("rate_limit_type", "capacity", "period", "tokens", "updated")
+
+    def __init__(self, rate_limit_type: RATE_LIMIT_TYPE, capacity: int, period: float, clock: typing.Callable[[], float] = time.monotonic):
+        if rate_limit_type not in RATE_LIMIT_TYPE.__args__:
+            raise ValueError(f"Invalid rate limit type {rate_limit_type} - must be one of {RATE_LIMIT_TYPE.__args__}")
+
+        self.rate_limit_type = rate_limit_type
+        self.capacity = capacity
+        self.period = period
+        self.tokens = float(capacity)
+        self.updated = clock()
+
+    @property
+    def rate(self) -> float:
+        "tokens per second"
+        return self.capacity / self.period
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, cost: float, now: float) -> float:
+        "seconds until `cost` tokens are available"
+        self.refill(now)
+        return max(cost - self.tokens, 0.0) / self.rate
+
+    def debit(self, cost: float) -> None:
+        self.tokens -= cost
+
+    def sync(self, used: int, now: float) -> None:
+        """correct the bucket with the usage counted by the exchange
+
+        Only lowers the available tokens: a lower usage can come from a response
+        sent before other requests were counted, the refill raises them anyway
+        """
+        self.refill(now)
+        self.tokens = min(self.tokens, self.capacity - used)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}:{self.rate_limit_type} {self.tokens:.0f}/{self.capacity} per {self.period:g}s>"
+
+
+class RateLimiter:
+    """Client side scheduler for Binance rate limits
+
+    Args:
+    -----
+        rate_limits : Iterable[Tuple[str, str, int, int]]
+            (rateLimitType, interval, intervalNum, limit) of each limit (optional)
+            default = DEFAULT_RATE_LIMITS
+        clock : Callable[[], float]
+            default = time.monotonic
+
+    Counters:
+    ---------
+        requests : int
+        delayed : int
+            Requests that had to wait for a bucket to refill
+        wait_time : float
+            Seconds spent waiting
+        usage : Dict[str, Dict[str, int]]
+            Last usage reported by the exchange, per rate limit type and interval
+
+    Usage:
+    ------
+        limiter = RateLimiter.from_exchange_info(exchange_info_response)
+        async with HttypeClient.httpx(rate_limiter=limiter) as client:
+            ...
+
+        # or before sending a request with another client
+        await limiter.acquire(depth.METHOD, depth.URL, {"symbol": "BTCUSDT", "limit": 5000})
+
+    Note:
+    -----
+        Requests sent by other processes with the same IP or account are only known
+        from the usage reported by responses (see `update`)
+    """
+
+    def __init__(
+            self,
+            rate_limits: typing.Iterable[typing.Tuple[RATE_LIMIT_TYPE, RATE_LIMIT_INTERVAL, int, int]] = DEFAULT_RATE_LIMITS,
+            clock: typing.Callable[[], float] = time.monotonic,
+        ):
+        self.clock = clock
+        self.buckets: typing.List[TokenBucket] = []
+
+        for rate_limit_type, interval, interval_num, limit in rate_limits:
+            if interval not in INTERVAL_SECONDS:
+                raise ValueError(f"Invalid interval {interval} - must be one of {tuple(INTERVAL_SECONDS)}")
+            self.buckets.append(TokenBucket(rate_limit_type, limit, INTERVAL_SECONDS[interval] * interval_num, clock))
+
+        self.requests = 0
+        self.delayed = 0
+        self.wait_time = 0.0
+
+        # last usage reported by the exchange, per rate limit type and interval (see `parse_usage_headers`)
+        self.usage: typing.Dict[str, typing.Dict[str, int]] = {}
+
+        # FIFO: a heavy request is not starved by lighter ones
+        self._lock: typing.Optional[asyncio.Lock] = None
+
+    @classmethod
+    def from_exchange_info(cls, response: typing.Any, **kwargs) -> "RateLimiter":
+        "from the `rateLimits` of an exchangeInfo response (json content or validated model)"
+
+        rate_limits = response["rateLimits"] if isinstance(response, dict) else response.rateLimits
+        get = lambda limit, k: limit[k] if isinstance(limit, dict) else getattr(limit, k)
+        return cls(
+            [(get(l, "rateLimitType"), get(l, "interval"), get(l, "intervalNum"), get(l, "limit")) for l in rate_limits],
+            **kwargs
+        )
+
+    def costs(self, method: str, url: typing.Any, params: typing.Optional[typing.Mapping] = None) -> typing.Dict[str, int]:
+        "tokens debited from each type of bucket by a request"
+
+        return {
+            "REQUEST_WEIGHT": get_weight(method, url, params),
+            "ORDERS": int((method.upper(), str(url).split("?", 1)[0]) in ORDER_ENDPOINTS),
+            "RAW_REQUEST": 1,
+        }
+
+    async def acquire(
+            self,
+            method: str,
+            url: typing.Any,
+            params: typing.Optional[typing.Mapping] = None,
+            headers: typing.Optional[typing.Mapping] = None,
+        ) -> float:
+        "wait until the request can be sent without going over a limit, returns the seconds waited"
+
+        costs = self.costs(method, url, params)
+        for bucket in self.buckets:
+            if costs[bucket.rate_limit_type] > bucket.capacity:
+                raise ValueError(f"Request cost {costs[bucket.rate_limit_type]} is over the {bucket.rate_limit_type} limit {bucket.capacity}")
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        waited = 0.0
+        async with self._lock:
+            while True:
+                now = self.clock()
+                wait = max((bucket.wait_time(costs[bucket.rate_limit_type], now) for bucket in self.buckets), default=0.0)
+                if wait <= 0:
+                    break
+                waited += wait
+                await asyncio.sleep(wait)
+
+            for bucket in self.buckets:
+                bucket.debit(costs[bucket.rate_limit_type])
+
+        self.requests += 1
+        if waited:
+            self.delayed += 1
+            self.wait_time += waited
+        return waited
+
+    def update(self, usage: typing.Mapping[str, typing.Mapping[str, int]]) -> None:
+        "sync the buckets with the usage reported by a response (see `parse_usage_headers`)"
+
+        if not usage:
+            return
+
+        now = self.clock()
+        for rate_limit_type, intervals in usage.items():
+            self.usage.setdefault(rate_limit_type, {}).update(intervals)
+            for interval, used in intervals.items():
+                seconds = interval_seconds(interval)
+                for bucket in self.buckets:
+                    if bucket.rate_limit_type == rate_limit_type and bucket.period == seconds:
+                        bucket.sync(used, now)
+
+    def stats(self) -> typing.Dict[str, typing.Any]:
+        now = self.clock()
+        for bucket in self.buckets:
+            bucket.refill(now)
+        return {
+            "requests": self.requests,
+            "delayed": self.delayed,
+            "wait_time": self.wait_time,
+            "usage": {k: dict(v) for k, v in self.usage.items()},
+            "buckets": [
+                {"rateLimitType": b.rate_limit_type, "period": b.period, "limit": b.capacity, "available": b.tokens}
+                for b in self.buckets
+            ],
+        }
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}:{self.buckets}>"
@@ -0,0 +1,5 @@
+from crypto_dom._lazy import attach
+
+
+# endpoint modules are imported on first access
+__getattr__, __dir__ = attach(__name__, __path__)
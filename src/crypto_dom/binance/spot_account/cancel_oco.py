@@ -3,8 +3,6 @@ from decimal import Decimal
 
 from typing_extensions import Literal
 import pydantic
-import stackprinter
-stackprinter.set_excepthook(style="darkbg2")
 
 from crypto_dom.definitions import TIMESTAMP_MS
 from crypto_dom.binance.definitions import OCO_ORDER_STATUS, OCO_STATUS, ORDER_SIDE, ORDER_STATUS, ORDER_TYPE, ORDER_TIF, RECV_WINDOW, SYMBOL
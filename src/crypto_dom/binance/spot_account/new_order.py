@@ -3,12 +3,13 @@ from decimal import Decimal
 
 from typing_extensions import Literal
 import pydantic
-import stackprinter
-stackprinter.set_excepthook(style="darkbg2")
 
 from crypto_dom.definitions import TIMESTAMP_MS
 from crypto_dom.binance.definitions import ORDER_RESP_TYPE, ORDER_SIDE, ORDER_STATUS, ORDER_TYPE, ORDER_TIF, RECV_WINDOW, SYMBOL, ASSET
 
+if typing.TYPE_CHECKING:
+    from crypto_dom.binance.filters import FilterEngine
+
 
 # ============================================================
 # NEW ORDER (TRADE)
@@ -113,6 +114,20 @@ WEIGHT = 1
 # ------------------------------
 
 
+# optional pre-trade check of the symbol filters, disabled by default
+_FILTER_ENGINE: typing.Optional["FilterEngine"] = None
+
+
+def set_filter_engine(engine: typing.Optional["FilterEngine"]) -> None:
+    """check requests against the exchange filters of their symbol (see `crypto_dom.binance.filters`)
+
+    Request validation then fails if the order would be rejected for a filter.
+    Symbols unknown to the engine are not checked. Pass None to disable.
+    """
+    global _FILTER_ENGINE
+    _FILTER_ENGINE = engine
+
+
 class Request(pydantic.BaseModel):
     """Request model for endpoint POST https://api.binance.com/api/v3/order
 
@@ -246,6 +261,15 @@ class Request(pydantic.BaseModel):
         return v
 
 
+    @pydantic.root_validator(skip_on_failure=True)
+    def _check_filters(cls, values):
+
+        if _FILTER_ENGINE is not None and values["symbol"] in _FILTER_ENGINE:
+            _FILTER_ENGINE[values["symbol"]].check(values)
+
+        return values
+
+
 
 # ------------------------------
 # Response Model
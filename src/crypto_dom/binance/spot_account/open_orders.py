@@ -2,8 +2,6 @@ import typing
 from decimal import Decimal
 
 import pydantic
-import stackprinter
-stackprinter.set_excepthook(style="darkbg2")
 
 from crypto_dom.definitions import TIMESTAMP_MS
 from crypto_dom.binance.definitions import  ORDER_SIDE, ORDER_STATUS, ORDER_TYPE, ORDER_TIF, RECV_WINDOW, SYMBOL
@@ -76,6 +74,16 @@ class Request(pydantic.BaseModel):
     recvWindow: typing.Optional[RECV_WINDOW]
 
 
+# ------------------------------
+# Weight
+# ------------------------------
+
+
+def get_weight(params: typing.Optional[typing.Mapping] = None) -> int:
+    "weight of a request with query `params` (see `WEIGHT`)"
+    return WEIGHT if (params or {}).get("symbol") else 40
+
+
 # ------------------------------
 # Response Model
 # ------------------------------
@@ -2,8 +2,6 @@ import typing
 
 from typing_extensions import Literal
 import pydantic
-import stackprinter
-stackprinter.set_excepthook(style="darkbg2")
 
 from crypto_dom.definitions import TIMESTAMP_MS
 from crypto_dom.binance.definitions import OCO_ORDER_STATUS, OCO_STATUS, RECV_WINDOW, SYMBOL
@@ -2,8 +2,6 @@ import typing
 from decimal import Decimal
 
 import pydantic
-import stackprinter
-stackprinter.set_excepthook(style="darkbg2")
 
 from crypto_dom.definitions import TIMESTAMP_MS
 from crypto_dom.binance.definitions import ORDER_RESP_TYPE, ORDER_SIDE, ORDER_TYPE, ORDER_TIF, RECV_WINDOW, SYMBOL
@@ -4,8 +4,6 @@ from decimal import Decimal
 
 from typing_extensions import Literal
 import pydantic
-import stackprinter
-stackprinter.set_excepthook(style="darkbg2")
 
 from crypto_dom.definitions import TIMESTAMP_MS, COUNT
 from crypto_dom.binance.definitions import ASSET, RECV_WINDOW
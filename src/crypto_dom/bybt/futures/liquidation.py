@@ -2,8 +2,6 @@ import typing
 from decimal import Decimal
 
 import pydantic
-import stackprinter
-stackprinter.set_excepthook(style="darkbg2")
 
 from crypto_dom.bybt.definitions import SYMBOL, EXCHANGE
 
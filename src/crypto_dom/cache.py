@@ -0,0 +1,272 @@
+import asyncio
+import collections
+import threading
+import time
+import typing
+
+from crypto_dom.disk_cache import DiskCache
+from crypto_dom.result import Result, Ok, Err
+
+
+# ============================================================
+# RESPONSE CACHE
+# ============================================================
+
+
+# Exchange metadata (exchangeInfo, AssetPairs, Assets, coin information) changes rarely
+# but is fetched constantly. The cache keeps the Result returned by `safe_request`,
+# with the response already decoded and validated: a hit costs a dict lookup.
+#
+# Within `ttl` an entry is fresh and returned as is.
+# Within `ttl + stale_ttl` it is stale: returned as is, and refreshed in the background
+# (stale-while-revalidate). After that, it is refetched before returning.
+# With a `DiskCache`, the first request of an endpoint in a new process is served from disk
+# and refreshed in the background.
+
+
+# slow changing endpoints, seconds
+DEFAULT_TTLS = {
+    "https://api.binance.com/api/v3/exchangeInfo": 300.0,
+    "https://api.binance.com/sapi/v1/capital/config/getall": 60.0,
+    "https://api.kraken.com/0/public/AssetPairs": 300.0,
+    "https://api.kraken.com/0/public/Assets": 300.0,
+}
+
+# signing parameters differ on every request of the same query
+_SIGNING_PARAMS = frozenset(["timestamp", "signature", "recvWindow", "nonce"])
+
+
+def cache_key(method: str, url: typing.Any, params: typing.Optional[typing.Mapping], headers: typing.Optional[typing.Mapping], model_key: typing.Any) -> tuple:
+    """key of a request, without its signing parameters
+
+    Headers are part of the key, so signed requests (for ex Binance `getall`)
+    are only shared between callers using the same API key
+    """
+
+    _params = tuple(sorted((str(k), repr(v)) for k, v in (params or {}).items() if k not in _SIGNING_PARAMS))
+    _headers = tuple(sorted((str(k).lower(), str(v)) for k, v in (headers or {}).items()))
+    return (method.upper(), str(url), _params, _headers, model_key)
+
+
+def _cacheable(result: Result) -> bool:
+    "only successful responses that passed validation are cached"
+
+    if not isinstance(result, Ok):
+        return False
+
+    r = result.value
+    if not 200 <= getattr(r, "status_code", getattr(r, "status", 200)) < 300:
+        return False
+    return not isinstance(getattr(r, "safe_content", None), Err)
+
+
+class _Entry:
+
+    __slots__ = ("result", "stored_at", "ttl")
+
+    def __init__(self, result: Result, stored_at: float, ttl: float):
+        self.result = result
+        self.stored_at = stored_at
+        self.ttl = ttl
+
+
+class ResponseCache:
+    """TTL cache of validated responses, per endpoint
+
+    Args:
+    -----
+        ttls : Mapping[str, float]
+            Seconds a response of each endpoint (url) is fresh (optional)
+            default = DEFAULT_TTLS
+        default_ttl : float
+            TTL of endpoints not in `ttls` (optional)
+            default = None, other endpoints are not cached
+        stale_ttl : float
+            Seconds a stale response is still returned while it is refreshed (default = 60)
+        maxsize : int
+            Maximum number of responses, least recently used are evicted (default = 256)
+        clock : Callable[[], float]
+            default = time.monotonic
+        disk : crypto_dom.disk_cache.DiskCache
+            Warm-start cache, read on the first request of each endpoint,
+            written after each fetch (optional)
+            default = None
+
+    Counters:
+    ---------
+        hits : int
+            Fresh responses returned
+        stale_hits : int
+            Stale responses returned (a refresh is started)
+        misses : int
+            Requests sent because no usable response was cached
+        refreshes : int
+            Background refreshes
+        refresh_errors : int
+            Background refreshes that did not return a cacheable response
+        disk_hits : int
+            Responses read from the disk cache (a refresh is started)
+        evictions : int
+
+    Usage:
+    ------
+        cache = ResponseCache(stale_ttl=30)
+        async with HttypeClient.httpx(cache=cache) as client:
+            r = await client.safe_request(METHOD, URL, t_out=KrakenFullResponse(Response()))
+        cache.stats()
+
+    Note:
+    -----
+        Hits return the same Result (and response object) to every caller, do not mutate it
+    """
+
+    def __init__(
+            self,
+            ttls: typing.Optional[typing.Mapping[str, float]] = None,
+            default_ttl: typing.Optional[float] = None,
+            stale_ttl: float = 60.0,
+            maxsize: int = 256,
+            clock: typing.Callable[[], float] = time.monotonic,
+            disk: typing.Optional[DiskCache] = None,
+        ):
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be a positive integer - Given: {maxsize}")
+        if stale_ttl < 0:
+            raise ValueError(f"stale_ttl must not be negative - Given: {stale_ttl}")
+
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self.maxsize = maxsize
+        self.clock = clock
+        self.disk = disk
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.evictions = 0
+        self.disk_hits = 0
+
+        self._entries: "collections.OrderedDict[tuple, _Entry]" = collections.OrderedDict()
+        self._refreshing: typing.Dict[tuple, asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+    def ttl(self, url: typing.Any) -> typing.Optional[float]:
+        "TTL of the endpoint, None if it is not cached"
+
+        # query parameters are not part of the endpoint
+        return self.ttls.get(str(url).split("?", 1)[0], self.default_ttl)
+
+    # ---- storage
+
+    def _get(self, key: tuple) -> typing.Optional[_Entry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _set(self, key: tuple, result: Result, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = _Entry(result, self.clock(), ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, url: typing.Optional[str] = None) -> None:
+        "drop the responses of `url`, or all of them"
+
+        with self._lock:
+            if url is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[1].split("?", 1)[0] == url]:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ---- fetch
+
+    async def _fetch(self, key: tuple, url: typing.Any, ttl: float, send: typing.Callable[[], typing.Awaitable[Result]]) -> Result:
+        result = await send()
+        if _cacheable(result):
+            self._set(key, result, ttl)
+            if self.disk is not None and self.disk.max_age(url) is not None:
+                # pickling and compressing a large response blocks, the write is not awaited
+                asyncio.get_running_loop().run_in_executor(None, self.disk.store, key, url, result)
+        return result
+
+    async def _refresh(self, key: tuple, url: typing.Any, ttl: float, send: typing.Callable[[], typing.Awaitable[Result]]) -> None:
+        try:
+            result = await self._fetch(key, url, ttl, send)
+        except Exception:
+            result = None
+        if not _cacheable(result):
+            # the stale response is kept until it expires
+            self.refresh_errors += 1
+
+    def _start_refresh(self, key: tuple, url: typing.Any, ttl: float, send: typing.Callable[[], typing.Awaitable[Result]]) -> None:
+        "refresh `key` in the background, once at a time"
+
+        if key in self._refreshing:
+            return
+        self.refreshes += 1
+        task = self._refreshing[key] = asyncio.ensure_future(self._refresh(key, url, ttl, send))
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+    async def get_or_fetch(self, key: tuple, url: typing.Any, send: typing.Callable[[], typing.Awaitable[Result]]) -> Result:
+        """cached Result of `key`, sending the request with `send` if needed
+
+        Endpoints without a TTL are always sent
+        """
+
+        ttl = self.ttl(url)
+        if ttl is None:
+            return await send()
+
+        entry = self._get(key)
+
+        if entry is not None:
+            age = self.clock() - entry.stored_at
+
+            if age < entry.ttl:
+                self.hits += 1
+                return entry.result
+
+            if age < entry.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                self._start_refresh(key, url, ttl, send)
+                return entry.result
+
+        elif self.disk is not None and self.disk.max_age(url) is not None:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(None, self.disk.load, key, url)
+            if result is not None:
+                self.disk_hits += 1
+                self._set(key, result, ttl)
+                self._start_refresh(key, url, ttl, send)
+                return result
+
+        self.misses += 1
+        return await self._fetch(key, url, ttl, send)
+
+    def stats(self) -> typing.Dict[str, typing.Union[int, float]]:
+        lookups = self.hits + self.stale_hits + self.disk_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "hit_ratio": (self.hits + self.stale_hits + self.disk_hits) / lookups if lookups else 0.0,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "evictions": self.evictions,
+        }
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}:{len(self._entries)}/{self.maxsize}>"
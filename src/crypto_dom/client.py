@@ -1,4 +1,6 @@
 import asyncio
+import concurrent.futures
+import copy
 import time
 from typing import Optional, Mapping, Any, Iterable, Awaitable, Callable, Union
 import functools
@@ -8,12 +10,148 @@ import aiohttp
 from pydantic import ValidationError
 
 
+from crypto_dom.cache import ResponseCache, cache_key
+from crypto_dom.decoders import BACKEND, Decoder, get_decoder
 from crypto_dom.result import Result, Ok, Err
+from crypto_dom.retry import RetryPolicy
+from crypto_dom.validation import ValidationPolicy
 
 from crypto_dom.kraken.__sign import get_keys, auth_headers
 
 
 
+#================================================================================
+# DECODING AND VALIDATION
+#================================================================================
+
+
+# Decoding and validating a large response (exchangeInfo, AssetPairs ...) can block the
+# event loop for tens to hundreds of milliseconds, stalling every other request on the loop.
+# Above `offload_threshold` bytes, both run in an executor instead.
+
+
+def _decode_validate(decoder: Decoder, body: bytes, t_out: Optional[Callable]):
+    "(content, decode time in seconds), content is validated by `t_out` if given"
+
+    _start = time.perf_counter()
+    rjson = decoder(body)
+    decode_time = time.perf_counter() - _start
+
+    if t_out:
+        return t_out(rjson), decode_time
+    return rjson, decode_time
+
+
+def _decode_validate_decided(decoder: Decoder, body: bytes, t_out: Callable):
+    "`_decode_validate` in a worker process, also returns the policy of `t_out` and its counters"
+    content, decode_time = _decode_validate(decoder, body, t_out)
+    return content, decode_time, t_out.validation
+
+
+async def _run_decode_validate(client, body: bytes, t_out: Optional[Callable]):
+    "run `_decode_validate` inline, or in the client's executor for large bodies"
+
+    if client.offload_threshold is not None and len(body) >= client.offload_threshold:
+        loop = asyncio.get_running_loop()
+
+        policy = getattr(t_out, "validation", None)
+        if isinstance(client.executor, concurrent.futures.ProcessPoolExecutor) and isinstance(policy, ValidationPolicy):
+            # the worker gets a copy of the policy: sample here, and merge its counters back
+            t_out = copy.copy(t_out)
+            t_out.validation = policy.decided(policy.should_validate())
+            content, decode_time, worker_policy = await loop.run_in_executor(
+                client.executor, _decode_validate_decided, client.decoder, body, t_out
+            )
+            policy.merge(worker_policy)
+            return content, decode_time
+
+        return await loop.run_in_executor(client.executor, _decode_validate, client.decoder, body, t_out)
+
+    return _decode_validate(client.decoder, body, t_out)
+
+
+def _sync_rate_limits(client, r) -> None:
+    "attach the usage reported by Binance headers to the response, and sync the client's rate limiter"
+
+    usage = {}
+    if any(name.lower().startswith("x-mbx-") for name in r.headers):
+        # imported on the first Binance response, the binance definitions are not loaded for other exchanges
+        from crypto_dom.binance.rate_limit import parse_usage_headers
+        usage = parse_usage_headers(r.headers)
+    setattr(r, "rate_limit_usage", usage)
+    if usage and client.rate_limiter is not None:
+        client.rate_limiter.update(usage)
+
+
+#================================================================================
+# REQUEST COALESCING
+#================================================================================
+
+
+# Strategies polling the same public endpoint with the same parameters at the same time
+# would each send a request and use rate limit budget.
+# With coalescing, concurrent identical GETs share one in-flight request and one validated result.
+# Signed requests (`auth_headers`) and other methods are never coalesced.
+
+
+def _model_key(t_out) -> Any:
+    "requests validated by different response models (or model options) do not share results"
+
+    if t_out is None:
+        return None
+
+    model = getattr(t_out, "success_model", t_out)
+    if isinstance(model, type):
+        return (type(t_out), model)
+
+    # for ex `columnar` or `price_decimals` options of a response model
+    options = tuple(sorted(
+        (k, v) for k, v in getattr(model, "__dict__", {}).items()
+        if isinstance(v, (str, int, float, bool, type(None)))
+    ))
+    return (type(t_out), type(model), options)
+
+
+def _coalesce_key(method: str, url: Any, params: Optional[Mapping], t_out) -> tuple:
+    _params = tuple(sorted((str(k), repr(v)) for k, v in (params or {}).items()))
+    return (method.upper(), str(url), _params, _model_key(t_out))
+
+
+class _Coalescer:
+    """Shares in-flight requests between concurrent callers
+
+    Counters:
+    ---------
+        requests : int
+            Requests sent
+        coalesced : int
+            Calls that were served by another caller's in-flight request
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.coalesced = 0
+        self._inflight: dict = {}
+
+    async def run(self, key: tuple, send: Callable[[], Awaitable[Result]]) -> Result:
+
+        task = self._inflight.get(key)
+
+        if task is None:
+            self.requests += 1
+            task = asyncio.ensure_future(send())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+
+        # a caller being cancelled does not cancel the request for the others
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {"requests": self.requests, "coalesced": self.coalesced, "in_flight": len(self._inflight)}
+
+
 #================================================================================
 # SUBCLASS HTTPX.ASYNCLIENT 
 #================================================================================
@@ -23,6 +161,71 @@ from crypto_dom.kraken.__sign import get_keys, auth_headers
 
 
 class _TypedHttpxClient(httpx.AsyncClient):
+    """httpx.AsyncClient with typed requests (see `safe_request`)
+
+    Args:
+    -----
+        decoder : str enum or callable
+            [stdlib, orjson] or any callable taking the raw body bytes (optional)
+            default = stdlib
+        offload_threshold : int
+            Body size in bytes above which decoding and `t_out` validation
+            run in `executor` instead of the event loop (optional)
+            default = None, always run on the event loop
+        executor : concurrent.futures.Executor
+            Thread or process pool for large bodies (optional)
+            default = None, the event loop's default executor
+        coalesce : bool
+            Concurrent identical GETs share one request and result (optional)
+            default = False, can be overriden per request
+        cache : crypto_dom.cache.ResponseCache
+            Validated responses of slow changing endpoints (optional)
+            default = None
+        rate_limiter :
+            Awaited before each request is sent, with `acquire(method, url, params, headers)`,
+            synced with the usage reported by responses with `update(usage)` (optional)
+            for ex crypto_dom.binance.rate_limit.RateLimiter
+            default = None
+        retry_policy : crypto_dom.retry.RetryPolicy
+            Retries of failed requests, except those signed with `auth_headers` or `signer` (optional)
+            default = None
+        (all other arguments are passed to httpx.AsyncClient)
+
+    Note:
+    -----
+        Responses returned by `safe_request` have a `decode_time` attribute:
+        seconds spent decoding the body, and a `rate_limit_usage` attribute:
+        usage reported by Binance headers (see `crypto_dom.binance.rate_limit.parse_usage_headers`)
+
+        `safe_request(..., signer=Signer(key, secret))` encodes the (validated) payload once and sends
+        the signed bytes as is (see `Signer` in `kraken.__sign` and `binance.__sign`)
+
+        With a process pool, the decoder and `t_out` must be picklable.
+        The `ValidationPolicy` of a full response model decides in this process which responses
+        are validated, and gets the counters of the workers back
+    """
+
+    def __init__(
+        self,
+        *args,
+        decoder: Union[BACKEND, Decoder] = "stdlib",
+        offload_threshold: Optional[int] = None,
+        executor: Optional[concurrent.futures.Executor] = None,
+        coalesce: bool = False,
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[Any] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        **kwargs
+        ):
+        super().__init__(*args, **kwargs)
+        self.decoder = get_decoder(decoder)
+        self.offload_threshold = offload_threshold
+        self.executor = executor
+        self.coalesce = coalesce
+        self.coalescer = _Coalescer()
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
 
     async def safe_request(
         self,
@@ -41,7 +244,9 @@ class _TypedHttpxClient(httpx.AsyncClient):
         cookies= None,
         auth= None,
         allow_redirects: bool = True,
-        timeout = None
+        timeout = None,
+        coalesce: Optional[bool] = None,
+        signer = None
         ) -> Result:
 
         # From: 
@@ -91,74 +296,76 @@ class _TypedHttpxClient(httpx.AsyncClient):
                     # _new_headers = auth_headers(url, _new_data, key=key, secret=secret)
                     # print("\nNew hears", _new_headers)
 
-                    _new_headers = auth_headers(url=url, data=_new_data)
+                    if auth_headers:
+                        _new_headers = auth_headers(url=url, data=_new_data)
 
                 except ValidationError as e:
                     return Err(e)
                 except Exception as e:
                     raise Err(e)
-            
-        try:
-            r = await self.request(
-                method,
-                url,
-                content=content,
-                data=_new_data,
-                files=files,
-                json=json,
-                params=_new_params,
-                headers=_new_headers if _new_headers else headers,
-                cookies=cookies,
-                auth=auth,
-                allow_redirects=allow_redirects,
-                timeout=timeout
-            )
-        except Exception as e:
-            return Err(e)
 
-        rjson = r.json()
-
-        #! falsify (for testing)
-        # rjson["result"]["last"] = "random string"
+        _url, _content, _data, _params = url, content, _new_data, _new_params
+        if signer is not None:
+            # payload encoded and signed once, the exact signed bytes are sent
+            try:
+                _url, _content, _new_headers = signer.sign(method, url, _new_data or _new_params or {}, headers)
+                _data, _params = None, None
+            except Exception as e:
+                return Err(e)
+            
+        async def _send() -> Result:
+            try:
+                if self.rate_limiter is not None:
+                    await self.rate_limiter.acquire(method, url, _new_params, _new_headers if _new_headers else headers)
+                r = await self.request(
+                    method,
+                    _url,
+                    content=_content,
+                    data=_data,
+                    files=files,
+                    json=json,
+                    params=_params,
+                    headers=_new_headers if _new_headers else headers,
+                    cookies=cookies,
+                    auth=auth,
+                    allow_redirects=allow_redirects,
+                    timeout=timeout
+                )
+            except Exception as e:
+                return Err(e)
 
-        _new_content = rjson
+            _sync_rate_limits(self, r)
 
-        if t_out:
             try:
-                # # TODO this is specific to kraken (the result key)
-                # # print(rjson)
-                # if not rjson.get("error"):
-                #     result = rjson["result"]
-                #     valid_resp = t_out(result)  # TODO verify after model syntax update
-                #     # print("Valid Resp", type(valid_resp))
-                #     # TODO should this be wrapped in a Result ???
-                #     _new_content = valid_resp
-                #     # print("Updated content", type(_new_content))
-                #     # print("Updated content inner value", type(_new_content._inner_value))
-                #     # print("Updated content inner value **2", type(_new_content._inner_value._inner_value))
-                # else:
-                #     _new_content = rjson["error"]
-
-                #! general case
-                _new_content: Result = t_out(rjson)
-
-
-                # cryptodom's full response models return ValidatioNError wrapped in Err
-                # so it wont be caught by try/except block => instance check
-                # if isinstance(_new_content.value, ValidationError):
-                #     # already wrapped in Err
-                #     return _new_content
-
+                # if `t_out` is given, content is validated
+                # cryptodom's full response models return ValidationError wrapped in Err
+                _new_content, r.decode_time = await _run_decode_validate(self, r.content, t_out)
             except ValidationError as e:
                 return Err(e)
             except Exception as e:
                 return Err(e)
 
+    
+            # add a new attribute to the response object 
+            setattr(r, "safe_content", _new_content)
+
+            return Ok(r)
+
+        send = _send
+
+        # requests signed here can not be sent again with the same nonce
+        if self.retry_policy is not None and not (auth_headers or signer):
+            send = functools.partial(self.retry_policy.call, method, url, _send)
 
-        # add a new attribute to the response object 
-        setattr(r, "safe_content", _new_content)
+        # only public GETs are coalesced
+        if (self.coalesce if coalesce is None else coalesce) and method.upper() == "GET" and not (auth_headers or signer):
+            send = functools.partial(self.coalescer.run, _coalesce_key(method, url, _new_params, t_out), send)
 
-        return Ok(r)
+        if self.cache is not None and method.upper() == "GET" and not (auth_headers or signer):
+            key = cache_key(method, url, _new_params, headers, _model_key(t_out))
+            return await self.cache.get_or_fetch(key, url, send)
+
+        return await send()
 
 
 
@@ -168,6 +375,49 @@ class _TypedHttpxClient(httpx.AsyncClient):
 #================================================================================
 
 class _TypedAioHttpClient(aiohttp.ClientSession):
+    """aiohttp.ClientSession with typed requests (see `safe_request`)
+
+    Args:
+    -----
+        decoder : str enum or callable
+            [stdlib, orjson] or any callable taking the raw body bytes (optional)
+            default = stdlib
+        offload_threshold : int
+            Body size in bytes above which decoding and `t_out` validation
+            run in `executor` instead of the event loop (optional)
+            default = None, always run on the event loop
+        executor : concurrent.futures.Executor
+            Thread or process pool for large bodies (optional)
+            default = None, the event loop's default executor
+        coalesce : bool
+            Concurrent identical GETs share one request and result (optional)
+            default = False, can be overriden per request
+        cache : crypto_dom.cache.ResponseCache
+            Validated responses of slow changing endpoints (optional)
+            default = None
+        rate_limiter :
+            Awaited before each request is sent, with `acquire(method, url, params, headers)`,
+            synced with the usage reported by responses with `update(usage)` (optional)
+            for ex crypto_dom.binance.rate_limit.RateLimiter
+            default = None
+        retry_policy : crypto_dom.retry.RetryPolicy
+            Retries of failed requests, except those signed with `auth_headers` or `signer` (optional)
+            default = None
+        (all other arguments are passed to aiohttp.ClientSession)
+
+    Note:
+    -----
+        Responses returned by `safe_request` have a `decode_time` attribute:
+        seconds spent decoding the body, and a `rate_limit_usage` attribute:
+        usage reported by Binance headers (see `crypto_dom.binance.rate_limit.parse_usage_headers`)
+
+        `safe_request(..., signer=Signer(key, secret))` encodes the (validated) payload once and sends
+        the signed bytes as is (see `Signer` in `kraken.__sign` and `binance.__sign`)
+
+        With a process pool, the decoder and `t_out` must be picklable.
+        The `ValidationPolicy` of a full response model decides in this process which responses
+        are validated, and gets the counters of the workers back
+    """
 
     from typing import NewType
     from types import SimpleNamespace
@@ -179,6 +429,31 @@ class _TypedAioHttpClient(aiohttp.ClientSession):
 
     _SENTINEL = NewType("_SENTINEL", object)
 
+    # attributes aiohttp allows to set on a session
+    ATTRS = aiohttp.ClientSession.ATTRS | frozenset(["decoder", "offload_threshold", "executor", "coalesce", "coalescer", "cache", "rate_limiter", "retry_policy"])
+
+    def __init__(
+        self,
+        *args,
+        decoder: Union[BACKEND, Decoder] = "stdlib",
+        offload_threshold: Optional[int] = None,
+        executor: Optional[concurrent.futures.Executor] = None,
+        coalesce: bool = False,
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[Any] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        **kwargs
+        ):
+        super().__init__(*args, **kwargs)
+        self.decoder = get_decoder(decoder)
+        self.offload_threshold = offload_threshold
+        self.executor = executor
+        self.coalesce = coalesce
+        self.coalescer = _Coalescer()
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+
 
     # see: https://github.com/aio-libs/aiohttp/blob/3250c5d75a54e19e2825d0a609f9d9cd4bf62087/aiohttp/client.py#L306
     async def safe_request(
@@ -212,6 +487,8 @@ class _TypedAioHttpClient(aiohttp.ClientSession):
         proxy_headers: Optional[LooseHeaders] = None,
         trace_request_ctx: Optional[SimpleNamespace] = None,
         read_bufsize: Optional[int] = None,
+        coalesce: Optional[bool] = None,
+        signer = None,
     ):
 
         _new_params = params
@@ -236,7 +513,8 @@ class _TypedAioHttpClient(aiohttp.ClientSession):
                 try:
                     valid_req = t_in(**data)    # TODO verify after model syntax update
                     _new_data = valid_req.dict(exclude_none=True)
-                    _new_headers = auth_headers(url=str_or_url, data=_new_data)
+                    if auth_headers:
+                        _new_headers = auth_headers(url=str_or_url, data=_new_data)
                 except ValidationError as e:
                     return Err(e)
                 except Exception as e:
@@ -244,62 +522,82 @@ class _TypedAioHttpClient(aiohttp.ClientSession):
 
             # TODO do we have to handle json kwarg as well ???
 
-        try:
-            r = await self.request(
-                method,
-                str_or_url,
-                params=_new_params, 
-                data=_new_data,
-                json=json,
-                cookies=cookies,
-                headers=_new_headers if _new_headers else headers,
-                skip_auto_headers=skip_auto_headers,
-                auth=auth,
-                allow_redirects=allow_redirects,
-                max_redirects=max_redirects,
-                compress=compress,
-                chunked=chunked,
-                expect100=expect100,
-                raise_for_status=raise_for_status,
-                read_until_eof=read_until_eof,
-                proxy=proxy,
-                proxy_auth=proxy_auth,
-                timeout=timeout,
-                ssl=ssl,
-                proxy_headers=proxy_headers,
-                trace_request_ctx=trace_request_ctx,
-                read_bufsize=read_bufsize
-                
-            )
-        except Exception as e:
-            return Err(e)
-
-        # see: https://github.com/aio-libs/aiohttp/blob/3250c5d75a54e19e2825d0a609f9d9cd4bf62087/aiohttp/client_reqrep.py#L1016
-        rjson = await r.json()
-        _new_content = rjson
+        _url, _data, _params = str_or_url, _new_data, _new_params
+        if signer is not None:
+            # payload encoded and signed once, the exact signed bytes are sent
+            try:
+                _url, _data, _new_headers = signer.sign(method, str(str_or_url), _new_data or _new_params or {}, headers)
+                _params = None
+            except Exception as e:
+                return Err(e)
 
-        if t_out:
+        async def _send() -> Result:
             try:
-                # # TODO this is specific to kraken (the result key)
-                # result = rjson["result"]
-                # valid_resp = t_out(result)  # TODO verify after model syntax update
-                # # print("Valid Resp", type(valid_resp))
-                # # TODO should this be wrapped in a Result ???
-                # _new_content = valid_resp
-                
-                # Update
-                _new_content = t_out(rjson)
+                if self.rate_limiter is not None:
+                    await self.rate_limiter.acquire(method, str_or_url, _new_params, _new_headers if _new_headers else headers)
+                r = await self.request(
+                    method,
+                    _url,
+                    params=_params, 
+                    data=_data,
+                    json=json,
+                    cookies=cookies,
+                    headers=_new_headers if _new_headers else headers,
+                    skip_auto_headers=skip_auto_headers,
+                    auth=auth,
+                    allow_redirects=allow_redirects,
+                    max_redirects=max_redirects,
+                    compress=compress,
+                    chunked=chunked,
+                    expect100=expect100,
+                    raise_for_status=raise_for_status,
+                    read_until_eof=read_until_eof,
+                    proxy=proxy,
+                    proxy_auth=proxy_auth,
+                    timeout=timeout,
+                    ssl=ssl,
+                    proxy_headers=proxy_headers,
+                    trace_request_ctx=trace_request_ctx,
+                    read_bufsize=read_bufsize
+                    
+                )
+            except Exception as e:
+                return Err(e)
 
+            _sync_rate_limits(self, r)
+    
+            # see: https://github.com/aio-libs/aiohttp/blob/3250c5d75a54e19e2825d0a609f9d9cd4bf62087/aiohttp/client_reqrep.py#L1016
+            # decode the raw body (`r.json()` decodes to text first)
+            # if `t_out` is given, content is validated
+            try:
+                _body = await r.read()
+                _new_content, r.decode_time = await _run_decode_validate(self, _body, t_out)
             except ValidationError as e:
                 return Err(e)
             except Exception as e:
                 return Err(e)
+    
+            # add a new attribute to the ClientResponse object
+            # see: https://github.com/aio-libs/aiohttp/blob/3250c5d75a54e19e2825d0a609f9d9cd4bf62087/aiohttp/client_reqrep.py#L648
+            setattr(r, "safe_content", _new_content)
+            
+            return Ok(r)
 
-        # add a new attribute to the ClientResponse object
-        # see: https://github.com/aio-libs/aiohttp/blob/3250c5d75a54e19e2825d0a609f9d9cd4bf62087/aiohttp/client_reqrep.py#L648
-        setattr(r, "safe_content", _new_content)
-        
-        return Ok(r)
+        send = _send
+
+        # requests signed here can not be sent again with the same nonce
+        if self.retry_policy is not None and not (auth_headers or signer):
+            send = functools.partial(self.retry_policy.call, method, str_or_url, _send)
+
+        # only public GETs are coalesced
+        if (self.coalesce if coalesce is None else coalesce) and method.upper() == "GET" and not (auth_headers or signer):
+            send = functools.partial(self.coalescer.run, _coalesce_key(method, str_or_url, _new_params, t_out), send)
+
+        if self.cache is not None and method.upper() == "GET" and not (auth_headers or signer):
+            key = cache_key(method, str_or_url, _new_params, headers, _model_key(t_out))
+            return await self.cache.get_or_fetch(key, str_or_url, send)
+
+        return await send()
 
 #================================================================================
 # INTERFACE
@@ -319,6 +617,8 @@ class HttypeClient:
 
 
 if __name__ == "__main__":
+
+    from crypto_dom.nonce import NonceGenerator
     from crypto_dom.kraken.market_data.ohlc import Request, Response, URL, METHOD
     from crypto_dom.kraken.user_trading.add_order import METHOD as NO_METH, URL as NO_URL, Request as NO_Req, Response as NO_Resp, _AddOrderResponse
     from crypto_dom.kraken import KrakenFullResponse
@@ -344,8 +644,8 @@ if __name__ == "__main__":
     # ----- NEW ORDER
     
 
-    def make_nonce():
-        return int(time.time()*10**3)
+    # strictly increasing, even for orders built in the same millisecond
+    make_nonce = NonceGenerator().next
 
     order_data = {
         "pair": "XZECZUSD",
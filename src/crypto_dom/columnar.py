@@ -0,0 +1,152 @@
+import typing
+from datetime import datetime, timezone
+
+import pydantic
+from pydantic.error_wrappers import ErrorWrapper
+
+# numpy is imported on first use (see `require_numpy`), it is only needed by columnar decoders
+np = None
+
+
+# ============================================================
+# COLUMNAR DECODERS
+# ============================================================
+
+
+# Helpers shared by the columnar decoders (Kraken OHLC, Binance Klines)
+# Rows are validated in bulk with numpy instead of one pydantic model per row,
+# errors are still raised as `pydantic.ValidationError` so callers (and full response models)
+# can handle both decoders the same way
+
+
+# same bounds as the `check_year_from_timestamp` validators (year within [2009, 2050])
+MIN_TIMESTAMP_S = int(datetime(2010, 1, 1, tzinfo=timezone.utc).timestamp())
+MAX_TIMESTAMP_S = int(datetime(2050, 1, 1, tzinfo=timezone.utc).timestamp())
+
+
+def require_numpy():
+    "import and return numpy"
+
+    global np
+
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("Columnar decoders require numpy - install with `pip install crypto-dom[columnar]`")
+        np = numpy
+
+    return np
+
+
+def validation_error(
+        model: typing.Type[pydantic.BaseModel],
+        errors: typing.Iterable[typing.Tuple[typing.Tuple[typing.Union[int, str], ...], Exception]]
+    ) -> pydantic.ValidationError:
+    "build a ValidationError from (loc, exception) tuples, with the same shape as pydantic's"
+    return pydantic.ValidationError([ErrorWrapper(exc, loc=loc) for loc, exc in errors], model)
+
+
+def to_matrix(
+        rows: typing.Sequence[typing.Sequence[typing.Any]],
+        arity: int,
+        *,
+        model: typing.Type[pydantic.BaseModel],
+        loc: typing.Tuple[typing.Union[int, str], ...],
+    ) -> "np.ndarray":
+    """2D object array of shape (len(rows), arity)
+
+    Raises:
+    -------
+        pydantic.ValidationError if `rows` is not an array of arrays of `arity` items
+    """
+
+    if not isinstance(rows, (list, tuple)):
+        raise validation_error(model, [(loc, TypeError("value is not a valid tuple"))])
+
+    if not rows:
+        return np.empty((0, arity), dtype=object)
+
+    matrix = np.array(rows, dtype=object)
+
+    if matrix.ndim != 2 or matrix.shape[1] != arity:
+        errors = []
+        for i, row in enumerate(rows):
+            if not isinstance(row, (list, tuple)):
+                errors.append(((*loc, i), TypeError("value is not a valid tuple")))
+            elif len(row) != arity:
+                errors.append(((*loc, i), ValueError(f"wrong tuple length {len(row)}, expected {arity}")))
+        raise validation_error(model, errors)
+
+    return matrix
+
+
+def to_column(
+        matrix: "np.ndarray",
+        index: int,
+        dtype: typing.Any,
+        *,
+        model: typing.Type[pydantic.BaseModel],
+        loc: typing.Tuple[typing.Union[int, str], ...],
+    ) -> "np.ndarray":
+    """convert column `index` of an object matrix to a contiguous array of `dtype`
+
+    Raises:
+    -------
+        pydantic.ValidationError (located on the first invalid row) if a value can not be converted
+    """
+
+    column = matrix[:, index]
+
+    try:
+        return np.ascontiguousarray(column.astype(dtype))
+    except (TypeError, ValueError, OverflowError):
+        pass
+
+    # slow path, only taken on invalid input: locate the offending values
+    errors = []
+    for i, value in enumerate(column):
+        try:
+            np.array([value], dtype=object).astype(dtype)
+        except (TypeError, ValueError, OverflowError):
+            errors.append(((*loc, i, index), TypeError(f"value {value!r} is not a valid {np.dtype(dtype).name}")))
+    raise validation_error(model, errors)
+
+
+def check_column(
+        values: "np.ndarray",
+        invalid: "np.ndarray",
+        message: str,
+        *,
+        index: int,
+        model: typing.Type[pydantic.BaseModel],
+        loc: typing.Tuple[typing.Union[int, str], ...],
+    ) -> None:
+    """raise a ValidationError for each row flagged in the boolean mask `invalid`
+
+    Note:
+    -----
+        `message` is formatted with the offending `value`
+    """
+
+    if not invalid.any():
+        return
+
+    raise validation_error(
+        model,
+        [((*loc, int(i), index), ValueError(message.format(value=values[i]))) for i in np.flatnonzero(invalid)]
+    )
+
+
+def scale(values: "np.ndarray", decimals: typing.Optional[int]) -> "np.ndarray":
+    """prices as float64, or as int64 scaled by 10**decimals if `decimals` is given
+
+    Note:
+    -----
+        Scaling goes through float64, which is exact for up to 15 significant digits
+    """
+
+    if decimals is None:
+        return values
+
+    return np.rint(values * 10 ** decimals).astype(np.int64)
@@ -0,0 +1,58 @@
+import json
+import typing
+
+from typing_extensions import Literal
+
+
+# ============================================================
+# JSON DECODERS
+# ============================================================
+
+
+# Response bodies are decoded straight from the raw bytes:
+# no text decoding step (charset detection, str copy) before parsing.
+# On large payloads (exchangeInfo, AssetPairs, all symbols tickers) decoding
+# is a large share of the request latency, orjson is several times faster than the stdlib.
+
+
+BACKEND = Literal["stdlib", "orjson"]
+
+Decoder = typing.Callable[[bytes], typing.Any]
+
+
+def _orjson() -> Decoder:
+    try:
+        import orjson
+    except ImportError:
+        raise ImportError("orjson decoder requires orjson - install with `pip install orjson`")
+    return orjson.loads
+
+
+_BACKENDS: typing.Dict[str, typing.Callable[[], Decoder]] = {
+    # json.loads accepts bytes (utf-8, 16 or 32 detected from the first bytes)
+    "stdlib": lambda: json.loads,
+    "orjson": _orjson,
+}
+
+
+def get_decoder(decoder: typing.Union[BACKEND, Decoder] = "stdlib") -> Decoder:
+    """callable decoding a raw JSON body
+
+    Args:
+    -----
+        decoder : str enum or callable
+            [stdlib, orjson] or any callable taking the body bytes
+
+    Raises:
+    -------
+        ValueError for an unknown backend name
+        ImportError if the backend is not installed
+    """
+
+    if callable(decoder):
+        return decoder
+
+    try:
+        return _BACKENDS[decoder]()
+    except KeyError:
+        raise ValueError(f"Invalid decoder {decoder} - must be a callable or one of {tuple(_BACKENDS)}")
@@ -1,4 +1,5 @@
 import re
+import typing
 
 import pydantic
 
@@ -46,6 +47,57 @@ class Nstr(pydantic.ConstrainedStr):
         return f"<{self.__class__.__name__}:{self._value}>"
 
 
+#------------------------------------------------------------
+# Base Models
+#------------------------------------------------------------
+
+
+class MappingModel(pydantic.BaseModel):
+    """Model with a fixed schema for responses keyed by names not known in advance
+    (for ex pair or asset names). Subclasses define the mapping as their root type:
+
+        class _TickerResponse(MappingModel):
+            __root__: typing.Mapping[PAIR, _Ticker]
+
+    Keys remain accessible as attributes, like fields of a dynamically created model.
+    """
+
+    __root__: typing.Mapping[str, typing.Any]
+
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        try:
+            return self.__dict__["__root__"][name]
+        except KeyError:
+            raise AttributeError(f"{self.__class__.__name__} has no key {name}")
+
+    def __getitem__(self, key: str):
+        return self.__root__[key]
+
+    def __iter__(self):
+        return iter(self.__root__)
+
+    def __len__(self) -> int:
+        return len(self.__root__)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.__root__
+
+    def keys(self):
+        return self.__root__.keys()
+
+    def values(self):
+        return self.__root__.values()
+
+    def items(self):
+        return self.__root__.items()
+
+    def dict(self, **kwargs) -> typing.Dict[str, typing.Any]:
+        # same output as the dynamically created models: {key: value}
+        return super().dict(**kwargs)["__root__"]
+
+
 #------------------------------------------------------------
 # Counting
 #------------------------------------------------------------
@@ -96,6 +148,49 @@ TIMESTAMP_NS = _IntTimestamp
 #------------------------------------------------------------
 
 
+class HashedLiteral(str):
+    """String restricted to a large set of values, checked with a hash lookup
+    Runtime replacement for `Literal[...]` with the same validation errors and schema.
+    Create with `hashed_literal`.
+    """
+
+    # same attribute as a Literal, values in declaration order
+    __args__: typing.Tuple[str, ...] = ()
+    _values: typing.FrozenSet[str] = frozenset()
+
+    # set by `hashed_literal` on the types it creates
+    validate: typing.ClassVar[typing.Callable[[typing.Any], str]]
+
+    @classmethod
+    def __get_validators__(cls):
+        if "validate" not in cls.__dict__:
+            raise TypeError(f"{cls.__name__} is not a field type - create one with `hashed_literal`")
+        yield cls.validate
+
+    @classmethod
+    def __modify_schema__(cls, field_schema):
+        field_schema.update(enum=list(cls.__args__))
+
+
+def hashed_literal(name: str, values: typing.Iterable[str]) -> typing.Type[HashedLiteral]:
+    "new HashedLiteral type accepting `values`"
+
+    values = tuple(values)
+    allowed = frozenset(values)
+
+    # closure over the frozenset, avoids attribute lookups on every validation
+    def validate(v):
+        try:
+            if v in allowed:
+                return v
+        except TypeError:
+            # unhashable value
+            pass
+        raise pydantic.errors.WrongConstantError(given=v, permitted=values)
+
+    return type(name, (HashedLiteral,), {"__args__": values, "_values": allowed, "validate": staticmethod(validate)})
+
+
 # pydantic symbol
 #   type will only be checked upon validation of a 
 #   pydantic model which has a field of the present type
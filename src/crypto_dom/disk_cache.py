@@ -0,0 +1,194 @@
+import hashlib
+import os
+import pickle
+import struct
+import threading
+import time
+import typing
+import zlib
+
+import httpx
+
+from crypto_dom.result import Result, Ok
+
+
+# ============================================================
+# DISK WARM-START CACHE
+# ============================================================
+
+
+# A restarted worker has to download and validate exchangeInfo, AssetPairs and Assets
+# again before it can trade. The disk cache keeps the validated content of these responses,
+# so a new process can start from it (read lazily, on the first request of each endpoint)
+# while `ResponseCache` refreshes it in the background.
+#
+# One file per request (sha1 of the cache key):
+#   header  : magic, version, pickle protocol, stored at (unix time), max age, payload size, crc32 (`_HEADER`)
+#   payload : zlib compressed pickle of (status code, validated content)
+
+
+MAGIC = b"CDDC"
+VERSION = 1
+
+DEFAULT_DIRECTORY = os.environ.get(
+    "CRYPTO_DOM_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "crypto_dom")
+)
+
+# slow changing public endpoints, maximum age of a file in seconds
+DEFAULT_MAX_AGES = {
+    "https://api.binance.com/api/v3/exchangeInfo": 86400.0,
+    "https://api.kraken.com/0/public/AssetPairs": 86400.0,
+    "https://api.kraken.com/0/public/Assets": 86400.0,
+}
+
+_HEADER = struct.Struct("<4sHHddII")
+
+
+class DiskCache:
+    """Validated responses of selected endpoints, persisted between processes
+
+    Args:
+    -----
+        directory : str
+            default = DEFAULT_DIRECTORY (`~/.cache/crypto_dom`, or CRYPTO_DOM_CACHE_DIR)
+        max_ages : Mapping[str, float]
+            Endpoints (url) to persist, mapped to the seconds a file can be used (optional)
+            default = DEFAULT_MAX_AGES
+        compression : int
+            zlib level (default = 6)
+
+    Counters:
+    ---------
+        loads : int
+            Responses read from disk
+        stores : int
+            Responses written to disk
+        errors : int
+            Unreadable, corrupted or unpicklable files and contents
+
+    Usage:
+    ------
+        cache = ResponseCache(disk=DiskCache())
+
+    Note:
+    -----
+        Responses read from disk are `httpx.Response` objects whatever the client,
+        with the validated `safe_content`, no body, and a `from_disk` attribute set to True.
+        Files are unpickled: only use a directory that is not writable by others.
+    """
+
+    def __init__(
+            self,
+            directory: str = DEFAULT_DIRECTORY,
+            max_ages: typing.Optional[typing.Mapping[str, float]] = None,
+            compression: int = 6,
+        ):
+        self.directory = directory
+        self.max_ages = dict(DEFAULT_MAX_AGES if max_ages is None else max_ages)
+        self.compression = compression
+
+        self.loads = 0
+        self.stores = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def max_age(self, url: typing.Any) -> typing.Optional[float]:
+        "maximum age of the files of the endpoint, None if it is not persisted"
+        return self.max_ages.get(str(url).split("?", 1)[0])
+
+    def path(self, key: tuple) -> str:
+        return os.path.join(self.directory, hashlib.sha1(repr(key).encode()).hexdigest() + ".bin")
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    # ---- write
+
+    def store(self, key: tuple, url: typing.Any, result: Result) -> bool:
+        "persist a successful `result`, returns False if the endpoint is not persisted or writing failed"
+
+        max_age = self.max_age(url)
+        if max_age is None or not isinstance(result, Ok):
+            return False
+
+        r = result.value
+        try:
+            payload = zlib.compress(
+                pickle.dumps((getattr(r, "status_code", getattr(r, "status", 200)), r.safe_content), protocol=pickle.HIGHEST_PROTOCOL),
+                self.compression
+            )
+            header = _HEADER.pack(MAGIC, VERSION, pickle.HIGHEST_PROTOCOL, time.time(), max_age, len(payload), zlib.crc32(payload))
+
+            os.makedirs(self.directory, exist_ok=True)
+            filename = self.path(key)
+            # write then rename, readers never see a partial file
+            tmp = f"{filename}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as file:
+                file.write(header)
+                file.write(payload)
+            os.replace(tmp, filename)
+        except Exception:
+            self._count("errors")
+            return False
+
+        self._count("stores")
+        return True
+
+    # ---- read
+
+    def load(self, key: tuple, url: typing.Any) -> typing.Optional[Result]:
+        "persisted Result of `key`, None if missing, older than its max age, or unreadable"
+
+        if self.max_age(url) is None:
+            return None
+
+        try:
+            with open(self.path(key), "rb") as file:
+                data = file.read()
+        except OSError:
+            return None
+
+        try:
+            magic, version, protocol, stored_at, max_age, size, crc = _HEADER.unpack_from(data, 0)
+            if magic != MAGIC or version != VERSION or protocol > pickle.HIGHEST_PROTOCOL:
+                raise ValueError(f"Invalid cache file: magic {magic!r} version {version} protocol {protocol}")
+
+            # the header is checked before the payload is decompressed
+            if time.time() - stored_at > max_age:
+                return None
+
+            payload = data[_HEADER.size:]
+            if len(payload) != size or zlib.crc32(payload) != crc:
+                raise ValueError("Invalid cache file: corrupted payload")
+
+            status_code, safe_content = pickle.loads(zlib.decompress(payload))
+        except Exception:
+            self._count("errors")
+            return None
+
+        r = httpx.Response(status_code, request=httpx.Request("GET", str(url)))
+        setattr(r, "safe_content", safe_content)
+        setattr(r, "decode_time", 0.0)
+        setattr(r, "from_disk", True)
+
+        self._count("loads")
+        return Ok(r)
+
+    def clear(self) -> None:
+        "remove all files of the directory written by the cache"
+
+        if not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            # sha1 hex digest + ".bin"
+            if len(name) == 44 and name.endswith(".bin"):
+                os.remove(os.path.join(self.directory, name))
+
+    def stats(self) -> typing.Dict[str, int]:
+        with self._lock:
+            return {"loads": self.loads, "stores": self.stores, "errors": self.errors}
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}:{self.directory}>"
@@ -1,6 +1,6 @@
 import asyncio
 
-from crypto_dom.client import HttypeClient
+from crypto_dom.pool import POOL_MANAGER
 from crypto_dom.kraken import KrakenFullResponse
 from crypto_dom.kraken.market_data.ohlc import METHOD, URL, Request, Response as OHLCResponse
 
@@ -13,20 +13,34 @@ payload = {
 
 async def safe_ohlc():
 
-    async with HttypeClient.httpx() as client:
-        r = await client.safe_request(METHOD, URL, t_in=Request, t_out=KrakenFullResponse(OHLCResponse()), params=payload)
-        
-        # r is wrapped inside a result, "value" attribute will gives us the inner value
-        if r.is_ok():
-            # gives us access to all the same methods and properties as regular httpx client
-            rjson = r.value.json()
-            rstatus = r.value.status_code
+    # shared client for the host of URL, connections are kept alive between requests
+    client = POOL_MANAGER.client(URL)
+    r = await client.safe_request(METHOD, URL, t_in=Request, t_out=KrakenFullResponse(OHLCResponse()), params=payload)
+    
+    # r is wrapped inside a result, "value" attribute will gives us the inner value
+    if r.is_ok():
+        # gives us access to all the same methods and properties as regular httpx client
+        rjson = r.value.json()
+        rstatus = r.value.status_code
 
-            # extra property "safe_content"
-            print(r.value.safe_content)
+        # extra property "safe_content"
+        print(r.value.safe_content)
 
-        else:
-            # print error
-            print(r.value)
+    else:
+        # print error
+        print(r.value)
 
-asyncio.run(safe_ohlc())
\ No newline at end of file
+
+async def main():
+
+    # open connections at startup
+    await POOL_MANAGER.prewarm()
+
+    for _ in range(3):
+        await safe_ohlc()
+
+    print(POOL_MANAGER.stats())
+    await POOL_MANAGER.aclose()
+
+
+asyncio.run(main())
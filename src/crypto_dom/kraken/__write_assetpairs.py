@@ -3,7 +3,35 @@ import json
 
 import httpx
 
+from crypto_dom.__write_definitions import _write_literal_definitions
 from crypto_dom.kraken.market_data.asset_pairs import URL
+from crypto_dom.symbol_store import write_store
+
+
+# binary store fields (see `crypto_dom.symbol_store`)
+# fee schedules and leverage are variable length, they are only in the json data
+_PAIR_FIELDS = [
+    ("pair", "str"),
+    ("altname", "str"),
+    ("wsname", "str"),
+    ("aclass_base", "str"),
+    ("base", "asset"),
+    ("aclass_quote", "str"),
+    ("quote", "asset"),
+    ("lot", "str"),
+    ("pair_decimals", "u8"),
+    ("lot_decimals", "u8"),
+    ("lot_multiplier", "i32"),
+    ("fee_volume_currency", "asset"),
+    ("margin_call", "i32"),
+    ("margin_stop", "i32"),
+    ("ordermin", "dec"),
+]
+
+
+def _write_kraken_pairs_store(filename: str, result: dict):
+    rows = ({"pair": pair, **data} for pair, data in result.items())
+    write_store(filename, "kraken_assetpairs", "pair", _PAIR_FIELDS, rows)
 
 
 async def _write_kraken_pairs(folder: str):
@@ -16,15 +44,13 @@ async def _write_kraken_pairs(folder: str):
         # json data
         with open(f'{folder}_data_assetpairs.json', 'w') as file:
             json.dump(result, file)
+
+        # binary store
+        _write_kraken_pairs_store(f"{folder}_data_assetpairs.bin", result)
         
         # type definition (Literal)
-        with open(f'{folder}_definitions_assetpairs.py', 'w') as file:
-            file.write("# This file is auto-generated\n\n")
-            file.write("from typing_extensions import Literal\n\n")
-            file.write("PAIR = Literal[\n")
-            file.writelines(map(lambda x: f"{4*' '}'{str(x)}',\n", pairs))
-            file.write("]")
+        _write_literal_definitions(f"{folder}_definitions_assetpairs.py", "PAIR", pairs)
 
 
 if __name__ == "__main__":
-    asyncio.run(_write_kraken_pairs())
\ No newline at end of file
+    asyncio.run(_write_kraken_pairs())
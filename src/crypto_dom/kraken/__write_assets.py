@@ -3,6 +3,7 @@ import json
 
 import httpx
 
+from crypto_dom.__write_definitions import _write_literal_definitions
 from crypto_dom.kraken.market_data.assets import URL
 
 
@@ -18,12 +19,7 @@ async def _write_kraken_assets(folder: str):
             json.dump(result, file)
 
         # type definition (Literal)
-        with open(f'{folder}_definitions_assets.py', 'w') as file:
-            file.write("# This file is auto-generated\n\n")
-            file.write("from typing_extensions import Literal\n\n")
-            file.write("ASSET = Literal[\n")
-            file.writelines(map(lambda x: f"{4*' '}'{str(x)}',\n", assets))
-            file.write("]")
+        _write_literal_definitions(f"{folder}_definitions_assets.py", "ASSET", assets)
 
 
 if __name__ == "__main__":
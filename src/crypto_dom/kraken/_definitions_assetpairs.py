@@ -1,8 +1,13 @@
 # This file is auto-generated
 
+import typing
+
 from typing_extensions import Literal
 
-PAIR = Literal[
+from crypto_dom.definitions import hashed_literal
+
+
+_PAIR = Literal[
     'AAVEAUD',
     'AAVEETH',
     'AAVEEUR',
@@ -359,4 +364,9 @@ PAIR = Literal[
     'ZRXXBT',
     'ZUSDZCAD',
     'ZUSDZJPY',
-]
\ No newline at end of file
+]
+
+if typing.TYPE_CHECKING:
+    PAIR = _PAIR
+else:
+    PAIR = hashed_literal("PAIR", _PAIR.__args__)
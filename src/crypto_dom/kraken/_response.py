@@ -0,0 +1,94 @@
+import typing
+
+import pydantic
+
+from crypto_dom.result import Err, Ok, Result
+from crypto_dom.validation import MODE, ValidationPolicy, get_policy
+
+
+
+class ErrorResponse(pydantic.BaseModel):
+
+    error: typing.Tuple[typing.Optional[str], ...]
+
+
+class KrakenFullResponse:
+    """Full response model (error and result) for Kraken endpoints
+
+    Args:
+    -----
+        success_model :
+            Response model of the endpoint, used to validate the `result` key
+        validation : str enum or ValidationPolicy
+            [strict, sampled, trusted] (optional)
+            default = strict, every response is fully validated
+
+    Usage:
+    ------
+        model = KrakenFullResponse(Response(), validation=ValidationPolicy("sampled", sample_every=50))
+        result = model(JSON_response_content)
+    """
+
+    def __init__(self, success_model, validation: typing.Union[MODE, ValidationPolicy] = "strict"):
+        self.success_model = success_model
+        self.validation = get_policy(validation)
+
+    def __call__(self, full_response: dict) -> Result[pydantic.BaseModel, Exception]:
+
+        # check is response is an error
+        if not "result" in full_response.keys():
+            if full_response.get("error"):
+                try:
+                    _err = ErrorResponse(**full_response)
+                    return Err(_err)
+                except pydantic.ValidationError as e:
+                    return Err(e)
+            else:
+                return Err(f"{full_response}")
+
+
+        else:
+            try:
+                # pydantic models are unpacked, wrappers around pydantic that we defined are called
+                # depending on the policy, the result might be built without validation
+                _res = self.validation(self.success_model, full_response["result"])
+                return Ok(_res)
+
+            except pydantic.ValidationError as e:
+                # ? should we raise or return
+                # ? if we raise, we can catch exception when composing this withing larger app
+                # ? ==> return, so we contain error in `safe_content` attribute and still 
+                # ?     have access to rest of response attributes
+                return Err(e)
+
+
+
+if __name__ == "__main__":
+
+    import asyncio
+    import httpx
+
+    from crypto_dom.kraken.market_data.trades import Request, URL, METHOD
+    from crypto_dom.kraken.market_data.ohlc import Response
+
+
+    payload = {
+        "pair": "XXBTZUSD",
+        "interval": 60
+    }
+
+
+    async def test():
+
+        async with httpx.AsyncClient() as client:
+            r = await client.request(METHOD, URL, params=payload)
+            rjson = r.json()
+
+            try: 
+                _model = KrakenFullResponse(Response())
+                _valid = _model(rjson)
+                print(_valid)
+            except pydantic.ValidationError as e:
+                print(e)
+
+    asyncio.run(test())
\ No newline at end of file
@@ -48,4 +48,23 @@ ERROR = Literal[
     'EOrder:Unknown position',
     'EOrder:Scheduled orders limit exceeded',
     'EOrder:Margin level too low',
-]
\ No newline at end of file
+]
+
+
+# the request was not processed, it can be sent again
+RATE_LIMIT_ERRORS = frozenset([
+    'EAPI:Rate limit exceeded',
+    'EOrder:Rate limit exceeded',
+    'EGeneral:Temporary lockout',
+])
+NOT_PROCESSED_ERRORS = frozenset([
+    'EAPI:Invalid nonce',
+    'EService:Unavailable',
+    'EService:Busy',
+])
+
+# the request may have been executed
+UNKNOWN_STATUS_ERRORS = frozenset([
+    'EGeneral:Internal error',
+    'EDatabase:Internal error',
+])
@@ -0,0 +1,187 @@
+import asyncio
+import typing
+
+from crypto_dom.nonce import NonceGenerator
+from crypto_dom.result import Result, Err
+from crypto_dom.kraken.__sign import get_keys, Signer
+from crypto_dom.kraken.rate_limit import RateLimiter
+
+
+# ============================================================
+# API KEY POOL
+# ============================================================
+
+
+# Private calls are rate limited per API key (see `kraken.rate_limit`).
+# With several keys for the same account, the pool sends each call with the least loaded key,
+# so read heavy jobs (ledgers, trades history) scale with the number of keys.
+# Each key has its own nonce sequence, keys rejected with `EAPI:Invalid key` are taken out of rotation.
+# Kraken rejects a nonce lower than the last one it received for the key: unless the keys have
+# a nonce window, the calls of a key are sent one at a time, so they arrive in nonce order.
+
+
+INVALID_KEY = "EAPI:Invalid key"
+
+
+class _Key:
+
+    __slots__ = ("key", "signer", "active", "pending", "in_flight", "requests", "lock")
+
+    def __init__(self, key: str, secret: str):
+        self.key = key
+        self.signer = Signer(key, secret)
+        self.active = True
+        # cost of calls selected but not yet counted by the limiter
+        self.pending = 0.0
+        # calls selected and not answered yet
+        self.in_flight = 0
+        self.requests = 0
+        self.lock: typing.Optional[asyncio.Lock] = None
+
+
+class KeyPool:
+    """Spreads Kraken private calls across API keys
+
+    Args:
+    -----
+        keys : Iterable[Tuple[str, str]]
+            (key, secret) pairs (optional)
+            default = all pairs found in the environment (see `kraken.__sign.get_keys`)
+        limiter : crypto_dom.kraken.rate_limit.RateLimiter
+            Call counters of the keys (optional)
+            default = RateLimiter(), starter tier
+        nonces : crypto_dom.nonce.NonceGenerator
+            Nonces of the keys, shared with other processes using the same keys (optional)
+            default = NonceGenerator(), milliseconds, in process
+        nonce_window : bool
+            Whether the keys have a nonce window, and accept calls arriving out of nonce order (optional)
+            default = False, the calls of a key are sent one at a time
+
+    Usage:
+    ------
+        pool = KeyPool(limiter=RateLimiter("intermediate"))
+        async with HttypeClient.httpx() as client:
+            r = await pool.safe_request(client, METHOD, URL, t_in=Request, t_out=KrakenFullResponse(Response()), data=payload)
+
+    Note:
+    -----
+        The pool schedules calls with its limiter, do not also give it to the client as `rate_limiter`.
+        The nonce of `data` is set by the pool.
+    """
+
+    def __init__(
+            self,
+            keys: typing.Optional[typing.Iterable[typing.Tuple[str, str]]] = None,
+            limiter: typing.Optional[RateLimiter] = None,
+            nonces: typing.Optional[NonceGenerator] = None,
+            nonce_window: bool = False,
+        ):
+        pairs = list(get_keys() if keys is None else keys)
+        if not pairs:
+            raise ValueError("No API key given")
+
+        self._keys = {key: _Key(key, secret) for key, secret in pairs}
+        self.limiter = limiter if limiter is not None else RateLimiter()
+        self.nonces = nonces if nonces is not None else NonceGenerator()
+        self.nonce_window = nonce_window
+
+    @property
+    def active_keys(self) -> typing.List[str]:
+        return [k.key for k in self._keys.values() if k.active]
+
+    def _load(self, k: _Key) -> float:
+        return self.limiter.counter(k.key) + k.pending
+
+    def select(self) -> typing.Optional[_Key]:
+        "least loaded active key, preferring keys without a call in flight, None if there is none left"
+
+        active = [k for k in self._keys.values() if k.active]
+        if not active:
+            return None
+        if self.nonce_window:
+            return min(active, key=self._load)
+        return min(active, key=lambda k: (k.in_flight > 0, self._load(k)))
+
+    def can_send(self, url: typing.Any) -> bool:
+        "whether a call to `url` would be sent without waiting for a counter to decay"
+
+        cost = self.limiter.cost(url)
+        return any(self._load(k) + cost <= self.limiter.max_counter for k in self._keys.values() if k.active)
+
+    def disable(self, key: str) -> None:
+        "take a key out of rotation"
+        self._keys[key].active = False
+
+    def nonce(self, key: str) -> int:
+        return self.nonces.next(key)
+
+    async def safe_request(self, client, method: str, url: str, *, data: typing.Optional[dict] = None, **kwargs) -> Result:
+        """`client.safe_request`, signed with the least loaded key
+
+        Args:
+        -----
+            client :
+                Typed client (see `crypto_dom.client.HttypeClient`)
+            data : dict
+                Payload, without nonce
+            (all other arguments are passed to `client.safe_request`)
+        """
+
+        k = self.select()
+        if k is None:
+            return Err(ValueError(f"No valid API key left: {INVALID_KEY}"))
+
+        k.in_flight += 1
+        try:
+            if self.nonce_window:
+                result = await self._send(k, client, method, url, data, kwargs)
+            else:
+                if k.lock is None:
+                    k.lock = asyncio.Lock()
+                # one call of the key at a time: nonces reach Kraken in order
+                async with k.lock:
+                    result = await self._send(k, client, method, url, data, kwargs)
+        finally:
+            k.in_flight -= 1
+
+        if _invalid_key(result):
+            self.disable(k.key)
+        return result
+
+    async def _send(self, k: _Key, client, method: str, url: str, data: typing.Optional[dict], kwargs: dict) -> Result:
+
+        cost = self.limiter.cost(url)
+        k.pending += cost
+        try:
+            await self.limiter.acquire(method, url, headers={"API-Key": k.key})
+        finally:
+            k.pending -= cost
+
+        # the nonce is taken once the call can be sent
+        payload = {**(data or {}), "nonce": self.nonces.next(k.key)}
+        k.requests += 1
+        return await client.safe_request(method, url, data=payload, signer=k.signer, **kwargs)
+
+    def stats(self) -> typing.Dict[str, typing.Dict[str, typing.Any]]:
+        "per key stats, keys are truncated"
+        return {
+            f"{k.key[:8]}...": {"active": k.active, "requests": k.requests, "counter": self.limiter.counter(k.key)}
+            for k in self._keys.values()
+        }
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+def _invalid_key(result: Result) -> bool:
+    if result.is_err():
+        return False
+    content = getattr(result.value, "safe_content", None)
+    if isinstance(content, Err):
+        errors = getattr(content.value, "error", None)
+    elif isinstance(content, dict):
+        # no t_out: raw json content
+        errors = content.get("error")
+    else:
+        return False
+    return INVALID_KEY in (errors or ())
@@ -0,0 +1,14 @@
+import typing
+
+from crypto_dom._lazy import attach
+
+
+# endpoint modules are imported on first access
+__getattr__, __dir__ = attach(__name__, __path__, {
+    "MODEL_CACHE": "crypto_dom.kraken.market_data._model_cache",
+    "prewarm": "crypto_dom.kraken.market_data._model_cache",
+})
+
+
+if typing.TYPE_CHECKING:
+    from crypto_dom.kraken.market_data._model_cache import MODEL_CACHE, prewarm
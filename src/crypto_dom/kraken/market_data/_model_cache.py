@@ -0,0 +1,156 @@
+import importlib
+import threading
+import typing
+from collections import OrderedDict
+
+import pydantic
+
+
+# ============================================================
+# RESPONSE MODEL CACHE
+# ============================================================
+
+
+# OHLC, Depth, Trades and Spread responses are keyed by the pair name,
+# so their response model has to be generated for each pair.
+# Generating a model (class definition + `pydantic.create_model`) is expensive
+# compared to validating a response, and pollers request the same pairs over and over.
+
+
+_ModelFactory = typing.Callable[[str], typing.Type[pydantic.BaseModel]]
+
+
+# endpoints sharing the cache, mapped to the module that registers their model factory
+ENDPOINTS = {
+    "ohlc": "crypto_dom.kraken.market_data.ohlc",
+    "orderbook": "crypto_dom.kraken.market_data.orderbook",
+    "trades": "crypto_dom.kraken.market_data.trades",
+    "spread": "crypto_dom.kraken.market_data.spread",
+}
+
+
+class ModelCache:
+    """Bounded, thread-safe LRU cache of per-pair response models
+
+    Args:
+    -----
+        maxsize : int
+            Maximum number of models kept in the cache (default = 256)
+            Least recently used models are evicted first
+
+    Usage:
+    ------
+        cache = ModelCache()
+        cache.register("ohlc", _generate_model)
+        model = cache.get("ohlc", "XXBTZUSD")
+
+    Note:
+    -----
+        A cache hit always returns the same model class for a given (endpoint, pair)
+    """
+
+    def __init__(self, maxsize: int = 256):
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be a positive integer - Given: {maxsize}")
+
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._factories: typing.Dict[str, _ModelFactory] = {}
+        self._models: "OrderedDict[typing.Tuple[str, str], typing.Type[pydantic.BaseModel]]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def register(self, endpoint: str, factory: _ModelFactory) -> None:
+        "register the function generating the response model of `endpoint` for a given pair"
+        with self._lock:
+            self._factories[endpoint] = factory
+
+    def get(self, endpoint: str, pair: str) -> typing.Type[pydantic.BaseModel]:
+        "return the response model of `endpoint` for `pair`, generating it on a cache miss"
+
+        key = (endpoint, pair)
+
+        with self._lock:
+            try:
+                model = self._models[key]
+            except KeyError:
+                pass
+            else:
+                self._models.move_to_end(key)
+                self.hits += 1
+                return model
+
+            try:
+                factory = self._factories[endpoint]
+            except KeyError:
+                raise KeyError(f"No model factory registered for endpoint {endpoint}")
+
+            # generate while holding the lock, so concurrent misses on the same key
+            # do not produce two different classes
+            model = factory(pair)
+            self.misses += 1
+            self._models[key] = model
+
+            if len(self._models) > self.maxsize:
+                self._models.popitem(last=False)
+                self.evictions += 1
+
+            return model
+
+    def prewarm(self, pairs: typing.Iterable[str], endpoints: typing.Optional[typing.Iterable[str]] = None) -> None:
+        """generate models for all `pairs` ahead of the first response
+
+        Args:
+        -----
+            pairs : Iterable[str]
+                Pair names as returned in the response keys
+            endpoints : Iterable[str]
+                Endpoints to prewarm (optional)
+                default = all endpoints sharing the cache
+        """
+
+        endpoints = tuple(endpoints) if endpoints is not None else tuple(ENDPOINTS.keys())
+
+        for endpoint in endpoints:
+            if endpoint not in self._factories and endpoint in ENDPOINTS:
+                # importing the endpoint module registers its factory
+                importlib.import_module(ENDPOINTS[endpoint])
+
+        for pair in pairs:
+            for endpoint in endpoints:
+                self.get(endpoint, pair)
+
+    def clear(self) -> None:
+        "remove all cached models and reset counters"
+        with self._lock:
+            self._models.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> typing.Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._models),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def __contains__(self, key: typing.Tuple[str, str]) -> bool:
+        return key in self._models
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+
+# shared by ohlc, orderbook, trades and spread
+MODEL_CACHE = ModelCache()
+
+
+def prewarm(pairs: typing.Iterable[str], endpoints: typing.Optional[typing.Iterable[str]] = None) -> None:
+    "generate and cache the response models for `pairs` (see `ModelCache.prewarm`)"
+    MODEL_CACHE.prewarm(pairs, endpoints)
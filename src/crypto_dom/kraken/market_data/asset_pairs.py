@@ -3,12 +3,10 @@ from decimal import Decimal
 
 from typing_extensions import Literal
 import pydantic
-import stackprinter
 
-stackprinter.set_excepthook(style="darkbg2")
-
-from crypto_dom.definitions import COUNT
+from crypto_dom.definitions import COUNT, MappingModel
 from crypto_dom.kraken.definitions import ASSETCLASS, PAIR, ASSET
+from crypto_dom.validation import construct_model
 
 
 # ============================================================
@@ -104,45 +102,35 @@ class Request(pydantic.BaseModel):
 # ------------------------------
 
 
-def _generate_model(keys: typing.List[str]) -> typing.Type[pydantic.BaseModel]:
-    """dynamically create the model. Returns a new pydantic model class
+class _AssetPair(pydantic.BaseModel):
 
-    Args:
-    ----
-        key: List[str]
-            List of assetpair names that map to their info
+    altname: str
+    # darkpools don't have a wsname
+    wsname: typing.Optional[str]
+    # TODO should strings always be StrictStr
+    aclass_base: ASSETCLASS
+    base: ASSET
+    aclass_quote: ASSETCLASS
+    quote: ASSET
+    lot: str
+    pair_decimals: COUNT
+    lot_decimals: COUNT
+    lot_multiplier: COUNT
+    leverage_buy: typing.Tuple[int, ...]
+    leverage_sell: typing.Tuple[int, ...]
+    fees: typing.Tuple[typing.Tuple[Decimal, Decimal], ...]
+    fees_maker: typing.Optional[typing.Tuple[typing.Tuple[Decimal, Decimal], ...]] # no maker fees if pair is darkpool
+    fee_volume_currency: str
+    margin_call: pydantic.PositiveInt
+    margin_stop: pydantic.PositiveInt
+    ordermin: typing.Optional[Decimal]
 
-    """
 
-    class _AssetPair(pydantic.BaseModel):
-
-        altname: str
-        # darkpools don't have a wsname
-        wsname: typing.Optional[str]
-        # TODO should strings always be StrictStr
-        aclass_base: ASSETCLASS
-        base: ASSET
-        aclass_quote: ASSETCLASS
-        quote: ASSET
-        lot: str
-        pair_decimals: COUNT
-        lot_decimals: COUNT
-        lot_multiplier: COUNT
-        leverage_buy: typing.Tuple[int, ...]
-        leverage_sell: typing.Tuple[int, ...]
-        fees: typing.Tuple[typing.Tuple[Decimal, Decimal], ...]
-        fees_maker: typing.Optional[typing.Tuple[typing.Tuple[Decimal, Decimal], ...]] # no maker fees if pair is darkpool
-        fee_volume_currency: str
-        margin_call: pydantic.PositiveInt
-        margin_stop: pydantic.PositiveInt
-        ordermin: typing.Optional[Decimal]
-
-    # we do not know the keys in advance, only the type of their value
-    kwargs = {**{k: (_AssetPair, ...) for k in keys}, "__base__": pydantic.BaseModel}
-
-    model = pydantic.create_model("_AssetPairsResponse", **kwargs)  # type: ignore
-
-    return model
+# we do not know the keys in advance, only the type of their value
+#   => fixed schema mapping pair names to their info, no model is created at runtime
+class _AssetPairsResponse(MappingModel):
+
+    __root__: typing.Mapping[PAIR, _AssetPair]
 
 
 class Response:
@@ -178,6 +166,8 @@ class Response:
     """
 
     def __call__(self, response: dict):
-        model = _generate_model(list(response.keys()))
-        # print("\nFields", model.__fields__, "\n")
-        return model(**response)
+        return _AssetPairsResponse(__root__=response)
+
+    def construct(self, response: dict):
+        "build the response model without validation (see `crypto_dom.validation.ValidationPolicy`)"
+        return construct_model(_AssetPairsResponse, {"__root__": response})
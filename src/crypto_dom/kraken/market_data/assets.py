@@ -2,11 +2,10 @@ import typing
 
 from typing_extensions import Literal
 import pydantic
-import stackprinter
-
-stackprinter.set_excepthook(style="darkbg2")
 
+from crypto_dom.definitions import MappingModel
 from crypto_dom.kraken.definitions import ASSET
+from crypto_dom.validation import construct_model
 
 
 # ============================================================
@@ -66,29 +65,19 @@ class Request(pydantic.BaseModel):
 # ------------------------------
 
 
-def _generate_model(keys: typing.List[str]) -> typing.Type[pydantic.BaseModel]:
-    """dynamically create the model. Returns a new pydantic model class
-
-    Args:
-    ----
-        key: List[str]
-            List of asset names that map to their info
-
-    """
-
-    class _Asset(pydantic.BaseModel):
+class _Asset(pydantic.BaseModel):
 
-        altname: str
-        aclass: str
-        decimals: int
-        display_decimals: int
+    altname: str
+    aclass: str
+    decimals: int
+    display_decimals: int
 
-    # we do not know the keys in advance, only the type of their value
-    kwargs = {**{k: (_Asset, ...) for k in keys}, "__base__": pydantic.BaseModel}
 
-    model = pydantic.create_model("_AssetsResponse", **kwargs)  # type: ignore
+# we do not know the keys in advance, only the type of their value
+#   => fixed schema mapping asset names to their info, no model is created at runtime
+class _AssetsResponse(MappingModel):
 
-    return model
+    __root__: typing.Mapping[ASSET, _Asset]
 
 
 class Response:
@@ -110,6 +99,8 @@ class Response:
     """
 
     def __call__(self, response: dict):
-        model = _generate_model(list(response.keys()))
-        # print("\nFields", model.__fields__, "\n")
-        return model(**response)
+        return _AssetsResponse(__root__=response)
+
+    def construct(self, response: dict):
+        "build the response model without validation (see `crypto_dom.validation.ValidationPolicy`)"
+        return construct_model(_AssetsResponse, {"__root__": response})
@@ -3,12 +3,15 @@ from datetime import date
 from decimal import Decimal
 
 import pydantic
-import stackprinter
-
-stackprinter.set_excepthook(style="darkbg2")
 
+from crypto_dom.columnar import (
+    require_numpy, validation_error, to_matrix, to_column, check_column, scale,
+    MIN_TIMESTAMP_S, MAX_TIMESTAMP_S
+)
 from crypto_dom.definitions import TIMESTAMP_S
 from crypto_dom.kraken.definitions import TIMEFRAME, PAIR
+from crypto_dom.kraken.market_data._model_cache import MODEL_CACHE
+from crypto_dom.validation import construct_model
 
 
 # ============================================================
@@ -125,6 +128,9 @@ def _generate_model(pair: str) -> typing.Type[pydantic.BaseModel]:
     return model
 
 
+MODEL_CACHE.register("ohlc", _generate_model)
+
+
 class Response:
     """Response model for endpoint https://api.kraken.com/0/public/OHLC"
 
@@ -153,10 +159,152 @@ class Response:
             raise ValueError("More than 1 pair in response keys")
         else:
             pair = pairs[0]
-        model = _generate_model(pair)
+        model = MODEL_CACHE.get("ohlc", pair)
         # print("\nFields", model.__fields__, "\n")
         return model(**response)
 
+    def construct(self, response: dict):
+        "build the response model without validation (see `crypto_dom.validation.ValidationPolicy`)"
+        pair = next(k for k in response.keys() if k not in ["last"])
+        model = MODEL_CACHE.get("ohlc", pair)
+        return construct_model(model, response)
+
+
+# ------------------------------
+# Columnar Response
+# ------------------------------
+
+
+class OhlcColumns(typing.NamedTuple):
+    """Decoded OHLC response
+
+    Fields:
+    -------
+        pair : str
+        last : int
+            id to be used as since when polling for new, committed OHLC data
+        candles : numpy structured array
+            fields: time (int64), open, high, low, close, vwap, volume (float64 or scaled int64), count (int64)
+    """
+
+    pair: str
+    last: int
+    candles: "np.ndarray"
+
+
+class _ColumnarOhlcResponse(pydantic.BaseModel):
+    "only names the model in validation errors"
+    pass
+
+
+# Entries(<time>, <open>, <high>, <low>, <close>, <vwap>, <volume>, <count>)
+_PRICE_COLUMNS = ("open", "high", "low", "close", "vwap")
+
+
+class ColumnarResponse:
+    """Columnar decoder for endpoint https://api.kraken.com/0/public/OHLC"
+
+    Alternative to `Response`: candles are decoded into a single numpy structured array
+    instead of one tuple of Decimals per candle. Requires numpy.
+
+    Args:
+    -----
+        price_decimals : int
+            Return prices as int64 scaled by 10**price_decimals (optional)
+            default = float64
+        volume_decimals : int
+            Return volumes as int64 scaled by 10**volume_decimals (optional)
+            default = float64
+
+    Returns:
+    --------
+        OhlcColumns(pair, last, candles)
+
+    Checks:
+    -------
+        - every candle has 8 entries
+        - prices, volumes and count are numeric and not negative
+        - time and last are timestamps in seconds within [2009, 2050]
+
+    Usage:
+    ------
+        model = ColumnarResponse()
+        columns = model(JSON_response_content)
+        columns.candles["close"]
+    """
+
+    def __init__(self, price_decimals: typing.Optional[int] = None, volume_decimals: typing.Optional[int] = None):
+        np = require_numpy()
+
+        self.price_decimals = price_decimals
+        self.volume_decimals = volume_decimals
+
+        price = np.float64 if price_decimals is None else np.int64
+        volume = np.float64 if volume_decimals is None else np.int64
+        self.dtype = np.dtype([
+            ("time", np.int64),
+            *((name, price) for name in _PRICE_COLUMNS),
+            ("volume", volume),
+            ("count", np.int64),
+        ])
+
+    def __call__(self, response: dict) -> OhlcColumns:
+
+        pairs = list({k: v for k, v in response.items() if k not in ["last"]}.keys())
+        if len(pairs) > 1:
+            raise ValueError("More than 1 pair in response keys")
+        else:
+            pair = pairs[0]
+
+        last = self._check_last(response.get("last"))
+
+        np = require_numpy()
+        model = _ColumnarOhlcResponse
+        loc = (pair,)
+        matrix = to_matrix(response[pair], 8, model=model, loc=loc)
+
+        time = to_column(matrix, 0, np.int64, model=model, loc=loc)
+        check_column(
+            time, (time < MIN_TIMESTAMP_S) | (time >= MAX_TIMESTAMP_S),
+            "Timestamp {value} not within [2009, 2050]",
+            index=0, model=model, loc=loc
+        )
+
+        candles = np.empty(len(time), dtype=self.dtype)
+        candles["time"] = time
+
+        for index, name in enumerate((*_PRICE_COLUMNS, "volume"), start=1):
+            values = to_column(matrix, index, np.float64, model=model, loc=loc)
+            check_column(values, ~(values >= 0), "value {value} is negative or not a number", index=index, model=model, loc=loc)
+            decimals = self.volume_decimals if name == "volume" else self.price_decimals
+            candles[name] = scale(values, decimals)
+
+        count = to_column(matrix, 7, np.int64, model=model, loc=loc)
+        check_column(count, count < 0, "count {value} is negative", index=7, model=model, loc=loc)
+        candles["count"] = count
+
+        return OhlcColumns(pair=pair, last=last, candles=candles)
+
+    @staticmethod
+    def _check_last(value: typing.Any) -> int:
+        "same checks as the `last` field of the response model"
+
+        try:
+            last = int(value)
+        except (TypeError, ValueError):
+            raise validation_error(_ColumnarOhlcResponse, [(("last",), TypeError("value is not a valid integer"))])
+
+        if not MIN_TIMESTAMP_S <= last < MAX_TIMESTAMP_S:
+            try:
+                y = date.fromtimestamp(last).year
+            except (OverflowError, OSError, ValueError):
+                # negative, or beyond the dates of the platform
+                y = None
+            err_msg = f"Year {y} for timestamp {last} not within [2009, 2050]"
+            raise validation_error(_ColumnarOhlcResponse, [(("last",), ValueError(err_msg))])
+
+        return last
+
 
 # ------------------------------
 # Test with Sample Response
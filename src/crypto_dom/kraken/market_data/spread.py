@@ -4,12 +4,11 @@ from decimal import Decimal
 
 from typing_extensions import Literal
 import pydantic
-import stackprinter
-
-stackprinter.set_excepthook(style="darkbg2")
 
 from crypto_dom.definitions import TIMESTAMP_S
 from crypto_dom.kraken.definitions import PAIR
+from crypto_dom.kraken.market_data._model_cache import MODEL_CACHE
+from crypto_dom.validation import construct_model
 
 
 # ============================================================
@@ -103,6 +102,9 @@ def _generate_model(pair: str) -> typing.Type[pydantic.BaseModel]:
     return model
 
 
+MODEL_CACHE.register("spread", _generate_model)
+
+
 class Response:
     """Response Model for endpoint https://api.kraken.com/0/public/Spread
 
@@ -131,10 +133,16 @@ class Response:
             raise ValueError("More than 1 pair in response keys")
         else:
             pair = pairs[0]
-        model = _generate_model(pair)
+        model = MODEL_CACHE.get("spread", pair)
         # print("\nFields", model.__fields__, "\n")
         return model(**response)
 
+    def construct(self, response: dict):
+        "build the response model without validation (see `crypto_dom.validation.ValidationPolicy`)"
+        pair = next(k for k in response.keys() if k not in ["last"])
+        model = MODEL_CACHE.get("spread", pair)
+        return construct_model(model, response)
+
 
 # ------------------------------
 # Test with Sample Response
@@ -2,11 +2,10 @@ import typing
 from decimal import Decimal
 
 import pydantic
-import stackprinter
-
-stackprinter.set_excepthook(style="darkbg2")
 
+from crypto_dom.definitions import MappingModel
 from crypto_dom.kraken.definitions import PAIR
+from crypto_dom.validation import construct_model
 
 
 # ============================================================
@@ -45,34 +44,24 @@ class Request(pydantic.BaseModel):
 # ------------------------------
 
 
-def _generate_model(keys: typing.List[str]) -> typing.Type[pydantic.BaseModel]:
-    """dynamically create the model. Returns a new pydantic model class.
-
-    Args:
-    ----
-        key: List[str]
-            List of assetpair names that map to their ticker info
-
-    """
-
-    class _Ticker(pydantic.BaseModel):
+class _Ticker(pydantic.BaseModel):
 
-        a: typing.Tuple[Decimal, Decimal, Decimal]
-        b: typing.Tuple[Decimal, Decimal, Decimal]
-        c: typing.Tuple[Decimal, Decimal]
-        v: typing.Tuple[Decimal, Decimal]
-        p: typing.Tuple[Decimal, Decimal]
-        t: typing.Tuple[Decimal, Decimal]
-        l: typing.Tuple[Decimal, Decimal]
-        h: typing.Tuple[Decimal, Decimal]
-        o: Decimal
+    a: typing.Tuple[Decimal, Decimal, Decimal]
+    b: typing.Tuple[Decimal, Decimal, Decimal]
+    c: typing.Tuple[Decimal, Decimal]
+    v: typing.Tuple[Decimal, Decimal]
+    p: typing.Tuple[Decimal, Decimal]
+    t: typing.Tuple[Decimal, Decimal]
+    l: typing.Tuple[Decimal, Decimal]
+    h: typing.Tuple[Decimal, Decimal]
+    o: Decimal
 
-    # we do not know the keys in advance, only the type of their value
-    kwargs = {**{k: (_Ticker, ...) for k in keys}, "__base__": pydantic.BaseModel}
 
-    model = pydantic.create_model("_TickerResponse", **kwargs)  # type: ignore
+# we do not know the keys in advance, only the type of their value
+#   => fixed schema mapping pair names to their ticker info, no model is created at runtime
+class _TickerResponse(MappingModel):
 
-    return model
+    __root__: typing.Mapping[PAIR, _Ticker]
 
 
 class Response:
@@ -99,6 +88,8 @@ class Response:
     """
 
     def __call__(self, response: dict):
-        model = _generate_model(list(response.keys()))
-        # print("\nFields", model.__fields__, "\n")
-        return model(**response)
+        return _TickerResponse(__root__=response)
+
+    def construct(self, response: dict):
+        "build the response model without validation (see `crypto_dom.validation.ValidationPolicy`)"
+        return construct_model(_TickerResponse, {"__root__": response})
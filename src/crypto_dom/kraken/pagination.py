@@ -0,0 +1,200 @@
+import asyncio
+import collections
+import typing
+
+from crypto_dom.result import Result, Ok
+from crypto_dom.validation import MODE, ValidationPolicy
+from crypto_dom.kraken._response import KrakenFullResponse
+from crypto_dom.kraken.key_pool import KeyPool
+from crypto_dom.kraken.user_data import closed_orders, ledgers, trades_history
+
+
+# ============================================================
+# PAGINATION
+# ============================================================
+
+
+# ClosedOrders, Ledgers and TradesHistory return 50 records per call, from offset `ofs`,
+# newest first, with the `count` of records matching the request.
+#
+# The first page gives the page size and the count, the following offsets are then known:
+# up to `prefetch` pages are requested ahead while the current one is consumed, as long as
+# the call counters of the pool have room for them (the next page is always requested).
+# Unless the keys have a nonce window, calls of a key must reach Kraken in nonce order:
+# pages in flight are then also limited to one per active key.
+# Pages are yielded in order, at most `prefetch + 1` of them are held in memory.
+#
+# Records added while paging shift older ones to the next page: they are yielded once
+# (ids of the last pages are kept), and the higher `count` extends the pages to fetch.
+
+
+# endpoint url : (module, records field)
+ENDPOINTS = {
+    closed_orders.URL: (closed_orders, "closed"),
+    ledgers.URL: (ledgers, "ledger"),
+    trades_history.URL: (trades_history, "trades"),
+}
+
+
+class Paginator:
+    """Async iterator over the pages of a Kraken history endpoint
+
+    Args:
+    -----
+        pool : crypto_dom.kraken.key_pool.KeyPool
+            Signs the calls, and schedules them within the call counters of its keys
+        client :
+            Typed client (see `crypto_dom.client.HttypeClient`)
+        url : str
+            One of ENDPOINTS (ClosedOrders, Ledgers, TradesHistory)
+        data : dict
+            Payload, without nonce and ofs (optional)
+        prefetch : int
+            Pages requested ahead of the one being consumed (default = 2)
+            at most one page per active key is in flight, unless the pool has `nonce_window` set
+        validation : str enum or ValidationPolicy
+            [strict, sampled, trusted] (optional)
+            default = strict
+
+    Counters:
+    ---------
+        pages : int
+        records : int
+            Records yielded
+        duplicates : int
+            Records already yielded with a previous page, skipped
+        max_in_flight : int
+            Most pages requested at the same time
+
+    Usage:
+    ------
+        pool = KeyPool([(key, secret)], limiter=RateLimiter("intermediate"))
+        async with HttypeClient.httpx() as client:
+            async for page in Paginator(pool, client, ledgers.URL, {"asset": "XXBT"}):
+                if page.is_err():
+                    ...
+                for ledger_id, ledger in page.value.items():
+                    ...
+
+    Note:
+    -----
+        Each page is a Result: Ok of the mapping of ids to validated records,
+        or the Err of the failed call, which ends the iteration.
+
+        With a single key without nonce window, pages are not prefetched.
+    """
+
+    def __init__(
+            self,
+            pool: KeyPool,
+            client: typing.Any,
+            url: str,
+            data: typing.Optional[dict] = None,
+            prefetch: int = 2,
+            validation: typing.Union[MODE, ValidationPolicy] = "strict",
+        ):
+        if url not in ENDPOINTS:
+            raise ValueError(f"Invalid url {url} - must be one of {tuple(ENDPOINTS)}")
+        if prefetch < 0:
+            raise ValueError(f"prefetch must be a positive integer - Given: {prefetch}")
+
+        self.pool = pool
+        self.client = client
+        self.url = url
+        self.data = {k: v for k, v in (data or {}).items() if k not in ("nonce", "ofs")}
+        self.prefetch = prefetch
+
+        self._module, self._field = ENDPOINTS[url]
+        self._t_out = KrakenFullResponse(self._module.Response(), validation)
+
+        # ids of the last pages, records shift by less than a page
+        self._seen: typing.Deque[typing.Set[str]] = collections.deque(maxlen=prefetch + 2)
+
+        self.pages = 0
+        self.records = 0
+        self.duplicates = 0
+        self.max_in_flight = 0
+
+    async def _page(self, ofs: int) -> Result:
+        "Ok(validated response) or Err"
+
+        r = await self.pool.safe_request(
+            self.client, self._module.METHOD, self.url,
+            t_in=self._module.Request, t_out=self._t_out, data={**self.data, "ofs": ofs}
+        )
+        if r.is_err():
+            return r
+        return r.value.safe_content
+
+    def _new_records(self, response: typing.Any) -> typing.Dict[str, typing.Any]:
+        "records of the page not yielded with a previous one"
+
+        records = {}
+        for record_id, record in getattr(response, self._field).items():
+            if any(record_id in ids for ids in self._seen):
+                self.duplicates += 1
+            else:
+                records[record_id] = record
+        self._seen.append(set(records))
+
+        self.pages += 1
+        self.records += len(records)
+        return records
+
+    async def __aiter__(self) -> typing.AsyncIterator[Result]:
+
+        first = await self._page(0)
+        self.max_in_flight = max(self.max_in_flight, 1)
+        if first.is_err():
+            yield first
+            return
+
+        count = first.value.count
+        page_size = len(getattr(first.value, self._field))
+        yield Ok(self._new_records(first.value))
+        if not page_size:
+            return
+
+        next_ofs = page_size
+        in_flight: typing.Deque[asyncio.Future] = collections.deque()
+        try:
+            while True:
+                while next_ofs < count and (
+                    not in_flight
+                    or (len(in_flight) < self._max_in_flight() and self.pool.can_send(self.url))
+                ):
+                    in_flight.append(asyncio.ensure_future(self._page(next_ofs)))
+                    next_ofs += page_size
+                    # let the call take its share of the counters before checking them again
+                    await asyncio.sleep(0)
+                self.max_in_flight = max(self.max_in_flight, len(in_flight))
+
+                if not in_flight:
+                    return
+
+                result = await in_flight.popleft()
+                if result.is_err():
+                    yield result
+                    return
+
+                # records added since the first page
+                count = max(count, result.value.count)
+                yield Ok(self._new_records(result.value))
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+    def _max_in_flight(self) -> int:
+        "pages requested at the same time"
+
+        if self.pool.nonce_window:
+            return self.prefetch + 1
+        return min(self.prefetch + 1, len(self.pool.active_keys))
+
+    def stats(self) -> typing.Dict[str, int]:
+        return {
+            "pages": self.pages,
+            "records": self.records,
+            "duplicates": self.duplicates,
+            "max_in_flight": self.max_in_flight,
+        }
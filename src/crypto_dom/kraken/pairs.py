@@ -0,0 +1,207 @@
+import json
+import os
+import threading
+import typing
+from decimal import Decimal, ROUND_CEILING, ROUND_FLOOR, ROUND_HALF_EVEN
+
+from typing_extensions import Literal
+
+from crypto_dom.path import APP_PATH
+
+
+# ============================================================
+# PAIR INDEX
+# ============================================================
+
+
+# Pair metadata (decimals, minimum order, names) is otherwise only available
+# as a validated AssetPairs response. The index is built once, from the json data written
+# by `crypto-dom-update` or from a live AssetPairs response, and gives:
+#   - O(1) lookup by pair name, altname or wsname
+#   - pairs by base and quote asset
+#   - price and volume quantizers, to round orders before sending them
+#     (Kraken rejects prices with too many decimals with `EOrder:Invalid price`)
+
+
+DATA_ASSETPAIRS = os.path.join(APP_PATH, "kraken", "_data_assetpairs.json")
+
+
+ROUNDING = Literal["down", "up", "nearest"]
+
+_ROUNDING = {"down": ROUND_FLOOR, "up": ROUND_CEILING, "nearest": ROUND_HALF_EVEN}
+
+
+class PairInfo:
+    """Metadata of a Kraken pair, with precomputed quantizers
+
+    Attributes:
+    -----------
+        pair : str
+        altname : str
+        wsname : str
+            None for darkpools
+        base : str
+        quote : str
+        pair_decimals : int
+        lot_decimals : int
+        ordermin : Decimal
+            None if not given by the exchange
+    """
+
+    __slots__ = (
+        "pair", "altname", "wsname", "base", "quote", "pair_decimals", "lot_decimals", "ordermin",
+        "price_quantum", "volume_quantum",
+    )
+
+    def __init__(
+            self,
+            pair: str,
+            altname: str,
+            wsname: typing.Optional[str],
+            base: str,
+            quote: str,
+            pair_decimals: int,
+            lot_decimals: int,
+            ordermin: typing.Any = None,
+        ):
+        self.pair = pair
+        self.altname = altname
+        self.wsname = wsname
+        self.base = base
+        self.quote = quote
+        self.pair_decimals = int(pair_decimals)
+        self.lot_decimals = int(lot_decimals)
+        self.ordermin = Decimal(ordermin) if ordermin is not None else None
+
+        self.price_quantum = Decimal(1).scaleb(-self.pair_decimals)
+        self.volume_quantum = Decimal(1).scaleb(-self.lot_decimals)
+
+    @classmethod
+    def from_info(cls, pair: str, info: typing.Any) -> "PairInfo":
+        "from the info of a pair, as a dict (json content) or validated `_AssetPair` model"
+
+        get = info.get if hasattr(info, "get") else lambda k: getattr(info, k, None)
+        return cls(
+            pair, get("altname"), get("wsname"), get("base"), get("quote"),
+            get("pair_decimals"), get("lot_decimals"), get("ordermin"),
+        )
+
+    def quantize_price(self, price: typing.Any, rounding: ROUNDING = "nearest") -> Decimal:
+        "round `price` to `pair_decimals`"
+        return Decimal(price).quantize(self.price_quantum, rounding=_ROUNDING[rounding])
+
+    def quantize_volume(self, volume: typing.Any) -> Decimal:
+        "round `volume` down to `lot_decimals`"
+        return Decimal(volume).quantize(self.volume_quantum, rounding=ROUND_FLOOR)
+
+    def quantize(self, price: typing.Any, volume: typing.Any, rounding: ROUNDING = "nearest") -> typing.Tuple[Decimal, Decimal]:
+        return self.quantize_price(price, rounding), self.quantize_volume(volume)
+
+    def errors(self, price: typing.Any = None, volume: typing.Any = None) -> typing.List[str]:
+        "reasons the exchange would reject an order with `price` and `volume`"
+
+        errors = []
+        if price is not None and Decimal(price) != self.quantize_price(price):
+            errors.append(f"price {price} has more than {self.pair_decimals} decimals")
+        if volume is not None:
+            if Decimal(volume) != self.quantize_volume(volume):
+                errors.append(f"volume {volume} has more than {self.lot_decimals} decimals")
+            # 0 volume auto-fills the volume needed to close a leveraged position
+            if self.ordermin is not None and 0 < Decimal(volume) < self.ordermin:
+                errors.append(f"volume {volume} is below minimum {self.ordermin}")
+        return errors
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}:{self.pair}>"
+
+
+class PairIndex:
+    """Index of Kraken pairs by pair name, altname and wsname
+
+    Usage:
+    ------
+        index = PairIndex.from_json()
+        index["XBT/USD"].pair_decimals
+        index.pairs_for(base="XXBT")
+        price, volume = index.quantize("XXBTZUSD", "43210.123", "0.123456789")
+    """
+
+    def __init__(self, pairs: typing.Iterable[PairInfo] = ()):
+        self.pairs: typing.Dict[str, PairInfo] = {}
+        self._names: typing.Dict[str, PairInfo] = {}
+        self._by_base: typing.Dict[str, typing.List[PairInfo]] = {}
+        self._by_quote: typing.Dict[str, typing.List[PairInfo]] = {}
+
+        for info in pairs:
+            self.add(info)
+
+    def add(self, info: PairInfo) -> None:
+        self.pairs[info.pair] = info
+        for name in (info.altname, info.wsname):
+            if name is not None:
+                self._names.setdefault(name, info)
+        # pair names take precedence over alternate names
+        self._names[info.pair] = info
+        self._by_base.setdefault(info.base, []).append(info)
+        self._by_quote.setdefault(info.quote, []).append(info)
+
+    @classmethod
+    def from_response(cls, response: typing.Any) -> "PairIndex":
+        "from an AssetPairs response (json `result` content or validated model)"
+
+        if hasattr(response, "__root__"):
+            response = response.__root__
+        return cls(PairInfo.from_info(pair, info) for pair, info in response.items())
+
+    @classmethod
+    def from_json(cls, filename: str = DATA_ASSETPAIRS) -> "PairIndex":
+        "from the json data written by `crypto-dom-update`"
+
+        with open(filename) as file:
+            return cls.from_response(json.load(file))
+
+    # ---- lookups
+
+    def __getitem__(self, name: str) -> PairInfo:
+        return self._names[name]
+
+    def get(self, name: str, default: typing.Any = None) -> typing.Optional[PairInfo]:
+        return self._names.get(name, default)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._names
+
+    def __iter__(self) -> typing.Iterator[str]:
+        return iter(self.pairs)
+
+    def __len__(self) -> int:
+        return len(self.pairs)
+
+    def pairs_for(self, base: typing.Optional[str] = None, quote: typing.Optional[str] = None) -> typing.List[PairInfo]:
+        "pairs with the given base and/or quote asset"
+
+        if base is None and quote is None:
+            return list(self.pairs.values())
+        if quote is None:
+            return list(self._by_base.get(base, ()))
+        if base is None:
+            return list(self._by_quote.get(quote, ()))
+        return [info for info in self._by_base.get(base, ()) if info.quote == quote]
+
+    def quantize(self, name: str, price: typing.Any, volume: typing.Any, rounding: ROUNDING = "nearest") -> typing.Tuple[Decimal, Decimal]:
+        return self._names[name].quantize(price, volume, rounding)
+
+
+_INDEX: typing.Optional[PairIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_index() -> PairIndex:
+    "index built from the json data, loaded once per process"
+
+    global _INDEX
+
+    with _INDEX_LOCK:
+        if _INDEX is None:
+            _INDEX = PairIndex.from_json()
+        return _INDEX
@@ -0,0 +1,211 @@
+import asyncio
+import time
+import typing
+from urllib.parse import urlsplit
+
+from typing_extensions import Literal
+
+
+# ============================================================
+# RATE LIMITER
+# ============================================================
+
+
+# doc: https://support.kraken.com/hc/en-us/articles/206548367-What-are-the-API-rate-limits-
+#
+# Each API key has a call counter, increased by every private call and decreased over time
+# at a rate depending on the verification tier. Going over the maximum returns
+# `EAPI:Rate limit exceeded` (see `kraken.errors`).
+#
+# The limiter keeps a counter per API key, and delays private calls that would overflow it.
+# Order placing and cancelling are limited by the matching engine instead, they cost nothing here.
+
+
+TIER = Literal["starter", "intermediate", "pro"]
+
+# maximum counter, decay per second
+TIERS = {
+    "starter": (15, 0.33),
+    "intermediate": (20, 0.5),
+    "pro": (20, 1.0),
+}
+
+# counter increase per endpoint (last segment of the path), other private endpoints cost 1
+COSTS = {
+    "Ledgers": 2,
+    "QueryLedgers": 2,
+    "TradesHistory": 2,
+    "QueryTrades": 2,
+    "AddOrder": 0,
+    "CancelOrder": 0,
+    "CancelAll": 0,
+    "CancelAllOrdersAfter": 0,
+}
+
+_PRIVATE_PATH = "/0/private/"
+
+
+class CallCounter:
+    """Call counter of an API key, decaying continuously
+
+    Counters:
+    ---------
+        requests : int
+        delayed : int
+            Calls that had to wait for the counter to decay
+        wait_time : float
+            Seconds spent waiting
+    """
+
+    __slots__ = ("max_counter", "decay", "counter", "updated", "requests", "delayed", "wait_time", "lock")
+
+    def __init__(self, max_counter: float, decay: float, now: float):
+        self.max_counter = max_counter
+        self.decay = decay
+        self.counter = 0.0
+        self.updated = now
+
+        self.requests = 0
+        self.delayed = 0
+        self.wait_time = 0.0
+        self.lock: typing.Optional[asyncio.Lock] = None
+
+    def value(self, now: float) -> float:
+        "current value of the counter"
+        self.counter = max(self.counter - (now - self.updated) * self.decay, 0.0)
+        self.updated = now
+        return self.counter
+
+    def wait_time_for(self, cost: float, now: float) -> float:
+        "seconds until `cost` can be added without going over the maximum"
+        return max(self.value(now) + cost - self.max_counter, 0.0) / self.decay
+
+    def as_dict(self, now: float) -> typing.Dict[str, typing.Union[int, float]]:
+        return {
+            "counter": self.value(now),
+            "max_counter": self.max_counter,
+            "requests": self.requests,
+            "delayed": self.delayed,
+            "wait_time": self.wait_time,
+        }
+
+
+class RateLimiter:
+    """Client side scheduler for Kraken private calls, one counter per API key
+
+    Args:
+    -----
+        tier : str enum
+            [starter, intermediate, pro] (optional)
+            default = starter
+        max_counter : float
+            Overrides the maximum counter of the tier (optional)
+        decay : float
+            Overrides the decay per second of the tier (optional)
+        costs : Mapping[str, float]
+            Counter increase per endpoint name (optional)
+            default = COSTS
+        clock : Callable[[], float]
+            default = time.monotonic
+
+    Usage:
+    ------
+        limiter = RateLimiter("intermediate")
+        async with HttypeClient.httpx(rate_limiter=limiter) as client:
+            ...
+        limiter.counter(api_key)
+
+    Note:
+    -----
+        The API key is read from the `API-Key` header, public calls are not limited.
+        The limiter does not know about calls sent by other processes with the same key.
+    """
+
+    def __init__(
+            self,
+            tier: TIER = "starter",
+            max_counter: typing.Optional[float] = None,
+            decay: typing.Optional[float] = None,
+            costs: typing.Optional[typing.Mapping[str, float]] = None,
+            clock: typing.Callable[[], float] = time.monotonic,
+        ):
+        if tier not in TIER.__args__:
+            raise ValueError(f"Invalid tier {tier} - must be one of {TIER.__args__}")
+
+        tier_max, tier_decay = TIERS[tier]
+        self.tier = tier
+        self.max_counter = max_counter if max_counter is not None else tier_max
+        self.decay = decay if decay is not None else tier_decay
+        if self.max_counter <= 0 or self.decay <= 0:
+            raise ValueError(f"max_counter and decay must be positive - Given: {self.max_counter}, {self.decay}")
+
+        self.costs = dict(COSTS if costs is None else costs)
+        self.clock = clock
+        self._counters: typing.Dict[str, CallCounter] = {}
+
+    def cost(self, url: typing.Any) -> float:
+        "counter increase of a call, 0 for public endpoints"
+
+        path = urlsplit(str(url)).path
+        if not path.startswith(_PRIVATE_PATH):
+            return 0
+        return self.costs.get(path.rsplit("/", 1)[-1], 1)
+
+    def _counter(self, key: str) -> CallCounter:
+        try:
+            return self._counters[key]
+        except KeyError:
+            counter = self._counters[key] = CallCounter(self.max_counter, self.decay, self.clock())
+            return counter
+
+    async def acquire(
+            self,
+            method: str,
+            url: typing.Any,
+            params: typing.Optional[typing.Mapping] = None,
+            headers: typing.Optional[typing.Mapping] = None,
+        ) -> float:
+        "wait until the call can be sent without overflowing the counter of its key, returns the seconds waited"
+
+        key = (headers or {}).get("API-Key")
+        cost = self.cost(url)
+        if key is None or not cost:
+            return 0.0
+        if cost > self.max_counter:
+            raise ValueError(f"Call cost {cost} is over the maximum counter {self.max_counter}")
+
+        counter = self._counter(key)
+        if counter.lock is None:
+            counter.lock = asyncio.Lock()
+
+        waited = 0.0
+        # FIFO per key
+        async with counter.lock:
+            while True:
+                wait = counter.wait_time_for(cost, self.clock())
+                if wait <= 0:
+                    break
+                waited += wait
+                await asyncio.sleep(wait)
+            counter.counter += cost
+
+        counter.requests += 1
+        if waited:
+            counter.delayed += 1
+            counter.wait_time += waited
+        return waited
+
+    def update(self, usage: typing.Mapping) -> None:
+        "Kraken does not report the call counter in its responses, nothing to sync"
+
+    def counter(self, key: str) -> float:
+        "current counter of an API key"
+        return self._counter(key).value(self.clock())
+
+    def stats(self) -> typing.Dict[str, typing.Dict[str, typing.Union[int, float]]]:
+        "per key stats, keys are truncated"
+        now = self.clock()
+        return {f"{key[:8]}...": counter.as_dict(now) for key, counter in self._counters.items()}
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}:{self.tier} {self.max_counter} -{self.decay}/s>"
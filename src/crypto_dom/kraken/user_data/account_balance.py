@@ -4,9 +4,6 @@ from decimal import Decimal
 
 from typing_extensions import Literal
 import pydantic
-import stackprinter
-
-stackprinter.set_excepthook(style="darkbg2")
 
 
 # ============================================================
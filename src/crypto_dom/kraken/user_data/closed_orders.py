@@ -2,9 +2,6 @@ import typing
 from decimal import Decimal
 
 import pydantic
-import stackprinter
-
-stackprinter.set_excepthook(style="darkbg2")
 
 from crypto_dom.definitions import (
     TIMESTAMP_S,
@@ -17,6 +14,7 @@ from crypto_dom.kraken.definitions import (
     ORDERSTATUS,
     ORDERID,
 )
+from crypto_dom.validation import construct_model
 
 
 # ============================================================
@@ -226,6 +224,10 @@ class Response:
     def __call__(self, response: dict):
         return _ClosedOrdersResponse(**response)
 
+    def construct(self, response: dict):
+        "build the response model without validation (see `crypto_dom.validation.ValidationPolicy`)"
+        return construct_model(_ClosedOrdersResponse, response)
+
 
 # ------------------------------
 # Test with Sample Response
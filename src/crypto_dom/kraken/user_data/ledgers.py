@@ -3,12 +3,10 @@ from decimal import Decimal
 
 from typing_extensions import Literal
 import pydantic
-import stackprinter
 
-stackprinter.set_excepthook(style="darkbg2")
-
-from crypto_dom.definitions import TIMESTAMP_S
-from crypto_dom.kraken.definitions import ORDERID
+from crypto_dom.definitions import TIMESTAMP_S, COUNT
+from crypto_dom.kraken.definitions import LEDGERID
+from crypto_dom.validation import construct_model
 
 
 # ============================================================
@@ -18,7 +16,7 @@ from crypto_dom.kraken.definitions import ORDERID
 
 # doc: https://www.kraken.com/features/api#get-ledgers-info
 
-URL = "https://api.kraken.com/0/public/Ledgers"
+URL = "https://api.kraken.com/0/private/Ledgers"
 METHOD = "POST"
 
 
@@ -36,6 +34,8 @@ METHOD = "POST"
 #                                                 amount: "-0.2805800000",
 #                                                    fee: "0.0050000000",
 #                                                balance: "0.0000051000"
+#                                             }},
+#            count: 1 }}
 
 
 # ------------------------------
@@ -44,7 +44,7 @@ METHOD = "POST"
 
 
 class Request(pydantic.BaseModel):
-    """Request Model for endpoint https://api.kraken.com/0/public/Ledgers
+    """Request Model for endpoint https://api.kraken.com/0/private/Ledgers
 
     Fields:
     -------
@@ -81,37 +81,36 @@ class Request(pydantic.BaseModel):
 # ------------------------------
 
 
-def generate_model(keys: typing.List[ORDERID]) -> typing.Type[pydantic.BaseModel]:
-    "dynamically create the model"
-
-    class _Ledger(pydantic.BaseModel):
+class _Ledger(pydantic.BaseModel):
 
-        refid: typing.Optional[str]
-        time: TIMESTAMP_S
-        type: str
-        aclass: str
-        asset: str
-        amount: Decimal
-        fee: Decimal
-        balance: Decimal
+    refid: typing.Optional[str]
+    time: TIMESTAMP_S
+    type: str
+    aclass: str
+    asset: str
+    amount: Decimal
+    fee: Decimal
+    balance: Decimal
 
-    # we do not know the keys in advance, only the type of their value
-    kwargs = {**{k: (_Ledger, ...) for k in keys}, "__base__": pydantic.BaseModel}
 
-    model = pydantic.create_model("_LedgersResponse", **kwargs)  # type: ignore
+class _LedgersResponse(pydantic.BaseModel):
 
-    return model
+    ledger: typing.Mapping[LEDGERID, _Ledger]
+    count: COUNT
 
 
-class Response(pydantic.BaseModel):
-    """Response Model for endpoint https://api.kraken.com/0/public/Ledgers
+#  this class is just to be consistent with our API
+class Response:
+    """Response Model for endpoint https://api.kraken.com/0/private/Ledgers
 
     Model Fields:
     -------------
-        `Ledger id` : leger info
+        ledger : dict
             mapping of ledger id to their info
                 ledger id : str
                 ledger info : dict
+        count : int
+            Amount of ledger entries matching criteria
 
     Note:
     -----
@@ -135,6 +134,8 @@ class Response(pydantic.BaseModel):
     """
 
     def __call__(self, response: dict):
-        model = generate_model(list(response.keys()))
-        # print("\nFields", model.__fields__, "\n")
-        return model(**response)
+        return _LedgersResponse(**response)
+
+    def construct(self, response: dict):
+        "build the response model without validation (see `crypto_dom.validation.ValidationPolicy`)"
+        return construct_model(_LedgersResponse, response)
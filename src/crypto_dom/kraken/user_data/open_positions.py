@@ -3,9 +3,6 @@ from decimal import Decimal
 
 from typing_extensions import Literal
 import pydantic
-import stackprinter
-
-stackprinter.set_excepthook(style="darkbg2")
 
 from crypto_dom.definitions import TIMESTAMP_S
 from crypto_dom.kraken.definitions import ORDERID, ORDERTYPE, ORDERSIDE, FLAGS
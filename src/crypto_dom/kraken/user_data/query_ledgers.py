@@ -2,9 +2,6 @@ import typing
 from decimal import Decimal
 
 import pydantic
-import stackprinter
-
-stackprinter.set_excepthook(style="darkbg2")  # type: ignore
 
 from crypto_dom.definitions import TIMESTAMP_S
 from crypto_dom.kraken.definitions import LEDGERID, ASSET
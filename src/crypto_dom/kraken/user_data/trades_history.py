@@ -3,9 +3,6 @@ from decimal import Decimal
 
 from typing_extensions import Literal
 import pydantic
-import stackprinter
-
-stackprinter.set_excepthook(style="darkbg2")
 
 from crypto_dom.definitions import (
     TIMESTAMP_S,
@@ -17,6 +14,7 @@ from crypto_dom.kraken.definitions import (
     ORDERTYPE,
     ORDERSIDE,
 )
+from crypto_dom.validation import construct_model
 
 
 # ============================================================
@@ -134,7 +132,7 @@ class _TradesHistoryResponse(pydantic.BaseModel):
 
 
 #  this class is just to be consistent with our API
-class Response(pydantic.BaseModel):
+class Response:
     """Response Model for endpoint https://api.kraken.com/0/private/TradesHistory
 
     Model Fields:
@@ -192,3 +190,7 @@ class Response(pydantic.BaseModel):
 
     def __call__(self, response: dict):
         return _TradesHistoryResponse(**response)
+
+    def construct(self, response: dict):
+        "build the response model without validation (see `crypto_dom.validation.ValidationPolicy`)"
+        return construct_model(_TradesHistoryResponse, response)
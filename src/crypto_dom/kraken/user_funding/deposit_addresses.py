@@ -3,8 +3,6 @@ from decimal import Decimal
 from crypto_dom.definitions import TIMESTAMP_S
 
 import pydantic
-import stackprinter
-stackprinter.set_excepthook(style="darkbg2")
 
 from crypto_dom.kraken.definitions import ASSETCLASS, ASSET
 
@@ -1,8 +1,6 @@
 from decimal import Decimal
 
 import pydantic
-import stackprinter
-stackprinter.set_excepthook(style="darkbg2")
 
 from crypto_dom.kraken.definitions import ASSETCLASS, ASSET
 
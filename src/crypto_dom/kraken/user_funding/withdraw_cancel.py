@@ -1,8 +1,6 @@
 import typing
 
 import pydantic
-import stackprinter
-stackprinter.set_excepthook(style="darkbg2")
 
 from crypto_dom.kraken.definitions import ASSETCLASS, ASSET
 
@@ -2,12 +2,13 @@ import typing
 from decimal import Decimal
 
 import pydantic
-import stackprinter
-stackprinter.set_excepthook(style="darkbg2")
 
 from crypto_dom.definitions import TIMESTAMP_S
 from crypto_dom.kraken.definitions import ORDERTYPE, PAIR, ORDERSIDE, FLAGS, ORDERID, LEVERAGE
 
+if typing.TYPE_CHECKING:
+    from crypto_dom.kraken.pairs import PairIndex
+
 
 # ============================================================
 # ADD STANDARD ORDER 
@@ -31,6 +32,24 @@ METHOD = "POST"
 # ------------------------------
 
 
+# optional pre-trade check of pair decimals and minimum volume, disabled by default
+_PAIR_INDEX: typing.Optional["PairIndex"] = None
+_QUANTIZE = False
+
+
+def set_pair_index(index: typing.Optional["PairIndex"], quantize: bool = False) -> None:
+    """check requests against the pair metadata (see `crypto_dom.kraken.pairs`)
+
+    Request validation then fails if the price has more than `pair_decimals` decimals,
+    the volume more than `lot_decimals` or less than `ordermin`.
+    With `quantize`, prices are first rounded to the nearest tick and the volume rounded down.
+    Pairs unknown to the index are not checked. Pass None to disable.
+    """
+    global _PAIR_INDEX, _QUANTIZE
+    _PAIR_INDEX = index
+    _QUANTIZE = quantize
+
+
 class Request(pydantic.BaseModel):
     """Request model for endpoint POST https://api.kraken.com/0/private/AddOrder 
 
@@ -140,6 +159,29 @@ class Request(pydantic.BaseModel):
         return v
 
 
+    @pydantic.root_validator(skip_on_failure=True)
+    def _check_pair(cls, values):
+
+        if _PAIR_INDEX is None or values["pair"] not in _PAIR_INDEX:
+            return values
+
+        info = _PAIR_INDEX[values["pair"]]
+
+        if _QUANTIZE:
+            for key in ("price", "price2"):
+                if values.get(key) is not None:
+                    values[key] = info.quantize_price(values[key])
+            values["volume"] = info.quantize_volume(values["volume"])
+
+        errors = info.errors(values.get("price"), values["volume"])
+        if values.get("price2") is not None:
+            errors.extend(info.errors(values["price2"]))
+        if errors:
+            raise ValueError(f"{values['pair']} : " + "; ".join(errors))
+
+        return values
+
+
 # ------------------------------
 # Response Model
 # ------------------------------
@@ -0,0 +1,186 @@
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+import typing
+
+from typing_extensions import Literal
+
+
+# ============================================================
+# NONCE GENERATOR
+# ============================================================
+
+
+# Kraken rejects a signed request whose nonce is not higher than the last one of its API key
+# (`EAPI:Invalid nonce`). `int(time.time() * 1000)` gives the same nonce to requests built
+# in the same millisecond, and out of order nonces to processes sharing a key.
+#
+# The generator hands out, per key, max(last nonce + 1, current time):
+#   - in process : a dict of last nonces, behind a thread lock
+#   - shared     : one memory mapped 8 bytes counter per key in `directory`, updated under
+#                  an exclusive `fcntl.flock` held for a read and a write
+# The shared counters are files, so after a restart (or a clock going back)
+# nonces still start above the last one handed out.
+
+
+RESOLUTION = Literal["ms", "us", "ns"]
+
+# nanoseconds per unit
+_RESOLUTIONS = {"ms": 1_000_000, "us": 1_000, "ns": 1}
+
+_COUNTER = struct.Struct("<Q")
+
+
+class _SharedCounter:
+    "8 bytes counter in a memory mapped file, updated under an exclusive file lock"
+
+    __slots__ = ("fd", "map")
+
+    def __init__(self, path: str):
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(self.fd).st_size < _COUNTER.size:
+            os.ftruncate(self.fd, _COUNTER.size)
+        self.map = mmap.mmap(self.fd, _COUNTER.size)
+
+    def next(self, now: int) -> typing.Tuple[int, bool]:
+        "(nonce, whether it had to be bumped above the clock)"
+
+        import fcntl
+
+        fcntl.flock(self.fd, fcntl.LOCK_EX)
+        try:
+            last, = _COUNTER.unpack_from(self.map)
+            nonce = max(last + 1, now)
+            _COUNTER.pack_into(self.map, 0, nonce)
+        finally:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+        return nonce, nonce != now
+
+    def last(self) -> int:
+        return _COUNTER.unpack_from(self.map)[0]
+
+    def close(self) -> None:
+        self.map.close()
+        os.close(self.fd)
+
+
+class NonceGenerator:
+    """Strictly increasing nonces per API key
+
+    Args:
+    -----
+        resolution : str enum
+            [ms, us, ns] (optional)
+            default = ms
+        directory : str
+            Directory of the counters shared with other processes (optional)
+            default = None, nonces are only increasing within the process
+        clock : Callable[[], int]
+            Nanoseconds
+            default = time.time_ns
+
+    Counters:
+    ---------
+        issued : int
+        bumped : int
+            Nonces set above the clock, because the last one was not lower
+
+    Usage:
+    ------
+        nonces = NonceGenerator(directory="/var/run/crypto_dom/nonces")
+        data = {**payload, "nonce": nonces.next(api_key)}
+
+    Note:
+    -----
+        The exchange only checks that nonces increase: a key can move to a finer resolution,
+        not back to a coarser one, until the clock has caught up with the last nonce.
+        Shared counters need `fcntl` (not available on Windows).
+    """
+
+    def __init__(
+            self,
+            resolution: RESOLUTION = "ms",
+            directory: typing.Optional[str] = None,
+            clock: typing.Callable[[], int] = time.time_ns,
+        ):
+        if resolution not in RESOLUTION.__args__:
+            raise ValueError(f"Invalid resolution {resolution} - must be one of {RESOLUTION.__args__}")
+
+        self.resolution = resolution
+        self.directory = directory
+        self.clock = clock
+        self._unit = _RESOLUTIONS[resolution]
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+        self.issued = 0
+        self.bumped = 0
+
+        self._last: typing.Dict[str, int] = {}
+        self._shared: typing.Dict[str, _SharedCounter] = {}
+        self._lock = threading.Lock()
+
+    def path(self, key: str) -> str:
+        "file of the shared counter of `key`, the key itself is not written to disk"
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest()[:16] + ".nonce")
+
+    def now(self) -> int:
+        "current time in the resolution of the generator"
+        return self.clock() // self._unit
+
+    def next(self, key: str = "") -> int:
+        "next nonce of `key`"
+
+        now = self.now()
+        with self._lock:
+            if self.directory is None:
+                nonce = max(self._last.get(key, 0) + 1, now)
+                self._last[key] = nonce
+                bumped = nonce != now
+            else:
+                try:
+                    counter = self._shared[key]
+                except KeyError:
+                    counter = self._shared[key] = _SharedCounter(self.path(key))
+                nonce, bumped = counter.next(now)
+
+            self.issued += 1
+            self.bumped += bumped
+        return nonce
+
+    def last(self, key: str = "") -> int:
+        "last nonce handed out for `key`, by any process for shared counters, 0 if none"
+
+        with self._lock:
+            if self.directory is None:
+                return self._last.get(key, 0)
+            if key in self._shared:
+                return self._shared[key].last()
+            if not os.path.exists(self.path(key)):
+                return 0
+            counter = self._shared[key] = _SharedCounter(self.path(key))
+            return counter.last()
+
+    def close(self) -> None:
+        "unmap the shared counters, they are reopened on the next nonce"
+
+        with self._lock:
+            for counter in self._shared.values():
+                counter.close()
+            self._shared.clear()
+
+    def stats(self) -> typing.Dict[str, typing.Union[int, str]]:
+        return {
+            "resolution": self.resolution,
+            "shared": self.directory is not None,
+            "keys": len(self._shared if self.directory is not None else self._last),
+            "issued": self.issued,
+            "bumped": self.bumped,
+        }
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}:{self.resolution} {self.directory or 'in process'}>"
@@ -0,0 +1,313 @@
+import asyncio
+import threading
+import time
+import typing
+from urllib.parse import urlsplit
+
+import aiohttp
+import httpcore
+import httpx
+from typing_extensions import Literal
+
+from crypto_dom.client import HttypeClient
+
+
+# ============================================================
+# CONNECTION POOL MANAGER
+# ============================================================
+
+
+# Opening a new client per request (`async with HttypeClient.httpx() as client`)
+# pays for TCP and TLS setup on every call.
+# The pool manager keeps one long lived client per exchange host, with keep-alive connections
+# shared by every caller in the process, and can open them at startup with `prewarm`.
+
+
+BACKEND = Literal["httpx", "aiohttp"]
+
+
+# cheap public endpoints, used to open connections ahead of the first real request
+PREWARM_URLS = {
+    "api.kraken.com": "https://api.kraken.com/0/public/Time",
+    "api.binance.com": "https://api.binance.com/api/v3/ping",
+}
+
+
+class PoolStats:
+    """Connection usage of a host
+
+    Counters:
+    ---------
+        requests : int
+        connections : int
+            Connections opened
+        wait_time : float
+            Seconds spent waiting for a free connection (max connections reached)
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.connections = 0
+        self.wait_time = 0.0
+
+    @property
+    def reuse_ratio(self) -> float:
+        "share of requests sent on an already open connection"
+        if not self.requests:
+            return 0.0
+        return max(self.requests - self.connections, 0) / self.requests
+
+    def as_dict(self) -> typing.Dict[str, typing.Union[int, float]]:
+        return {
+            "requests": self.requests,
+            "connections": self.connections,
+            "reuse_ratio": self.reuse_ratio,
+            "wait_time": self.wait_time,
+            "mean_wait_time": self.wait_time / self.requests if self.requests else 0.0,
+        }
+
+
+#------------------------------------------------------------
+# Instrumentation
+#------------------------------------------------------------
+
+
+class _InstrumentedPool(httpcore.AsyncConnectionPool):
+    "httpcore pool counting opened connections"
+
+    stats: PoolStats
+
+    def _create_connection(self, origin):
+        self.stats.connections += 1
+        return super()._create_connection(origin)
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    "response stream releasing its connection slot once closed"
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: typing.Callable[[], None]):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+class _InstrumentedTransport(httpx.AsyncHTTPTransport):
+    """httpx transport limiting concurrent requests to `max_connections`
+
+    Note:
+    -----
+        The limit is not left to the httpcore pool: httpcore 0.13 deadlocks
+        when concurrent requests wait for a free connection
+    """
+
+    def __init__(self, stats: PoolStats, max_connections: int, **kwargs):
+        super().__init__(**kwargs)
+        self.stats = stats
+        self._slots = asyncio.Semaphore(max_connections)
+
+        # opened connections are counted by the httpcore pool (httpcore 0.13)
+        # with other versions, only requests and wait time are counted
+        if type(self._pool) is httpcore.AsyncConnectionPool:
+            self._pool.__class__ = _InstrumentedPool
+            self._pool.stats = stats
+
+    async def handle_async_request(self, *args, **kwargs):
+        self.stats.requests += 1
+
+        start = time.perf_counter()
+        await self._slots.acquire()
+        self.stats.wait_time += time.perf_counter() - start
+
+        try:
+            status_code, headers, stream, extensions = await super().handle_async_request(*args, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+
+        return status_code, headers, _ReleasingStream(stream, self._slots.release), extensions
+
+
+def _aiohttp_trace(stats: PoolStats) -> aiohttp.TraceConfig:
+
+    trace = aiohttp.TraceConfig()
+    queued: typing.Dict[int, float] = {}
+
+    async def on_request_start(session, ctx, params):
+        stats.requests += 1
+
+    async def on_connection_create_end(session, ctx, params):
+        stats.connections += 1
+
+    async def on_connection_queued_start(session, ctx, params):
+        queued[id(ctx)] = time.perf_counter()
+
+    async def on_connection_queued_end(session, ctx, params):
+        start = queued.pop(id(ctx), None)
+        if start is not None:
+            stats.wait_time += time.perf_counter() - start
+
+    trace.on_request_start.append(on_request_start)
+    trace.on_connection_create_end.append(on_connection_create_end)
+    trace.on_connection_queued_start.append(on_connection_queued_start)
+    trace.on_connection_queued_end.append(on_connection_queued_end)
+    return trace
+
+
+#------------------------------------------------------------
+# Manager
+#------------------------------------------------------------
+
+
+class PoolManager:
+    """Shared typed clients, one per host
+
+    Args:
+    -----
+        backend : str enum
+            [httpx, aiohttp] (optional)
+            default = httpx
+        max_connections : int
+            Maximum number of connections per host (default = 10)
+        keepalive_expiry : float
+            Seconds an idle connection is kept open (default = 30)
+        http2 : bool
+            Use HTTP/2, httpx backend only, requires `h2` (default = False)
+        (other keyword arguments are passed to each client, for ex `decoder`, `offload_threshold`)
+
+    Usage:
+    ------
+        await POOL_MANAGER.prewarm()
+        client = POOL_MANAGER.client(URL)
+        r = await client.safe_request(METHOD, URL, t_in=Request, t_out=KrakenFullResponse(Response()), params=payload)
+        POOL_MANAGER.stats()
+
+    Note:
+    -----
+        Clients are shared, do not use them as context managers (that would close them),
+        close all of them with `aclose` at shutdown.
+        Connections are bound to the event loop they were opened in.
+    """
+
+    def __init__(
+            self,
+            backend: BACKEND = "httpx",
+            max_connections: int = 10,
+            keepalive_expiry: float = 30.0,
+            http2: bool = False,
+            **client_kwargs
+        ):
+        if backend not in BACKEND.__args__:
+            raise ValueError(f"Invalid backend {backend} - must be one of {BACKEND.__args__}")
+        if http2 and backend != "httpx":
+            raise ValueError("HTTP/2 is only supported with the httpx backend")
+        if max_connections < 1:
+            raise ValueError(f"max_connections must be a positive integer - Given: {max_connections}")
+        if http2:
+            try:
+                import h2
+            except ImportError:
+                raise ImportError("HTTP/2 requires h2 - install with `pip install httpx[http2]`")
+
+        self.backend = backend
+        self.max_connections = max_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2
+        self.client_kwargs = client_kwargs
+
+        self._clients: typing.Dict[str, typing.Any] = {}
+        self._stats: typing.Dict[str, PoolStats] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host(url: str) -> str:
+        "pool key of `url` (host[:port])"
+        return urlsplit(url).netloc or url
+
+    def _new_client(self, stats: PoolStats):
+
+        if self.backend == "httpx":
+            limits = httpx.Limits(
+                max_connections=None,
+                max_keepalive_connections=self.max_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            )
+            transport = _InstrumentedTransport(stats, self.max_connections, limits=limits, http2=self.http2)
+            return HttypeClient.httpx(transport=transport, **self.client_kwargs)
+
+        connector = aiohttp.TCPConnector(limit_per_host=self.max_connections, keepalive_timeout=self.keepalive_expiry)
+        return HttypeClient.aiohttp(connector=connector, trace_configs=[_aiohttp_trace(stats)], **self.client_kwargs)
+
+    def client(self, url: str):
+        "shared client for the host of `url`, created on first use"
+
+        host = self.host(url)
+
+        with self._lock:
+            try:
+                return self._clients[host]
+            except KeyError:
+                stats = self._stats.setdefault(host, PoolStats())
+                client = self._clients[host] = self._new_client(stats)
+                return client
+
+    async def prewarm(self, urls: typing.Optional[typing.Iterable[str]] = None, connections: int = 1) -> None:
+        """open `connections` connections to each host, ahead of the first real request
+
+        Args:
+        -----
+            urls : Iterable[str]
+                Cheap endpoints of each host to send a GET to (optional)
+                default = PREWARM_URLS
+            connections : int
+                Connections to open per host (concurrent requests), capped at `max_connections`
+        """
+
+        urls = tuple(urls) if urls is not None else tuple(PREWARM_URLS.values())
+        connections = min(connections, self.max_connections)
+
+        async def _get(url):
+            client = self.client(url)
+            if self.backend == "httpx":
+                await client.get(url)
+            else:
+                async with client.get(url) as r:
+                    await r.read()
+
+        await asyncio.gather(*(_get(url) for url in urls for _ in range(connections)))
+
+    def stats(self) -> typing.Dict[str, typing.Dict[str, typing.Union[int, float]]]:
+        "per host stats (see `PoolStats`)"
+        with self._lock:
+            return {host: stats.as_dict() for host, stats in self._stats.items()}
+
+    async def aclose(self) -> None:
+        "close all clients, stats are kept"
+
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+
+        for client in clients:
+            if self.backend == "httpx":
+                await client.aclose()
+            else:
+                await client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+
+# process wide manager
+POOL_MANAGER = PoolManager()
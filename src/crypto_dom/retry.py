@@ -0,0 +1,302 @@
+import asyncio
+import collections
+import random
+import time
+import typing
+from urllib.parse import urlsplit
+
+import aiohttp
+import httpx
+from typing_extensions import Literal
+
+from crypto_dom.result import Result, Ok, Err
+from crypto_dom.binance import errors as binance_errors
+from crypto_dom.kraken import errors as kraken_errors
+
+
+# ============================================================
+# RETRY POLICY
+# ============================================================
+
+
+# `safe_request` returns Err, or an error response, on any failure.
+# The policy classifies failures with the error taxonomies of each exchange:
+#   retry            : the request was not processed (rate limits, connection errors, invalid nonce ...)
+#   retry_idempotent : the request may have been executed (timeouts, 5xx, internal errors ...),
+#                      only sent again if that is harmless
+#   fatal            : sending it again would fail the same way (invalid arguments, signature, funds ...)
+# and retries with exponential backoff and jitter, honoring `Retry-After`,
+# within a retry budget per endpoint.
+# A `Retry-After` longer than `max_delay` (for ex a 418 ban) is not waited for:
+# the failure is returned to the caller.
+
+
+DECISION = Literal["success", "retry", "retry_idempotent", "fatal"]
+
+
+# endpoints creating orders or moving funds: a duplicate is not harmless
+NON_IDEMPOTENT = frozenset([
+    ("POST", "/0/private/AddOrder"),
+    ("POST", "/0/private/Withdraw"),
+    ("POST", "/0/private/WalletTransfer"),
+    ("POST", "/api/v3/order"),
+    ("POST", "/api/v3/order/oco"),
+    ("POST", "/sapi/v1/capital/withdraw/apply"),
+    ("POST", "/sapi/v1/asset/transfer"),
+])
+
+# the request was not sent, or not received by the exchange
+_NOT_SENT_EXCEPTIONS = (
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.PoolTimeout,
+    aiohttp.ClientConnectorError,
+)
+
+# the request may have been received
+_UNKNOWN_STATUS_EXCEPTIONS = (
+    httpx.TransportError,
+    aiohttp.ClientConnectionError,
+    aiohttp.ClientPayloadError,
+    asyncio.TimeoutError,
+)
+
+
+class Classification(typing.NamedTuple):
+    decision: DECISION
+    reason: str
+    retry_after: typing.Optional[float] = None
+
+
+def _retry_after(headers: typing.Any) -> typing.Optional[float]:
+    "seconds of a `Retry-After` header, dates are not supported"
+    try:
+        value = headers.get("Retry-After")
+        return float(value) if value is not None else None
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def _classify_error(error: typing.Any) -> typing.Optional[typing.Tuple[DECISION, str]]:
+    "decision for an error response of Kraken (`error` tuple) or Binance (`code`)"
+
+    code = getattr(error, "code", None)
+    if isinstance(code, int):
+        if code in binance_errors.RATE_LIMIT_CODES or code in binance_errors.NOT_PROCESSED_CODES:
+            return "retry", f"binance {code}"
+        if code in binance_errors.UNKNOWN_STATUS_CODES:
+            return "retry_idempotent", f"binance {code}"
+        return "fatal", f"binance {code}"
+
+    messages = getattr(error, "error", None)
+    if messages:
+        for message in messages:
+            if message in kraken_errors.RATE_LIMIT_ERRORS or message in kraken_errors.NOT_PROCESSED_ERRORS:
+                return "retry", message
+            if message in kraken_errors.UNKNOWN_STATUS_ERRORS:
+                return "retry_idempotent", message
+        return "fatal", ", ".join(messages)
+
+    return None
+
+
+def classify(result: Result) -> Classification:
+    """classify the Result of `safe_request`
+
+    Usage:
+    ------
+        classify(await client.safe_request(...)).decision
+    """
+
+    if isinstance(result, Err):
+        e = result.value
+        if isinstance(e, _NOT_SENT_EXCEPTIONS):
+            return Classification("retry", type(e).__name__)
+        if isinstance(e, _UNKNOWN_STATUS_EXCEPTIONS):
+            return Classification("retry_idempotent", type(e).__name__)
+        return Classification("fatal", type(e).__name__)
+
+    r = result.value
+    status = getattr(r, "status_code", getattr(r, "status", 200))
+    retry_after = _retry_after(getattr(r, "headers", None))
+
+    # 429: rate limited, 418: IP banned for going on after 429
+    if status in (418, 429):
+        return Classification("retry", f"http {status}", retry_after)
+
+    content = getattr(r, "safe_content", None)
+    if isinstance(content, Err):
+        decision = _classify_error(content.value)
+        if decision is not None:
+            return Classification(*decision, retry_after)
+
+    # 5xx: Binance documents the execution status as unknown
+    if status >= 500:
+        return Classification("retry_idempotent", f"http {status}", retry_after)
+    if status >= 400:
+        return Classification("fatal", f"http {status}")
+    if isinstance(content, Err):
+        # validation error of a successful response
+        return Classification("fatal", type(content.value).__name__)
+
+    return Classification("success", "")
+
+
+class RetryPolicy:
+    """Retries of failed requests
+
+    Args:
+    -----
+        max_attempts : int
+            Attempts per request, including the first one (default = 3)
+        base_delay : float
+            Seconds before the first retry, doubled on each retry (default = 0.5)
+        max_delay : float
+            Maximum seconds between attempts (default = 30)
+            failures asking to wait longer (`Retry-After`) are not retried
+        budget : int
+            Retries per endpoint over `budget_period` (default = 20)
+        budget_period : float
+            Seconds (default = 60)
+        non_idempotent : Iterable[Tuple[str, str]]
+            (method, path) of requests that may only be retried if they were not processed (optional)
+            default = NON_IDEMPOTENT (order placement, withdrawals and transfers)
+
+    Counters:
+    ---------
+        retries : int
+        gave_up : int
+            Failures returned after `max_attempts`
+        budget_exhausted : int
+            Failures returned because the budget of the endpoint was used up
+        retry_after_exceeded : int
+            Failures returned because their `Retry-After` was longer than `max_delay`
+        reasons : Counter
+            Retries per reason
+
+    Usage:
+    ------
+        policy = RetryPolicy(max_attempts=5)
+
+        # the request is rebuilt on each attempt, for ex with a new nonce
+        r = await policy.call(METHOD, URL, lambda: client.safe_request(METHOD, URL, data={..., "nonce": nonce()}, ...))
+
+        # or for every request of a client
+        async with HttypeClient.httpx(retry_policy=policy) as client:
+            ...
+
+    Note:
+    -----
+        Requests signed by `safe_request` (`auth_headers`) are not retried by the client:
+        their nonce can not be reused, retry them with `call`
+    """
+
+    def __init__(
+            self,
+            max_attempts: int = 3,
+            base_delay: float = 0.5,
+            max_delay: float = 30.0,
+            budget: int = 20,
+            budget_period: float = 60.0,
+            non_idempotent: typing.Iterable[typing.Tuple[str, str]] = NON_IDEMPOTENT,
+            clock: typing.Callable[[], float] = time.monotonic,
+            sleep: typing.Callable[[float], typing.Awaitable[None]] = asyncio.sleep,
+        ):
+        if max_attempts < 1:
+            raise ValueError(f"max_attempts must be a positive integer - Given: {max_attempts}")
+
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.budget_period = budget_period
+        self.non_idempotent = frozenset((method.upper(), path) for method, path in non_idempotent)
+        self.clock = clock
+        self.sleep = sleep
+
+        self.retries = 0
+        self.gave_up = 0
+        self.budget_exhausted = 0
+        self.retry_after_exceeded = 0
+        self.reasons: typing.Counter[str] = collections.Counter()
+
+        self._spent: typing.Dict[str, typing.Deque[float]] = {}
+
+    def is_idempotent(self, method: str, url: typing.Any) -> bool:
+        return (method.upper(), urlsplit(str(url)).path) not in self.non_idempotent
+
+    def delay(self, attempt: int, retry_after: typing.Optional[float] = None) -> float:
+        "seconds before retry number `attempt` (from 1), exponential backoff with full jitter, at most `max_delay`"
+
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+    def _spend(self, endpoint: str) -> bool:
+        "use one retry of the budget of `endpoint`, False if there is none left"
+
+        now = self.clock()
+        spent = self._spent.setdefault(endpoint, collections.deque())
+        while spent and now - spent[0] > self.budget_period:
+            spent.popleft()
+        if len(spent) >= self.budget:
+            return False
+        spent.append(now)
+        return True
+
+    def should_retry(self, classification: Classification, idempotent: bool) -> bool:
+        if classification.decision == "retry":
+            return True
+        return classification.decision == "retry_idempotent" and idempotent
+
+    async def call(
+            self,
+            method: str,
+            url: typing.Any,
+            send: typing.Callable[[], typing.Awaitable[Result]],
+            idempotent: typing.Optional[bool] = None,
+        ) -> Result:
+        """send the request built by `send`, and retry it while the failure is retryable
+
+        Args:
+        -----
+            idempotent : bool
+                Whether the request can be executed twice (optional)
+                default = not in `non_idempotent`
+        """
+
+        if idempotent is None:
+            idempotent = self.is_idempotent(method, url)
+        endpoint = f"{method.upper()} {urlsplit(str(url)).path}"
+
+        attempt = 1
+        while True:
+            result = await send()
+            classification = classify(result)
+
+            if not self.should_retry(classification, idempotent):
+                return result
+            if attempt >= self.max_attempts:
+                self.gave_up += 1
+                return result
+            if classification.retry_after is not None and classification.retry_after > self.max_delay:
+                self.retry_after_exceeded += 1
+                return result
+            if not self._spend(endpoint):
+                self.budget_exhausted += 1
+                return result
+
+            self.retries += 1
+            self.reasons[classification.reason] += 1
+            await self.sleep(self.delay(attempt, classification.retry_after))
+            attempt += 1
+
+    def stats(self) -> typing.Dict[str, typing.Any]:
+        return {
+            "retries": self.retries,
+            "gave_up": self.gave_up,
+            "budget_exhausted": self.budget_exhausted,
+            "retry_after_exceeded": self.retry_after_exceeded,
+            "reasons": dict(self.reasons),
+        }
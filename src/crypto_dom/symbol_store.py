@@ -0,0 +1,342 @@
+import json
+import mmap
+import os
+import struct
+import threading
+import typing
+import zlib
+from decimal import Decimal
+
+from crypto_dom.path import APP_PATH
+
+
+# ============================================================
+# BINARY SYMBOL STORE
+# ============================================================
+
+
+# `crypto-dom-update` dumps the full exchange metadata as JSON (1.7MB for Binance symbols),
+# which every consumer has to parse entirely. It also writes a compact binary index of it,
+# that is memory mapped read-only: opening it only parses the header, a symbol lookup
+# is a hash probe and a single record decode, and pages are shared between processes.
+#
+# Layout (little endian):
+#   header  : magic, version, record size, counts and section offsets (`_HEADER`)
+#   schema  : JSON {"kind": str, "key": str, "fields": [[name, type], ...]}
+#   slots   : open addressing hash table, u32 record index + 1 (0 = empty slot), crc32 of the key
+#   assets  : u32 string pool offsets, referenced by u16 asset ids
+#   records : fixed width records, one per symbol, fields packed according to the schema
+#   pool    : deduplicated strings, each prefixed by its u16 length
+
+
+MAGIC = b"CDSS"
+VERSION = 1
+
+BINANCE_SYMBOLS = os.path.join(APP_PATH, "binance", "_data_symbols.bin")
+KRAKEN_PAIRS = os.path.join(APP_PATH, "kraken", "_data_assetpairs.bin")
+
+
+# magic, version, record size, records, slots, assets, schema offset, schema size,
+# slots offset, assets offset, records offset, pool offset
+_HEADER = struct.Struct("<4sHHIIIIIIIII")
+
+# field types, with the value marking a missing field
+#   str : u32 offset in the string pool
+#   dec : u32 offset in the string pool, decoded as Decimal
+#   asset : u16 asset id
+_TYPES = {
+    "str": ("I", 0xFFFFFFFF),
+    "dec": ("I", 0xFFFFFFFF),
+    "asset": ("H", 0xFFFF),
+    "bool": ("b", -1),
+    "u8": ("B", 0xFF),
+    "i32": ("i", -2**31),
+    "i64": ("q", -2**63),
+}
+
+_U32 = struct.Struct("<I")
+_U16 = struct.Struct("<H")
+
+Field = typing.Tuple[str, str]
+
+
+def _record_struct(fields: typing.Sequence[Field]) -> struct.Struct:
+    return struct.Struct("<" + "".join(_TYPES[type_][0] for _, type_ in fields))
+
+
+def _slot_count(n: int) -> int:
+    "power of two, load factor at most 0.5"
+    slots = 1
+    while slots < 2 * n:
+        slots *= 2
+    return slots
+
+
+#------------------------------------------------------------
+# Write
+#------------------------------------------------------------
+
+
+def write_store(
+        filename: str,
+        kind: str,
+        key: str,
+        fields: typing.Sequence[Field],
+        rows: typing.Iterable[typing.Mapping[str, typing.Any]]
+    ) -> None:
+    """write a binary store of `rows`, indexed by `key`
+
+    Args:
+    -----
+        filename : str
+        kind : str
+            Name of the store (for ex "binance_symbols"), checked on open
+        key : str
+            Name of the field the records are indexed by, must be a `str` field
+        fields : Sequence[Tuple[str, str]]
+            (name, type) of each record field, types are
+            str, dec, asset, bool, u8, i32, i64
+        rows : Iterable[Mapping[str, Any]]
+            Missing or None values are stored as missing
+    """
+
+    fields = [tuple(f) for f in fields]
+    names = [name for name, _ in fields]
+    if key not in names or dict(fields)[key] != "str":
+        raise ValueError(f"Key {key} must be a str field")
+    for name, type_ in fields:
+        if type_ not in _TYPES:
+            raise ValueError(f"Invalid type {type_} for field {name} - must be one of {tuple(_TYPES)}")
+
+    record = _record_struct(fields)
+
+    pool = bytearray()
+    pool_index: typing.Dict[str, int] = {}
+
+    def intern(value: str) -> int:
+        try:
+            return pool_index[value]
+        except KeyError:
+            encoded = value.encode()
+            offset = pool_index[value] = len(pool)
+            pool.extend(_U16.pack(len(encoded)))
+            pool.extend(encoded)
+            return offset
+
+    assets: typing.Dict[str, int] = {}
+    records = bytearray()
+    keys = []
+
+    for row in rows:
+        values = []
+        for name, type_ in fields:
+            value = row.get(name)
+            if value is None:
+                values.append(_TYPES[type_][1])
+            elif type_ in ("str", "dec"):
+                values.append(intern(str(value)))
+            elif type_ == "asset":
+                values.append(assets.setdefault(value, len(assets)))
+            else:
+                values.append(int(value))
+        records.extend(record.pack(*values))
+        keys.append(row[key])
+
+    if len(assets) >= 0xFFFF:
+        raise ValueError(f"Too many assets: {len(assets)}")
+
+    asset_table = b"".join(_U32.pack(intern(asset)) for asset in assets)
+
+    n_slots = _slot_count(len(keys))
+    slots = [0] * n_slots
+    for index, name in enumerate(keys):
+        slot = zlib.crc32(name.encode()) & (n_slots - 1)
+        while slots[slot]:
+            if keys[slots[slot] - 1] == name:
+                raise ValueError(f"Duplicate key {name}")
+            slot = (slot + 1) & (n_slots - 1)
+        slots[slot] = index + 1
+
+    schema = json.dumps({"kind": kind, "key": key, "fields": fields}).encode()
+    slots_table = struct.pack(f"<{n_slots}I", *slots)
+
+    schema_offset = _HEADER.size
+    slots_offset = schema_offset + len(schema)
+    assets_offset = slots_offset + len(slots_table)
+    records_offset = assets_offset + len(asset_table)
+    pool_offset = records_offset + len(records)
+
+    header = _HEADER.pack(
+        MAGIC, VERSION, record.size, len(keys), n_slots, len(assets),
+        schema_offset, len(schema), slots_offset, assets_offset, records_offset, pool_offset
+    )
+
+    # write then rename, readers never map a partial file
+    tmp = f"{filename}.tmp"
+    with open(tmp, "wb") as file:
+        for part in (header, schema, slots_table, asset_table, records, pool):
+            file.write(part)
+    os.replace(tmp, filename)
+
+
+#------------------------------------------------------------
+# Read
+#------------------------------------------------------------
+
+
+class SymbolStore:
+    """Read-only, memory mapped symbol store
+
+    Args:
+    -----
+        filename : str
+            File written by `write_store`
+
+    Usage:
+    ------
+        with SymbolStore(BINANCE_SYMBOLS) as store:
+            store["ETHBTC"]["tickSize"]
+            store.field("ETHBTC", "baseAsset")
+
+    Note:
+    -----
+        Records are returned as dicts, `dec` fields as Decimal, missing fields as None
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+
+        with open(filename, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            (
+                magic, version, record_size, self._n_records, self._n_slots, self._n_assets,
+                schema_offset, schema_size, self._slots, self._assets, self._records, self._pool
+            ) = _HEADER.unpack_from(self._mmap, 0)
+        except struct.error:
+            self._mmap.close()
+            raise ValueError(f"Invalid symbol store {filename}: truncated header")
+
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise ValueError(f"Invalid symbol store {filename}: magic {magic!r} version {version}")
+
+        schema = json.loads(self._mmap[schema_offset:schema_offset+schema_size])
+        self.kind: str = schema["kind"]
+        self.key: str = schema["key"]
+        self.fields: typing.Tuple[Field, ...] = tuple((name, type_) for name, type_ in schema["fields"])
+
+        self._record = _record_struct(self.fields)
+        if self._record.size != record_size:
+            self._mmap.close()
+            raise ValueError(f"Invalid symbol store {filename}: record size {record_size}, schema gives {self._record.size}")
+
+        self._positions = {name: i for i, (name, _) in enumerate(self.fields)}
+        self._key_index = self._positions[self.key]
+
+    # ---- decoding
+
+    def _string(self, offset: int) -> str:
+        start = self._pool + offset
+        (size,) = _U16.unpack_from(self._mmap, start)
+        return self._mmap[start+2:start+2+size].decode()
+
+    def _decode(self, type_: str, value: int) -> typing.Any:
+        if value == _TYPES[type_][1]:
+            return None
+        if type_ == "str":
+            return self._string(value)
+        if type_ == "dec":
+            return Decimal(self._string(value))
+        if type_ == "asset":
+            return self._string(_U32.unpack_from(self._mmap, self._assets + 4 * value)[0])
+        if type_ == "bool":
+            return bool(value)
+        return value
+
+    def _unpack(self, index: int) -> typing.Tuple[int, ...]:
+        return self._record.unpack_from(self._mmap, self._records + index * self._record.size)
+
+    def _find(self, key: str) -> int:
+        "record index of `key`, -1 if not found"
+
+        encoded = key.encode()
+        mask = self._n_slots - 1
+        slot = zlib.crc32(encoded) & mask
+
+        while True:
+            (entry,) = _U32.unpack_from(self._mmap, self._slots + 4 * slot)
+            if not entry:
+                return -1
+            offset = self._unpack(entry - 1)[self._key_index]
+            start = self._pool + offset
+            (size,) = _U16.unpack_from(self._mmap, start)
+            if size == len(encoded) and self._mmap[start+2:start+2+size] == encoded:
+                return entry - 1
+            slot = (slot + 1) & mask
+
+    # ---- lookups
+
+    def get(self, key: str, default: typing.Any = None) -> typing.Optional[typing.Dict[str, typing.Any]]:
+        index = self._find(key)
+        if index < 0:
+            return default
+        return {name: self._decode(type_, value) for (name, type_), value in zip(self.fields, self._unpack(index))}
+
+    def field(self, key: str, name: str) -> typing.Any:
+        "single field of the record of `key`, without decoding the others"
+
+        index = self._find(key)
+        if index < 0:
+            raise KeyError(key)
+        position = self._positions[name]
+        return self._decode(self.fields[position][1], self._unpack(index)[position])
+
+    def keys(self) -> typing.Iterator[str]:
+        for index in range(self._n_records):
+            yield self._string(self._unpack(index)[self._key_index])
+
+    def __getitem__(self, key: str) -> typing.Dict[str, typing.Any]:
+        record = self.get(key)
+        if record is None:
+            raise KeyError(key)
+        return record
+
+    def __contains__(self, key: str) -> bool:
+        return self._find(key) >= 0
+
+    def __iter__(self) -> typing.Iterator[str]:
+        return self.keys()
+
+    def __len__(self) -> int:
+        return self._n_records
+
+    # ---- lifetime
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}:{self.kind} ({self._n_records} records)>"
+
+
+_STORES: typing.Dict[str, SymbolStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def open_store(filename: str) -> SymbolStore:
+    "store for `filename`, opened once per process"
+
+    with _STORES_LOCK:
+        try:
+            return _STORES[filename]
+        except KeyError:
+            store = _STORES[filename] = SymbolStore(filename)
+            return store
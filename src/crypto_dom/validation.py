@@ -0,0 +1,255 @@
+import functools
+import threading
+import typing
+
+import pydantic
+from pydantic.fields import (
+    ModelField, SHAPE_SINGLETON, SHAPE_LIST, SHAPE_SET, SHAPE_FROZENSET, SHAPE_TUPLE_ELLIPSIS,
+    SHAPE_SEQUENCE, SHAPE_MAPPING, SHAPE_DICT
+)
+from typing_extensions import Literal
+
+
+# ============================================================
+# VALIDATION POLICY
+# ============================================================
+
+
+# Full validation of every response is the default.
+# When polling the same endpoint at high frequency, most of that work repeats:
+# the policy lets a full response model (KrakenFullResponse, BinanceFull) validate
+# only a sample of the responses, or none, and build the others without validation.
+
+
+MODE = Literal["strict", "sampled", "trusted"]
+
+
+class ValidationPolicy:
+    """Per-endpoint validation policy
+
+    Args:
+    -----
+        mode : str enum
+            strict = validate every response (default)
+            sampled = validate 1 in `sample_every` responses, build the others without validation
+            trusted = build every response without validation
+        sample_every : int
+            Sampling interval for `sampled` mode (default = 100)
+
+    Counters:
+    ---------
+        validated : int
+            Responses that were fully validated
+        failed : int
+            Responses that failed validation
+        skipped : int
+            Responses built without validation
+
+    Note:
+    -----
+        In `sampled` mode, a failed validation means the schema might have drifted:
+        following responses are validated until one passes again.
+
+        Responses are built without validation with `construct_response`.
+        Response models that do not support it are always validated.
+    """
+
+    def __init__(self, mode: MODE = "strict", sample_every: int = 100):
+        if mode not in MODE.__args__:
+            raise ValueError(f"Invalid validation mode {mode} - must be one of {MODE.__args__}")
+        if sample_every < 1:
+            raise ValueError(f"sample_every must be a positive integer - Given: {sample_every}")
+
+        self.mode = mode
+        self.sample_every = sample_every
+
+        self.validated = 0
+        self.failed = 0
+        self.skipped = 0
+
+        self._seen = 0
+        self._drift = False
+        self._lock = threading.Lock()
+
+    def should_validate(self) -> bool:
+        "whether the next response has to be fully validated"
+
+        if self.mode == "strict":
+            return True
+        if self.mode == "trusted":
+            return False
+
+        with self._lock:
+            sample = self._drift or self._seen % self.sample_every == 0
+            self._seen += 1
+            return sample
+
+    def __call__(self, model: typing.Any, payload: typing.Any) -> typing.Any:
+        "validate `payload` with the response `model`, or build it without validation"
+
+        if not self.should_validate() and can_construct(model):
+            result = construct_response(model, payload)
+            with self._lock:
+                self.skipped += 1
+            return result
+
+        try:
+            result = validate_response(model, payload)
+        except Exception:
+            with self._lock:
+                self.validated += 1
+                self.failed += 1
+                self._drift = self.mode == "sampled"
+            raise
+
+        with self._lock:
+            self.validated += 1
+            self._drift = False
+        return result
+
+    # ---- process pools: a pickled copy would not share the sampling state and counters,
+    # the parent decides and sends a one-off policy, then merges its counters
+
+    def decided(self, validate: bool) -> "ValidationPolicy":
+        "one-off policy applying a decision of `should_validate`"
+        return ValidationPolicy("strict" if validate else "trusted")
+
+    def merge(self, other: "ValidationPolicy") -> None:
+        "add the counters of a `decided` policy returned by a worker"
+
+        with self._lock:
+            self.validated += other.validated
+            self.failed += other.failed
+            self.skipped += other.skipped
+            if other.failed:
+                self._drift = self.mode == "sampled"
+            elif other.validated:
+                self._drift = False
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def stats(self) -> typing.Dict[str, typing.Union[str, int]]:
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "validated": self.validated,
+                "failed": self.failed,
+                "skipped": self.skipped,
+            }
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}:{self.mode}>"
+
+
+def get_policy(validation: typing.Union[MODE, ValidationPolicy]) -> ValidationPolicy:
+    "accept a mode name as a shorthand for a new policy"
+    if isinstance(validation, ValidationPolicy):
+        return validation
+    return ValidationPolicy(validation)
+
+
+#------------------------------------------------------------
+# Validate / Construct
+#------------------------------------------------------------
+
+
+def _is_model(model: typing.Any) -> bool:
+    return isinstance(model, type) and issubclass(model, pydantic.BaseModel)
+
+
+def validate_response(model: typing.Any, payload: typing.Any) -> typing.Any:
+    "pydantic models are unpacked, wrappers we defined are called with the payload"
+
+    if _is_model(model):
+        if "__root__" in model.__fields__:
+            return model.parse_obj(payload)
+        return model(**payload)
+
+    return model(payload)
+
+
+def can_construct(model: typing.Any) -> bool:
+    """pydantic models, and wrappers defining their own `construct`
+
+    Instances of pydantic models inherit the `BaseModel.construct` classmethod,
+    which would build an empty model: they are always validated.
+    """
+
+    if _is_model(model):
+        return True
+    if isinstance(model, pydantic.BaseModel):
+        return False
+    return callable(type(model).__dict__.get("construct"))
+
+
+def construct_response(model: typing.Any, payload: typing.Any) -> typing.Any:
+    "same output as `validate_response`, without validation"
+
+    if _is_model(model):
+        if "__root__" in model.__fields__:
+            return construct_model(model, {"__root__": payload})
+        return construct_model(model, payload)
+
+    return model.construct(payload)
+
+
+_SEQUENCE_SHAPES = (SHAPE_LIST, SHAPE_SET, SHAPE_FROZENSET, SHAPE_TUPLE_ELLIPSIS, SHAPE_SEQUENCE)
+_MAPPING_SHAPES = (SHAPE_MAPPING, SHAPE_DICT)
+
+
+@functools.lru_cache(maxsize=1024)
+def _plan(model: typing.Type[pydantic.BaseModel]) -> typing.Tuple[typing.Tuple[str, str, ModelField, bool], ...]:
+    "fields of `model` as (name, alias, field, has nested model)"
+    return tuple(
+        (name, field.alias, field, _is_model(field.type_))
+        for name, field in model.__fields__.items()
+    )
+
+
+def _construct_value(field: ModelField, value: typing.Any) -> typing.Any:
+
+    if value is None:
+        return value
+
+    submodel = field.type_
+
+    if field.shape == SHAPE_SINGLETON:
+        return construct_model(submodel, value) if isinstance(value, dict) else value
+
+    if field.shape in _SEQUENCE_SHAPES and isinstance(value, (list, tuple)):
+        items = [construct_model(submodel, v) if isinstance(v, dict) else v for v in value]
+        return tuple(items) if field.shape == SHAPE_TUPLE_ELLIPSIS else items
+
+    if field.shape in _MAPPING_SHAPES and isinstance(value, dict):
+        return {k: construct_model(submodel, v) if isinstance(v, dict) else v for k, v in value.items()}
+
+    return value
+
+
+def construct_model(model: typing.Type[pydantic.BaseModel], values: dict) -> pydantic.BaseModel:
+    """build `model` from trusted `values`, without validation
+
+    Unlike `model.construct`, nested models are also constructed so attribute access
+    is the same as for a validated model. Values are not coerced (for ex Decimal fields hold the raw string).
+    """
+
+    fields = {}
+
+    for name, alias, field, nested in _plan(model):
+        if alias in values:
+            value = values[alias]
+        elif name in values:
+            value = values[name]
+        else:
+            continue
+
+        fields[name] = _construct_value(field, value) if nested else value
+
+    return model.construct(**fields)
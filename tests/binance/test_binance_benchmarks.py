@@ -0,0 +1,144 @@
+import hashlib
+import hmac
+import timeit
+import typing
+from urllib.parse import urlencode
+
+import pydantic
+import pytest
+from typing_extensions import Literal
+
+from crypto_dom.definitions import HashedLiteral
+from crypto_dom.binance.definitions import SYMBOL
+from crypto_dom.binance.__sign import Signer
+from crypto_dom.binance.market_data.daily_ticker import Response as DailyTickerResp, _24hTicker
+
+
+NUMBER = 5
+
+# all-symbols response (request without `symbol` parameter)
+_row = {
+    "priceChange": "-94.99999800",
+    "priceChangePercent": "-95.960",
+    "weightedAvgPrice": "0.29628482",
+    "prevClosePrice": "0.10002000",
+    "lastPrice": "4.00000200",
+    "lastQty": "200.00000000",
+    "bidPrice": "4.00000000",
+    "askPrice": "4.00000200",
+    "openPrice": "99.00000000",
+    "highPrice": "100.00000000",
+    "lowPrice": "0.10000000",
+    "volume": "8913.30000000",
+    "quoteVolume": "15.30000000",
+    "openTime": 1499783499040,
+    "closeTime": 1499869899040,
+    "firstId": 28385,
+    "lastId": 28460,
+    "count": 76
+}
+all_symbols = [{"symbol": symbol, **_row} for symbol in SYMBOL.__args__]
+
+
+def _literal_response():
+    "daily ticker response model with SYMBOL as a Literal (previous definition)"
+
+    symbol_literal = Literal.__getitem__(SYMBOL.__args__)
+
+    class _Ticker(_24hTicker):
+        symbol: symbol_literal
+
+    class _Tickers(pydantic.BaseModel):
+        data: typing.Tuple[_Ticker, ...]
+
+    return lambda response: _Tickers(data=response).data
+
+
+def _model_definition(symbol_type):
+    class _Model(pydantic.BaseModel):
+        symbol: symbol_type
+    return _Model
+
+
+def test_symbol_is_hashed_literal():
+    assert issubclass(SYMBOL, HashedLiteral)
+    assert len(SYMBOL.__args__) == len(set(SYMBOL.__args__))
+
+
+def test_base_hashed_literal_is_not_a_field_type():
+    with pytest.raises(TypeError):
+        _model_definition(HashedLiteral)
+
+
+def test_same_errors_as_literal():
+    literal = _model_definition(Literal.__getitem__(SYMBOL.__args__))
+    hashed = _model_definition(SYMBOL)
+
+    for value in ["NOTASYMBOL", 1, ["ETHBTC"]]:
+        with pytest.raises(pydantic.ValidationError) as literal_error:
+            literal(symbol=value)
+        with pytest.raises(pydantic.ValidationError) as hashed_error:
+            hashed(symbol=value)
+        assert hashed_error.value.errors() == literal_error.value.errors()
+
+    assert hashed.schema()["properties"]["symbol"] == literal.schema()["properties"]["symbol"]
+
+
+def test_daily_ticker_benchmark():
+    literal = _literal_response()
+    hashed = DailyTickerResp()
+
+    assert [t.symbol for t in hashed(all_symbols)] == [t.symbol for t in literal(all_symbols)]
+
+    before = timeit.timeit(lambda: literal(all_symbols), number=NUMBER) / NUMBER
+    after = timeit.timeit(lambda: hashed(all_symbols), number=NUMBER) / NUMBER
+    print(f"\nDaily ticker ({len(all_symbols)} symbols): Literal {before*1e3:.2f}ms - hashed {after*1e3:.2f}ms")
+
+    # pydantic already looks Literal values up in a dict, per row cost should be on par
+    assert after < before * 1.5
+
+
+def test_model_definition_benchmark():
+    symbol_literal = Literal.__getitem__(SYMBOL.__args__)
+
+    before = timeit.timeit(lambda: _model_definition(symbol_literal), number=NUMBER) / NUMBER
+    after = timeit.timeit(lambda: _model_definition(SYMBOL), number=NUMBER) / NUMBER
+    print(f"\nModel with a SYMBOL field: Literal {before*1e3:.2f}ms - hashed {after*1e3:.2f}ms")
+
+    assert after < before
+
+
+SIGN_NUMBER = 20000
+
+
+def _legacy_auth_payload(url, data, *, secret):
+    "params sorted and urlencoded twice (previous implementation)"
+
+    sorted_data = sorted([(k, v) for k, v in data.items()])
+    signature = hmac.new(secret.encode(), urlencode(sorted([(k, v) for k, v in data.items()])).encode(), hashlib.sha256)
+    sorted_data.append(("signature", signature.hexdigest()))
+    return sorted_data
+
+
+def test_signer_benchmark():
+    url = "https://api.binance.com/api/v3/order"
+    secret = "NhqPtmdSJYdKjVHjA7PZj4Mge3R5YNiP1e3UZjInClVN65XAbvqqM6A7H5fATj0j"
+    data = {"symbol": "LTCBTC", "side": "BUY", "type": "LIMIT", "timeInForce": "GTC", "quantity": 1, "price": 0.1, "recvWindow": 5000, "timestamp": 1499827319559}
+
+    signer = Signer("key", secret)
+    _, body, headers = signer.sign("POST", url, data)
+    # example of the API documentation
+    assert body.endswith(b"&signature=c8db56825ae71d6d79447849e617115f4a920fa2acdcab2b053c4b2838bd6b71")
+    assert headers["X-MBX-APIKEY"] == "key"
+
+    url_with_query, body, _ = signer.sign("GET", url, {"symbol": "LTCBTC", "timestamp": 1499827319559})
+    assert body is None and url_with_query.startswith(f"{url}?symbol=LTCBTC&timestamp=1499827319559&signature=")
+
+    # the signed params were encoded again by the client
+    legacy = lambda: urlencode(_legacy_auth_payload(url, data, secret=secret)).encode()
+    current = lambda: signer.sign("POST", url, data)
+
+    before = timeit.timeit(legacy, number=SIGN_NUMBER)
+    after = timeit.timeit(current, number=SIGN_NUMBER)
+    print(f"\nBinance signs per second: before {SIGN_NUMBER/before:.0f} - after {SIGN_NUMBER/after:.0f}")
+    assert after < before
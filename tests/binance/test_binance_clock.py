@@ -0,0 +1,54 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from crypto_dom.client import HttypeClient
+from crypto_dom.binance.clock import ClockSync, MIN_RECV_WINDOW, MAX_RECV_WINDOW
+from crypto_dom.binance.__sign import auth_timestamp
+
+
+def test_offset_follows_the_shortest_round_trip():
+
+    clock = ClockSync(alpha=1.0, clock=lambda: 1000.0)
+
+    # server 2.5s ahead, the sample with a 400ms round trip was delayed on the way back
+    clock.observe(100.0, 102_600, 100.4)
+    assert clock.offset == pytest.approx(2.4)
+    clock.observe(200.0, 202_510, 200.02)
+    clock.observe(300.0, 302_550, 300.1)
+
+    assert clock.offset == pytest.approx(2.5)
+    assert clock.round_trip == pytest.approx(0.02)
+    assert 0 < clock.jitter < 0.1
+    assert clock.timestamp() == 1_002_500
+    assert auth_timestamp(clock) == 1_002_500
+
+    assert clock.recv_window() == MIN_RECV_WINDOW
+    clock.jitter = 100.0
+    assert clock.recv_window() == MAX_RECV_WINDOW
+
+    with pytest.raises(ValueError):
+        ClockSync(alpha=0)
+
+
+@pytest.mark.asyncio
+async def test_background_sync():
+
+    skew = 3.0
+
+    def handler(request):
+        assert request.url.path == "/api/v3/time"
+        return httpx.Response(200, json={"serverTime": int((time.time() + skew) * 1000)})
+
+    clock = ClockSync()
+    async with HttypeClient.httpx(transport=httpx.MockTransport(handler)) as client:
+        await clock.start(client, interval=0.05, burst=2)
+        assert clock.samples == 2
+        await asyncio.sleep(0.12)
+        await clock.stop()
+
+    assert clock.samples >= 3
+    assert clock.offset == pytest.approx(skew, abs=0.01)
+    assert abs(clock.timestamp() - (time.time() + skew) * 1000) < 10
@@ -0,0 +1,81 @@
+import copy
+import json
+import os
+
+import pydantic
+import pytest
+import yaml
+
+np = pytest.importorskip("numpy")
+
+from crypto_dom.result import Ok
+from crypto_dom.binance import BinanceFull
+from crypto_dom.binance.market_data.klines import Response, KlineColumns
+
+
+CASSETTE = os.path.join(
+    os.path.dirname(__file__), "cassettes", "test_binance_response_models", "public", "test_klines_response_model.yaml"
+)
+
+with open(CASSETTE) as file:
+    klines = json.loads(yaml.safe_load(file)["interactions"][0]["response"]["content"])
+
+
+def _errors(response):
+    "errors raised by the default (per row) validation and by the columnar decoder"
+    with pytest.raises(pydantic.ValidationError) as default:
+        Response()(response)
+    with pytest.raises(pydantic.ValidationError) as columnar:
+        Response(columnar=True)(response)
+    return default.value, columnar.value
+
+
+def test_columnar_matches_response_model():
+    columns = Response(columnar=True)(klines)
+    validated = Response()(klines)
+
+    assert isinstance(columns, KlineColumns)
+    assert columns.open_time.dtype == np.int64
+    assert columns.open_time.flags["C_CONTIGUOUS"]
+    assert columns.open_time.tolist() == [candle[0] for candle in validated]
+    assert columns.close.tolist() == [float(candle[4]) for candle in validated]
+    assert columns.trades.tolist() == [candle[8] for candle in validated]
+
+
+def test_columnar_with_full_response():
+    assert isinstance(BinanceFull(Response(columnar=True))(klines), Ok)
+
+
+def test_columnar_invalid_arity():
+    response = copy.deepcopy(klines)
+    response[2] = response[2][:11]
+
+    default, columnar = _errors(response)
+    assert type(default) is type(columnar)
+    assert columnar.model is default.model
+    assert columnar.errors()[0]["loc"] == ("data", 2)
+
+
+def test_columnar_invalid_value():
+    response = copy.deepcopy(klines)
+    response[3][4] = "not a price"
+
+    default, columnar = _errors(response)
+    assert columnar.errors()[0]["loc"] == default.errors()[0]["loc"] == ("data", 3, 4)
+
+
+def test_columnar_negative_value():
+    response = copy.deepcopy(klines)
+    response[1][8] = -1
+
+    default, columnar = _errors(response)
+    assert columnar.errors()[0]["loc"] == default.errors()[0]["loc"] == ("data", 1, 8)
+
+
+def test_columnar_open_time_not_monotonic():
+    response = copy.deepcopy(klines)
+    response[4][0] = response[3][0]
+
+    with pytest.raises(pydantic.ValidationError) as e:
+        Response(columnar=True)(response)
+    assert e.value.errors()[0]["loc"] == ("data", 4, 0)
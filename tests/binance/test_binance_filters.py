@@ -0,0 +1,143 @@
+import json
+import os
+from decimal import Decimal
+
+import pydantic
+import pytest
+
+from crypto_dom.path import APP_PATH
+from crypto_dom.binance.filters import FilterEngine, FilterError, SymbolFilters
+from crypto_dom.binance.spot_account import new_order
+
+
+with open(os.path.join(APP_PATH, "binance", "_data_symbols.json")) as file:
+    SYMBOLS_DATA = json.load(file)
+
+ENGINE = FilterEngine.from_exchange_info({"symbols": SYMBOLS_DATA})
+
+
+FILTERS = [
+    {"filterType": "PRICE_FILTER", "minPrice": "0.00000100", "maxPrice": "922327.00000000", "tickSize": "0.00000100"},
+    {"filterType": "PERCENT_PRICE", "multiplierUp": "5", "multiplierDown": "0.2", "avgPriceMins": 5},
+    {"filterType": "LOT_SIZE", "minQty": "0.00100000", "maxQty": "100000.00000000", "stepSize": "0.00100000"},
+    {"filterType": "MIN_NOTIONAL", "minNotional": "0.00010000", "applyToMarket": True, "avgPriceMins": 5},
+    {"filterType": "ICEBERG_PARTS", "limit": 10},
+    {"filterType": "MARKET_LOT_SIZE", "minQty": "0.00000000", "maxQty": "1033.78930576", "stepSize": "0.00000000"},
+]
+
+
+@pytest.fixture
+def filters():
+    return SymbolFilters("ETHBTC", FILTERS)
+
+
+def _limit(price, quantity, **kwargs):
+    return {"symbol": "ETHBTC", "side": "BUY", "type": "LIMIT", "price": price, "quantity": quantity, **kwargs}
+
+
+def test_compiled_units(filters):
+    assert filters.price_decimals == 6
+    assert filters.qty_decimals == 8
+    assert (filters.price.min, filters.price.step) == (1, 1)
+    assert (filters.lot.min, filters.lot.step) == (100_000, 100_000)
+
+
+def test_check_passes(filters):
+    filters.check(_limit("0.031234", "1.5"))
+    filters.check(_limit(Decimal("0.031234"), Decimal("1.500")), avg_price="0.031")
+
+
+@pytest.mark.parametrize("order, avg_price, filter_type", [
+    (_limit("0.0312345", "1.5"), None, "PRICE_FILTER"),
+    (_limit("1000000", "1.5"), None, "PRICE_FILTER"),
+    (_limit("0.031234", "1.5005"), None, "LOT_SIZE"),
+    (_limit("0.031234", "0.0001"), None, "LOT_SIZE"),
+    (_limit("0.000010", "1"), None, "MIN_NOTIONAL"),
+    (_limit("0.5", "1"), "0.031", "PERCENT_PRICE"),
+    (_limit("0.031234", "1.5", icebergQty="0.1"), None, "ICEBERG_PARTS"),
+    ({"symbol": "ETHBTC", "type": "MARKET", "quantity": "2000"}, None, "MARKET_LOT_SIZE"),
+    ({"symbol": "ETHBTC", "type": "MARKET", "quantity": "0.001"}, "0.031", "MIN_NOTIONAL"),
+])
+def test_check_fails(filters, order, avg_price, filter_type):
+    with pytest.raises(FilterError) as e:
+        filters.check(order, avg_price)
+    assert filter_type in [f for f, _ in e.value.violations]
+
+
+def test_quantize(filters):
+    assert filters.quantize("0.0312344", "1.23456") == (Decimal("0.031234"), Decimal("1.234"))
+    assert filters.quantize_price("0.0312345", "up") == Decimal("0.031235")
+    assert filters.quantize_price("0.0312345", "down") == Decimal("0.031234")
+    price, qty = filters.quantize("0.0312345", "1.23456")
+    filters.check(_limit(price, qty))
+
+
+def test_quantize_grid(filters):
+    np = pytest.importorskip("numpy")
+
+    prices = np.linspace(0.03, 0.032, 101) + 1e-7
+    grid = filters.quantize_grid(prices, 0.0123456, rounding="down")
+
+    for price, qty, valid in zip(grid.prices, grid.quantities, grid.valid):
+        assert valid
+        filters.check(_limit(f"{price:.6f}", f"{qty:.8f}"))
+
+    expected = [filters.quantize(f"{p:.10f}", "0.0123456", "down") for p in prices]
+    assert [(Decimal(f"{p:.6f}"), Decimal(f"{q:.8f}")) for p, q in zip(grid.prices, grid.quantities)] == expected
+
+    grid = filters.quantize_grid([0.00001, 0.03], [1, 0.0001])
+    assert grid.valid.tolist() == [False, False]
+
+
+@pytest.mark.parametrize("rounding", ["down", "up", "nearest"])
+def test_quantize_grid_matches_quantize(filters, rounding):
+    np = pytest.importorskip("numpy")
+
+    rng = np.random.default_rng(0)
+    prices = np.array([round(p, d) for p, d in zip(rng.uniform(0.001, 10, 2000), rng.integers(4, 9, 2000))])
+    quantities = np.array([round(q, d) for q, d in zip(rng.uniform(0.001, 100, 2000), rng.integers(2, 9, 2000))])
+    # on the grid
+    prices[:100] = np.round(prices[:100], 6)
+    quantities[:100] = np.round(quantities[:100], 3)
+
+    grid = filters.quantize_grid(prices, quantities, rounding=rounding)
+
+    for p, q, grid_p, grid_q in zip(prices, quantities, grid.prices, grid.quantities):
+        price, qty = filters.quantize(repr(float(p)), repr(float(q)), rounding)
+        assert (Decimal(f"{grid_p:.6f}"), Decimal(f"{grid_q:.8f}")) == (price, qty)
+
+    assert filters.quantize_grid([0.0312349], [1.2349], "down").prices.tolist() == [0.031234]
+    assert filters.quantize_grid([0.0312341], [1.2349], "up").prices.tolist() == [0.031235]
+
+
+def test_engine_from_exchange_info():
+    assert len(ENGINE) == len(SYMBOLS_DATA)
+    ENGINE.check(_limit("0.031234", "1.5"))
+    with pytest.raises(FilterError):
+        ENGINE.check(_limit("0.0312345", "1.5"))
+
+
+def test_engine_from_symbol_store():
+    from crypto_dom.symbol_store import SymbolStore, BINANCE_SYMBOLS
+
+    with SymbolStore(BINANCE_SYMBOLS) as store:
+        engine = FilterEngine.from_symbol_store(store)
+
+    for symbol in ("ETHBTC", "BTCUSDT", "DOTUSDT"):
+        assert (engine[symbol].price.step, engine[symbol].lot.step, engine[symbol].min_notional) == \
+            (ENGINE[symbol].price.step, ENGINE[symbol].lot.step, ENGINE[symbol].min_notional)
+
+
+def test_new_order_hook():
+    order = _limit("0.0312345", "1.5", timeInForce="GTC", timestamp=1_600_000_000_000)
+
+    new_order.set_filter_engine(ENGINE)
+    try:
+        with pytest.raises(pydantic.ValidationError) as e:
+            new_order.Request(**order)
+        assert "PRICE_FILTER" in str(e.value)
+        new_order.Request(**{**order, "price": "0.031234"})
+    finally:
+        new_order.set_filter_engine(None)
+
+    new_order.Request(**order)
@@ -0,0 +1,104 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from crypto_dom.client import HttypeClient
+from crypto_dom.binance.rate_limit import RateLimiter, get_weight, parse_usage_headers
+from crypto_dom.binance.market_data import depth, historical_trades, exchange_info
+from crypto_dom.binance.spot_account import new_order, open_orders, query_all_oco
+
+
+def test_endpoint_weights():
+    assert get_weight(historical_trades.METHOD, historical_trades.URL) == 5
+    assert get_weight(query_all_oco.METHOD, query_all_oco.URL) == 10
+    assert get_weight(depth.METHOD, depth.URL) == 1
+    assert get_weight(depth.METHOD, depth.URL, {"symbol": "BTCUSDT", "limit": 1000}) == 10
+    assert get_weight(depth.METHOD, f"{depth.URL}?symbol=BTCUSDT", {"limit": 5000}) == 50
+    assert get_weight(open_orders.METHOD, open_orders.URL, {"symbol": "BTCUSDT"}) == 1
+    assert get_weight(open_orders.METHOD, open_orders.URL, {}) == 40
+    assert get_weight("GET", "https://api.binance.com/api/v3/unknown") == 1
+
+
+def test_costs_and_exchange_info():
+    content = {
+        "rateLimits": [
+            {"rateLimitType": "REQUEST_WEIGHT", "interval": "MINUTE", "intervalNum": 1, "limit": 1200},
+            {"rateLimitType": "ORDERS", "interval": "SECOND", "intervalNum": 10, "limit": 100},
+        ]
+    }
+    limiter = RateLimiter.from_exchange_info(content)
+    assert [(b.rate_limit_type, b.capacity, b.period) for b in limiter.buckets] == [("REQUEST_WEIGHT", 1200, 60), ("ORDERS", 100, 10)]
+
+    model = exchange_info.Response()(timezone="UTC", serverTime=1_600_000_000_000, exchangeFilters=[], symbols=[], **content)
+    assert len(RateLimiter.from_exchange_info(model).buckets) == 2
+
+    assert limiter.costs(new_order.METHOD, new_order.URL) == {"REQUEST_WEIGHT": 1, "ORDERS": 1, "RAW_REQUEST": 1}
+    assert limiter.costs(depth.METHOD, depth.URL, {"limit": 500}) == {"REQUEST_WEIGHT": 5, "ORDERS": 0, "RAW_REQUEST": 1}
+
+
+@pytest.mark.asyncio
+async def test_requests_over_the_limit_are_queued():
+
+    # 10 weight per second, depth with limit 500 weighs 5
+    limiter = RateLimiter([("REQUEST_WEIGHT", "SECOND", 1, 10)])
+    sent = []
+
+    def handler(request):
+        sent.append(time.perf_counter())
+        return httpx.Response(200, json={"lastUpdateId": 1, "bids": [], "asks": []})
+
+    start = time.perf_counter()
+    async with HttypeClient.httpx(transport=httpx.MockTransport(handler), rate_limiter=limiter) as client:
+        results = await asyncio.gather(*(
+            client.safe_request(depth.METHOD, depth.URL, params={"symbol": "BTCUSDT", "limit": 500})
+            for _ in range(4)
+        ))
+
+    assert all(r.is_ok() for r in results)
+    # 2 requests are sent right away, the 2 others when the bucket has refilled
+    assert [round(t - start, 1) for t in sent] == [0.0, 0.0, 0.5, 1.0]
+    assert limiter.requests == 4 and limiter.delayed == 2
+
+
+@pytest.mark.asyncio
+async def test_over_the_limit():
+
+    # a request heavier than a limit could never be sent
+    limiter = RateLimiter([("REQUEST_WEIGHT", "SECOND", 1, 10)])
+    with pytest.raises(ValueError):
+        await limiter.acquire(depth.METHOD, depth.URL, {"limit": 5000})
+
+
+def test_parse_usage_headers():
+    headers = httpx.Headers({
+        "X-MBX-USED-WEIGHT-1M": "23",
+        "x-mbx-order-count-10s": "2",
+        "X-MBX-ORDER-COUNT-1D": "40",
+        "X-MBX-USED-WEIGHT": "23",
+        "Content-Type": "application/json",
+    })
+    assert parse_usage_headers(headers) == {"REQUEST_WEIGHT": {"1M": 23}, "ORDERS": {"10S": 2, "1D": 40}}
+
+
+@pytest.mark.asyncio
+async def test_usage_headers_sync_the_limiter():
+
+    limiter = RateLimiter()
+    weight, orders, _, _ = limiter.buckets
+    orders.debit(10)
+
+    # another process sharing the IP already used 1000 weight
+    def handler(request):
+        return httpx.Response(200, json={"mins": 5, "price": "1"}, headers={"X-MBX-USED-WEIGHT-1M": "1000", "X-MBX-ORDER-COUNT-10S": "0"})
+
+    async with HttypeClient.httpx(transport=httpx.MockTransport(handler), rate_limiter=limiter) as client:
+        r = await client.safe_request("GET", "https://api.binance.com/api/v3/avgPrice", params={"symbol": "BTCUSDT"})
+
+    assert r.value.rate_limit_usage == {"REQUEST_WEIGHT": {"1M": 1000}, "ORDERS": {"10S": 0}}
+    assert limiter.usage == r.value.rate_limit_usage
+
+    assert 200 <= weight.tokens < 201
+    # a usage lower than estimated locally does not raise the bucket
+    assert 90 <= orders.tokens < 91
@@ -0,0 +1,124 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+import timeit
+import typing
+from urllib.parse import urlencode, urlparse
+
+import pydantic
+import yaml
+
+from crypto_dom.kraken.market_data.asset_pairs import Response as AssetPairsResp, _AssetPair
+from crypto_dom.kraken.market_data.ticker import Response as TickerResp, _Ticker
+from crypto_dom.kraken.__sign import Signer, auth_headers
+
+
+CASSETTES = os.path.join(os.path.dirname(__file__), "cassettes", "test_kraken_response_models", "public")
+
+NUMBER = 200
+
+
+def _cassette_result(name: str) -> dict:
+    "decoded `result` of the first recorded response in the cassette"
+    with open(os.path.join(CASSETTES, name)) as file:
+        cassette = yaml.safe_load(file)
+    content = cassette["interactions"][0]["response"]["content"]
+    return json.loads(content)["result"]
+
+
+def _legacy_response(name: str, value_model: typing.Type[pydantic.BaseModel]):
+    "one field per key, model created on every call (previous implementation)"
+
+    def __call__(response: dict):
+        kwargs = {**{k: (value_model, ...) for k in response.keys()}, "__base__": pydantic.BaseModel}
+        model = pydantic.create_model(name, **kwargs)
+        return model(**response)
+
+    return __call__
+
+
+def _bench(result: dict, legacy, current) -> typing.Tuple[float, float]:
+    before = timeit.timeit(lambda: legacy(result), number=NUMBER) / NUMBER
+    after = timeit.timeit(lambda: current(result), number=NUMBER) / NUMBER
+    return before, after
+
+
+#------------------------------------------------------------
+# Ticker
+#------------------------------------------------------------
+
+
+def test_ticker_fixed_schema_benchmark():
+    result = _cassette_result("test_ticker_response_model.yaml")
+
+    legacy = _legacy_response("_TickerResponse", _Ticker)
+    current = TickerResp()
+
+    # same content, same attribute access
+    for pair in result:
+        assert getattr(current(result), pair) == getattr(legacy(result), pair)
+    assert current(result).dict() == legacy(result).dict()
+
+    before, after = _bench(result, legacy, current)
+    print(f"\nTicker per call: before {before*1e6:.1f}us - after {after*1e6:.1f}us")
+    assert after < before
+
+
+#------------------------------------------------------------
+# AssetPairs
+#------------------------------------------------------------
+
+
+def test_assetpairs_fixed_schema_benchmark():
+    result = _cassette_result("test_assetpairs_response_model.yaml")
+
+    legacy = _legacy_response("_AssetPairsResponse", _AssetPair)
+    current = AssetPairsResp()
+
+    for pair in result:
+        assert getattr(current(result), pair) == getattr(legacy(result), pair)
+    assert current(result).dict() == legacy(result).dict()
+
+    before, after = _bench(result, legacy, current)
+    print(f"\nAssetPairs per call: before {before*1e6:.1f}us - after {after*1e6:.1f}us")
+    assert after < before
+
+
+#------------------------------------------------------------
+# Signer
+#------------------------------------------------------------
+
+
+SIGN_NUMBER = 20000
+
+
+def _legacy_auth_headers(url, data, *, key, secret):
+    "secret decoded and HMAC keyed on every call (previous implementation)"
+
+    encoded_data = (str(data["nonce"]) + urlencode(data)).encode()
+    message = urlparse(url).path.encode() + hashlib.sha256(encoded_data).digest()
+    signature = hmac.new(base64.b64decode(secret), message, hashlib.sha512)
+    return {"API-Key": key, "API-Sign": base64.b64encode(signature.digest()).decode()}
+
+
+def test_signer_benchmark():
+    url = "https://api.kraken.com/0/private/AddOrder"
+    key, secret = "key", base64.b64encode(b"secret" * 10).decode()
+    data = {"nonce": 1616492376594, "ordertype": "limit", "type": "buy", "volume": "1.25", "pair": "XXBTZUSD", "price": "37500.0"}
+
+    signer = Signer(key, secret)
+    _, body, headers = signer.sign("POST", url, data)
+    assert body == urlencode(data).encode()
+    assert headers["API-Sign"] == _legacy_auth_headers(url, data, key=key, secret=secret)["API-Sign"]
+    assert signer(url, data) == auth_headers(url, data, key=key, secret=secret)
+
+    # the body was encoded again by the client
+    legacy = lambda: (_legacy_auth_headers(url, data, key=key, secret=secret), urlencode(data).encode())
+    current = lambda: signer.sign("POST", url, data)
+
+    before = timeit.timeit(legacy, number=SIGN_NUMBER)
+    after = timeit.timeit(current, number=SIGN_NUMBER)
+    print(f"\nKraken signs per second: before {SIGN_NUMBER/before:.0f} - after {SIGN_NUMBER/after:.0f}")
+    assert after < before
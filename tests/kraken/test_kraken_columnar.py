@@ -0,0 +1,101 @@
+import copy
+import json
+import os
+
+import pydantic
+import pytest
+import yaml
+
+np = pytest.importorskip("numpy")
+
+from crypto_dom.result import Ok, Err
+from crypto_dom.kraken import KrakenFullResponse
+from crypto_dom.kraken.market_data.ohlc import ColumnarResponse, Response
+
+
+CASSETTE = os.path.join(
+    os.path.dirname(__file__), "cassettes", "test_kraken_response_models", "public", "test_ohlc_response_model.yaml"
+)
+
+with open(CASSETTE) as file:
+    full_response = json.loads(yaml.safe_load(file)["interactions"][0]["response"]["content"])
+
+pair = "XXBTZUSD"
+
+
+def test_columnar_matches_response_model():
+    result = full_response["result"]
+
+    columns = ColumnarResponse()(result)
+    validated = getattr(Response()(result), pair)
+
+    assert columns.pair == pair
+    assert columns.last == result["last"]
+    assert len(columns.candles) == len(validated)
+    assert columns.candles.dtype.names == ("time", "open", "high", "low", "close", "vwap", "volume", "count")
+    assert columns.candles["time"].tolist() == [candle[0] for candle in validated]
+    assert columns.candles["close"].tolist() == [float(candle[4]) for candle in validated]
+    assert columns.candles["count"].tolist() == [candle[7] for candle in validated]
+
+
+def test_columnar_scaled_prices():
+    result = full_response["result"]
+    columns = ColumnarResponse(price_decimals=1)(result)
+
+    assert columns.candles["open"].dtype == np.int64
+    assert columns.candles["open"].tolist() == [round(float(candle[1]) * 10) for candle in result[pair]]
+
+
+def test_columnar_with_full_response():
+    assert isinstance(KrakenFullResponse(ColumnarResponse())(full_response), Ok)
+
+
+@pytest.mark.parametrize("row, col, value, loc", [
+    (3, 2, "not a price", (pair, 3, 2)),
+    (4, 6, "-1.0", (pair, 4, 6)),
+    (5, 0, 946684800, (pair, 5, 0)),        # year 2000
+    (6, 7, -2, (pair, 6, 7)),
+])
+def test_columnar_invalid_values(row, col, value, loc):
+    result = copy.deepcopy(full_response["result"])
+    result[pair][row][col] = value
+
+    with pytest.raises(pydantic.ValidationError) as e:
+        ColumnarResponse()(result)
+
+    assert e.value.errors()[0]["loc"] == loc
+
+
+def test_columnar_invalid_arity():
+    result = copy.deepcopy(full_response["result"])
+    result[pair][10] = result[pair][10][:7]
+
+    with pytest.raises(pydantic.ValidationError) as e:
+        ColumnarResponse()(result)
+
+    assert e.value.errors()[0]["loc"] == (pair, 10)
+
+
+def test_columnar_invalid_last():
+    result = copy.deepcopy(full_response["result"])
+    result["last"] = 946684800
+
+    assert isinstance(KrakenFullResponse(ColumnarResponse())({"error": [], "result": result}), Err)
+
+
+@pytest.mark.parametrize("last", [946684800, 10**20, -1])
+def test_columnar_last_out_of_range(last):
+    result = copy.deepcopy(full_response["result"])
+    result["last"] = last
+
+    with pytest.raises(pydantic.ValidationError) as e:
+        ColumnarResponse()(result)
+
+    assert e.value.errors()[0]["loc"] == ("last",)
+
+
+def test_columnar_large_count():
+    result = copy.deepcopy(full_response["result"])
+    result[pair][0][7] = 2**40
+
+    assert ColumnarResponse()(result).candles["count"][0] == 2**40
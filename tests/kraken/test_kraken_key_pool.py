@@ -0,0 +1,77 @@
+import asyncio
+import base64
+import time
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+
+from crypto_dom.client import HttypeClient
+from crypto_dom.kraken import KrakenFullResponse
+from crypto_dom.kraken.key_pool import KeyPool
+from crypto_dom.kraken.rate_limit import RateLimiter
+from crypto_dom.kraken.user_data import ledgers, account_balance
+
+
+SECRET = base64.b64encode(b"secret").decode()
+KEYS = [("key-a", SECRET), ("key-b", SECRET)]
+
+
+def _client(sent, invalid=()):
+
+    def handler(request):
+        key = request.headers["API-Key"]
+        nonce = int(parse_qs(request.content.decode())["nonce"][0])
+        sent.append((key, nonce, time.perf_counter()))
+        if key in invalid:
+            return httpx.Response(200, json={"error": ["EAPI:Invalid key"]})
+        return httpx.Response(200, json={"error": [], "result": {"ZUSD": "1.0"}})
+
+    return HttypeClient.httpx(transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.asyncio
+async def test_calls_are_spread_across_keys():
+
+    # a ledgers call costs 2: one call per key before the counters have to decay
+    pool = KeyPool(KEYS, limiter=RateLimiter(max_counter=2, decay=10))
+    sent = []
+
+    start = time.perf_counter()
+    async with _client(sent) as client:
+        results = await asyncio.gather(*(
+            pool.safe_request(client, ledgers.METHOD, "https://api.kraken.com/0/private/Ledgers", data={"asset": "all"})
+            for _ in range(4)
+        ))
+
+    assert all(r.is_ok() for r in results)
+    assert sorted(key for key, _, _ in sent) == ["key-a", "key-a", "key-b", "key-b"]
+    # 2 calls at once, then 2 once the counters have decayed (0.2s), instead of 0.6s with a single key
+    assert [round(t - start, 1) for _, _, t in sent] == [0.0, 0.0, 0.2, 0.2]
+
+    # nonces are strictly increasing per key
+    for key in ("key-a", "key-b"):
+        nonces = [nonce for k, nonce, _ in sent if k == key]
+        assert nonces == sorted(set(nonces))
+
+
+@pytest.mark.asyncio
+async def test_invalid_keys_are_taken_out_of_rotation():
+
+    pool = KeyPool(KEYS)
+    sent = []
+
+    async with _client(sent, invalid=["key-a"]) as client:
+        for _ in range(3):
+            r = await pool.safe_request(
+                client, account_balance.METHOD, account_balance.URL,
+                t_in=account_balance.Request, t_out=KrakenFullResponse(account_balance.Response()), data={}
+            )
+
+        assert r.value.safe_content.is_ok()
+        assert pool.active_keys == ["key-b"]
+        assert [key for key, _, _ in sent] == ["key-a", "key-b", "key-b"]
+
+        pool.disable("key-b")
+        r = await pool.safe_request(client, account_balance.METHOD, account_balance.URL, data={})
+        assert r.is_err()
@@ -0,0 +1,88 @@
+import threading
+
+import pytest
+
+from crypto_dom.kraken.market_data._model_cache import ModelCache, MODEL_CACHE, prewarm
+from crypto_dom.kraken.market_data.ohlc import Response as OhlcResp, _generate_model as _ohlc_model
+from crypto_dom.kraken.market_data.spread import Response as SpreadResp
+
+
+ohlc_data = {
+    "XETHXXBT": [
+        [1591475580, "0.02499", "0.02499", "0.02499", "0.02499", "0.00000", "0.00000000", 0],
+        [1591475640, "0.02500", "0.02500", "0.02500", "0.02500", "0.02500", "9.12201000", 5],
+    ],
+    "last": 1591517580,
+}
+
+spread_data = {
+    "XXBTZUSD": [
+        [1610997022, "35803.90000", "35804.10000"],
+    ],
+    "last": 1610997148,
+}
+
+
+def test_hit_returns_same_model():
+    cache = ModelCache()
+    cache.register("ohlc", _ohlc_model)
+
+    first = cache.get("ohlc", "XXBTZUSD")
+    second = cache.get("ohlc", "XXBTZUSD")
+
+    assert first is second
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_lru_eviction():
+    cache = ModelCache(maxsize=2)
+    cache.register("ohlc", _ohlc_model)
+
+    a = cache.get("ohlc", "AAA")
+    cache.get("ohlc", "BBB")
+    # touch AAA so BBB becomes the least recently used
+    cache.get("ohlc", "AAA")
+    cache.get("ohlc", "CCC")
+
+    assert ("ohlc", "AAA") in cache
+    assert ("ohlc", "BBB") not in cache
+    assert cache.stats()["evictions"] == 1
+    assert cache.get("ohlc", "AAA") is a
+
+
+def test_unregistered_endpoint():
+    with pytest.raises(KeyError):
+        ModelCache().get("ohlc", "XXBTZUSD")
+
+
+def test_concurrent_misses_build_one_model():
+    cache = ModelCache()
+    cache.register("ohlc", _ohlc_model)
+    models = []
+
+    def worker():
+        models.append(cache.get("ohlc", "XXBTZUSD"))
+
+    threads = [threading.Thread(target=worker) for _ in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(set(map(id, models))) == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_endpoints_share_cache():
+    MODEL_CACHE.clear()
+    prewarm(["XETHXXBT", "XXBTZUSD"])
+
+    assert MODEL_CACHE.stats()["misses"] == 8
+
+    ohlc = OhlcResp()(ohlc_data)
+    spread = SpreadResp()(spread_data)
+
+    assert type(ohlc) is MODEL_CACHE.get("ohlc", "XETHXXBT")
+    assert type(spread) is MODEL_CACHE.get("spread", "XXBTZUSD")
+    assert MODEL_CACHE.stats()["misses"] == 8
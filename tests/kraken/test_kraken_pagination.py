@@ -0,0 +1,170 @@
+import asyncio
+import base64
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+
+from crypto_dom.client import HttypeClient
+from crypto_dom.validation import ValidationPolicy
+from crypto_dom.kraken.key_pool import KeyPool
+from crypto_dom.kraken.pagination import Paginator
+from crypto_dom.kraken.rate_limit import RateLimiter
+from crypto_dom.kraken.user_data import ledgers, trades_history
+
+
+KEYS = [("key", base64.b64encode(b"secret").decode())]
+
+
+def _ledger_id(i: int) -> str:
+    return f"L{i:05d}-AAAAA-BBBBBB"
+
+
+def _entry(i: int) -> dict:
+    return {
+        "refid": "AOCR2X-MYSLM-2UEK5T", "time": 1600000000 + i, "type": "trade", "aclass": "currency",
+        "asset": "XXBT", "amount": "0.1", "fee": "0.0", "balance": "1.0"
+    }
+
+
+def _client(ledger_ids, added_after_first_page=()):
+    "newest first, 50 per page"
+
+    offsets = []
+
+    def handler(request):
+        ofs = int(parse_qs(request.content.decode())["ofs"][0])
+        offsets.append(ofs)
+        if len(offsets) == 2:
+            # records added while paging
+            ledger_ids[:0] = added_after_first_page
+        page = ledger_ids[ofs:ofs + 50]
+        return httpx.Response(200, json={"error": [], "result": {
+            "ledger": {i: _entry(n) for n, i in enumerate(page)},
+            "count": len(ledger_ids),
+        }})
+
+    return HttypeClient.httpx(transport=httpx.MockTransport(handler)), offsets
+
+
+@pytest.mark.asyncio
+async def test_pages_are_prefetched_and_deduplicated():
+
+    ledger_ids = [_ledger_id(i) for i in range(230, 0, -1)]
+    original = list(ledger_ids)
+    client, offsets = _client(ledger_ids, added_after_first_page=[_ledger_id(i) for i in range(233, 230, -1)])
+
+    pool = KeyPool(KEYS, limiter=RateLimiter(max_counter=100, decay=100), nonce_window=True)
+    paginator = Paginator(pool, client, ledgers.URL, prefetch=2)
+
+    yielded = []
+    async with client:
+        async for page in paginator:
+            assert page.is_ok()
+            yielded.extend(page.value)
+
+    # the 3 records added shifted the last pages, the count grew to 233
+    assert offsets[0] == 0 and sorted(offsets) == [0, 50, 100, 150, 200]
+    assert yielded == original
+    assert paginator.stats() == {"pages": 5, "records": 230, "duplicates": 3, "max_in_flight": 3}
+
+
+@pytest.mark.asyncio
+async def test_prefetch_stays_within_the_call_counters():
+
+    ledger_ids = [_ledger_id(i) for i in range(300, 0, -1)]
+    client, offsets = _client(ledger_ids)
+
+    # ledgers calls cost 2: once the first page is counted, room for 2 calls at a time
+    pool = KeyPool(KEYS, limiter=RateLimiter(max_counter=6, decay=40), nonce_window=True)
+    paginator = Paginator(pool, client, ledgers.URL, prefetch=5)
+
+    async with client:
+        pages = [page async for page in paginator]
+
+    assert len(pages) == 6 and sum(len(page.value) for page in pages) == 300
+    assert paginator.max_in_flight == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("n_keys", [1, 2])
+async def test_nonces_reach_kraken_in_order(n_keys):
+
+    keys = [(f"key-{i}", KEYS[0][1]) for i in range(n_keys)]
+    ledger_ids = [_ledger_id(i) for i in range(300, 0, -1)]
+    last_nonces = {}
+    arrivals = iter([0.03, 0.0, 0.02, 0.01, 0.0, 0.03, 0.0])
+
+    async def handler(request):
+        # network delays: calls sent together may arrive out of order
+        await asyncio.sleep(next(arrivals, 0.0))
+        body = parse_qs(request.content.decode())
+        key, nonce, ofs = request.headers["API-Key"], int(body["nonce"][0]), int(body["ofs"][0])
+        if nonce <= last_nonces.get(key, 0):
+            return httpx.Response(200, json={"error": ["EAPI:Invalid nonce"]})
+        last_nonces[key] = nonce
+        page = ledger_ids[ofs:ofs + 50]
+        return httpx.Response(200, json={"error": [], "result": {
+            "ledger": {i: _entry(n) for n, i in enumerate(page)}, "count": len(ledger_ids)
+        }})
+
+    pool = KeyPool(keys, limiter=RateLimiter(max_counter=100, decay=100))
+    paginator = Paginator(pool, HttypeClient.httpx(transport=httpx.MockTransport(handler)), ledgers.URL, prefetch=3)
+
+    async with paginator.client:
+        pages = [page async for page in paginator]
+
+    assert all(page.is_ok() for page in pages)
+    assert sum(len(page.value) for page in pages) == 300
+    assert paginator.max_in_flight == n_keys
+
+
+def _trade(i: int) -> dict:
+    return {
+        "ordertxid": "OQCLML-BW3P3-BUCMWZ", "postxid": "TKH2SE-M7IF5-CFI7LT", "pair": "XXBTZUSD",
+        "time": 1600000000 + i, "type": "buy", "ordertype": "limit", "price": "10000.0", "cost": "1000.0",
+        "fee": "1.6", "vol": "0.1", "margin": "0.0", "misc": ""
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("validation", ["trusted", "sampled"])
+@pytest.mark.parametrize("module, field, record", [(ledgers, "ledger", _entry), (trades_history, "trades", _trade)])
+async def test_pages_built_without_validation(validation, module, field, record):
+
+    ids = [_ledger_id(i) for i in range(120, 0, -1)]
+
+    def handler(request):
+        ofs = int(parse_qs(request.content.decode())["ofs"][0])
+        page = ids[ofs:ofs + 50]
+        return httpx.Response(200, json={"error": [], "result": {
+            field: {i: record(n) for n, i in enumerate(page)}, "count": len(ids)
+        }})
+
+    client = HttypeClient.httpx(transport=httpx.MockTransport(handler))
+    pool = KeyPool(KEYS, limiter=RateLimiter(max_counter=100, decay=100), nonce_window=True)
+    policy = ValidationPolicy(validation)
+    paginator = Paginator(pool, client, module.URL, validation=policy)
+
+    yielded = []
+    async with client:
+        async for page in paginator:
+            assert page.is_ok()
+            yielded.extend(page.value)
+
+    assert yielded == ids
+    # sampled: only the first of the 3 pages is validated
+    assert policy.skipped == (3 if validation == "trusted" else 2)
+
+
+@pytest.mark.asyncio
+async def test_errors_end_the_iteration():
+
+    client = HttypeClient.httpx(transport=httpx.MockTransport(
+        lambda request: httpx.Response(200, json={"error": ["EGeneral:Invalid arguments"]})
+    ))
+
+    async with client:
+        pages = [page async for page in Paginator(KeyPool(KEYS), client, ledgers.URL)]
+
+    assert len(pages) == 1 and pages[0].is_err()
@@ -0,0 +1,70 @@
+import json
+from decimal import Decimal
+
+import pydantic
+import pytest
+
+from crypto_dom.kraken.pairs import PairIndex, get_index, DATA_ASSETPAIRS
+from crypto_dom.kraken.market_data.asset_pairs import Response
+from crypto_dom.kraken.user_trading import add_order
+
+
+with open(DATA_ASSETPAIRS) as file:
+    DATA = json.load(file)
+
+
+def _order(**kwargs):
+    return {"pair": "XXBTZUSD", "type": "buy", "ordertype": "limit", "price": "43210.1", "volume": "0.5", "nonce": 1, **kwargs}
+
+
+def test_lookups():
+    index = get_index()
+    assert index is get_index()
+    assert len(index) == len(DATA)
+
+    info = index["XXBTZUSD"]
+    assert index["XBTUSD"] is info
+    assert index["XBT/USD"] is info
+    assert (info.base, info.quote) == ("XXBT", "ZUSD")
+    assert info.pair_decimals == DATA["XXBTZUSD"]["pair_decimals"]
+    assert info.ordermin == Decimal(DATA["XXBTZUSD"]["ordermin"])
+    assert "NOTAPAIR" not in index
+
+    assert info in index.pairs_for(base="XXBT")
+    assert info in index.pairs_for(quote="ZUSD")
+    assert [p.pair for p in index.pairs_for(base="XXBT", quote="ZUSD")] == ["XXBTZUSD", "XXBTZUSD.d"]
+    assert all(p.base == "XXBT" for p in index.pairs_for(base="XXBT"))
+
+
+def test_from_validated_response():
+    index = PairIndex.from_response(Response()(DATA))
+    assert index["XBT/USD"].lot_decimals == DATA["XXBTZUSD"]["lot_decimals"]
+
+
+def test_quantize():
+    info = get_index()["XXBTZUSD"]
+    price, volume = info.quantize("43210.16", "0.123456789")
+    assert price == Decimal("43210.2")
+    assert volume == Decimal("0.12345678")
+    assert info.quantize_price("43210.16", "down") == Decimal("43210.1")
+    assert info.errors(price, volume) == []
+    assert len(info.errors("43210.16", "0.123456789")) == 2
+    assert info.errors(volume="0.00001")
+
+
+def test_add_order_hook():
+    index = get_index()
+
+    add_order.set_pair_index(index)
+    try:
+        with pytest.raises(pydantic.ValidationError):
+            add_order.Request(**_order(price="43210.16"))
+        add_order.Request(**_order())
+
+        add_order.set_pair_index(index, quantize=True)
+        request = add_order.Request(**_order(price="43210.16", volume="0.123456789"))
+        assert (request.price, request.volume) == (Decimal("43210.2"), Decimal("0.12345678"))
+    finally:
+        add_order.set_pair_index(None)
+
+    assert add_order.Request(**_order(price="43210.16")).price == Decimal("43210.16")
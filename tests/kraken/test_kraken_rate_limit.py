@@ -0,0 +1,70 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from crypto_dom.client import HttypeClient
+from crypto_dom.kraken.rate_limit import RateLimiter
+from crypto_dom.kraken.market_data import ticker
+from crypto_dom.kraken.user_data import account_balance, trades_history
+from crypto_dom.kraken.user_trading import add_order
+
+
+KEY = {"API-Key": "key", "API-Sign": "sign"}
+OTHER_KEY = {"API-Key": "other", "API-Sign": "sign"}
+
+
+def test_costs():
+    limiter = RateLimiter()
+    assert (limiter.max_counter, limiter.decay) == (15, 0.33)
+    assert RateLimiter("pro", max_counter=30).max_counter == 30
+
+    assert limiter.cost(account_balance.URL) == 1
+    assert limiter.cost(trades_history.URL) == 2
+    assert limiter.cost(add_order.URL) == 0
+    assert limiter.cost(ticker.URL) == 0
+
+    with pytest.raises(ValueError):
+        RateLimiter("unknown")
+
+
+@pytest.mark.asyncio
+async def test_calls_are_scheduled_per_key():
+
+    # counter decays by 10 per second
+    limiter = RateLimiter(max_counter=4, decay=10)
+    sent = []
+
+    def handler(request):
+        sent.append((request.headers["API-Key"], time.perf_counter()))
+        return httpx.Response(200, json={"error": [], "result": {}})
+
+    start = time.perf_counter()
+    async with HttypeClient.httpx(transport=httpx.MockTransport(handler), rate_limiter=limiter) as client:
+        await asyncio.gather(
+            *(client.safe_request("POST", trades_history.URL, headers=KEY) for _ in range(3)),
+            client.safe_request("POST", trades_history.URL, headers=OTHER_KEY),
+        )
+
+    delays = [(key, round(t - start, 1)) for key, t in sent]
+    # the 3rd call of `key` waits for the counter to decay from 4 to 2
+    assert sorted(delays) == [("key", 0.0), ("key", 0.0), ("key", 0.2), ("other", 0.0)]
+
+    assert 3 < limiter.counter("key") <= 4
+    stats = limiter.stats()["key..."]
+    assert stats["requests"] == 3 and stats["delayed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_public_and_trading_calls_are_not_limited():
+
+    limiter = RateLimiter(max_counter=1, decay=0.01)
+
+    assert await limiter.acquire("GET", ticker.URL) == 0
+    for _ in range(5):
+        assert await limiter.acquire("POST", add_order.URL, headers=KEY) == 0
+    assert limiter.counter("key") == 0
+
+    with pytest.raises(ValueError):
+        await limiter.acquire("POST", trades_history.URL, headers=KEY)
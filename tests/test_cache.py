@@ -0,0 +1,130 @@
+import asyncio
+import json
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from crypto_dom.cache import ResponseCache, cache_key
+from crypto_dom.client import HttypeClient
+from crypto_dom.result import Ok, Err
+from crypto_dom.kraken import KrakenFullResponse
+from crypto_dom.kraken.market_data.asset_pairs import Response
+from crypto_dom.kraken.pairs import DATA_ASSETPAIRS
+
+
+with open(DATA_ASSETPAIRS) as file:
+    BODY = json.dumps({"error": [], "result": json.load(file)}).encode()
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _app(hits: list):
+
+    async def pairs(request):
+        hits.append("pairs")
+        return web.Response(body=BODY, content_type="application/json")
+
+    async def error(request):
+        hits.append("error")
+        return web.Response(body=b'{"error": ["EGeneral:Internal error"]}', content_type="application/json")
+
+    app = web.Application()
+    app.router.add_get("/0/public/AssetPairs", pairs)
+    app.router.add_get("/0/public/Error", error)
+    return app
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", [HttypeClient.httpx, HttypeClient.aiohttp])
+async def test_ttl_and_stale_while_revalidate(backend):
+
+    hits = []
+    clock = Clock()
+
+    async with TestServer(_app(hits)) as server:
+        url = str(server.make_url("/0/public/AssetPairs"))
+        cache = ResponseCache(ttls={url: 10}, stale_ttl=5, clock=clock)
+
+        async with backend(cache=cache) as client:
+            get = lambda: client.safe_request("GET", url, t_out=KrakenFullResponse(Response()))
+
+            first = await get()
+            assert first.is_ok() and first.value.safe_content.is_ok()
+
+            # fresh: same validated result, no request
+            clock.now = 9
+            assert await get() is first
+            assert hits == ["pairs"]
+
+            # stale: returned as is, refreshed in the background
+            clock.now = 12
+            assert await get() is first
+            await asyncio.sleep(0.1)
+            assert hits == ["pairs", "pairs"]
+            refreshed = await get()
+            assert refreshed is not first
+
+            # expired: refetched before returning
+            clock.now = 100
+            assert await get() is not refreshed
+            assert hits == ["pairs", "pairs", "pairs"]
+
+    assert cache.stats() == {
+        "size": 1, "hits": 2, "stale_hits": 1, "misses": 2, "disk_hits": 0, "hit_ratio": 0.6,
+        "refreshes": 1, "refresh_errors": 0, "evictions": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_errors_and_uncached_endpoints():
+
+    hits = []
+
+    async with TestServer(_app(hits)) as server:
+        url = str(server.make_url("/0/public/AssetPairs"))
+        error_url = str(server.make_url("/0/public/Error"))
+        cache = ResponseCache(ttls={error_url: 10})
+
+        async with HttypeClient.httpx(cache=cache) as client:
+            for _ in range(2):
+                r = await client.safe_request("GET", error_url, t_out=KrakenFullResponse(Response()))
+                assert isinstance(r.value.safe_content, Err)
+                # no TTL for this endpoint
+                await client.safe_request("GET", url, t_out=KrakenFullResponse(Response()))
+
+    assert hits == ["error", "pairs"] * 2
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction():
+
+    cache = ResponseCache(default_ttl=10, maxsize=2)
+
+    async def send(value):
+        return Ok(value)
+
+    for name in ("a", "b", "a", "c"):
+        await cache.get_or_fetch((name,), name, lambda: send(name))
+
+    # "b" was the least recently used
+    assert [key for key, in cache._entries] == ["a", "c"]
+    assert cache.evictions == 1
+
+
+def test_cache_key_ignores_signing_params():
+
+    one = cache_key("GET", "u", {"timestamp": 1, "signature": "x", "recvWindow": 5000}, {"X-MBX-APIKEY": "key"}, None)
+    two = cache_key("get", "u", {"timestamp": 2, "signature": "y", "recvWindow": 5000}, {"X-MBX-APIKEY": "key"}, None)
+    other = cache_key("GET", "u", {"timestamp": 2, "signature": "y"}, {"X-MBX-APIKEY": "other"}, None)
+
+    assert one == two
+    assert one != other
@@ -0,0 +1,81 @@
+import asyncio
+import json
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from crypto_dom.client import HttypeClient
+from crypto_dom.kraken import KrakenFullResponse
+from crypto_dom.kraken.market_data.asset_pairs import Response, Request, METHOD
+from crypto_dom.kraken.pairs import DATA_ASSETPAIRS
+
+
+with open(DATA_ASSETPAIRS) as file:
+    BODY = json.dumps({"error": [], "result": json.load(file)}).encode()
+
+BACKENDS = [HttypeClient.httpx, HttypeClient.aiohttp]
+
+
+def _app(hits: list):
+
+    async def handler(request):
+        hits.append(request.query_string)
+        # keep the first request in flight while the others are sent
+        await asyncio.sleep(0.05)
+        return web.Response(body=BODY, content_type="application/json")
+
+    app = web.Application()
+    app.router.add_get("/0/public/AssetPairs", handler)
+    app.router.add_post("/0/public/AssetPairs", handler)
+    return app
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", BACKENDS)
+async def test_concurrent_gets_are_coalesced(backend):
+
+    hits = []
+    async with TestServer(_app(hits)) as server:
+        url = str(server.make_url("/0/public/AssetPairs"))
+        async with backend(coalesce=True) as client:
+            results = await asyncio.gather(*(
+                client.safe_request(METHOD, url, t_in=Request, t_out=KrakenFullResponse(Response()), params={"pair": ["XXBTZUSD"], "info": "info"})
+                for _ in range(10)
+            ))
+            # different parameters are a different request
+            other = await client.safe_request(METHOD, url, t_in=Request, t_out=KrakenFullResponse(Response()), params={"pair": ["XETHZUSD"], "info": "info"})
+
+    assert len(hits) == 2
+    assert all(r.is_ok() for r in results), results
+    assert len({id(r.value) for r in results}) == 1
+    assert results[0].value.safe_content.is_ok()
+    assert other.is_ok() and other.value is not results[0].value
+    assert client.coalescer.stats() == {"requests": 2, "coalesced": 9, "in_flight": 0}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", BACKENDS)
+async def test_no_coalescing(backend):
+
+    hits = []
+    async with TestServer(_app(hits)) as server:
+        url = str(server.make_url("/0/public/AssetPairs"))
+        async with backend(coalesce=True) as client:
+            await asyncio.gather(
+                # opt out per request
+                client.safe_request("GET", url, t_out=KrakenFullResponse(Response()), coalesce=False),
+                client.safe_request("GET", url, t_out=KrakenFullResponse(Response()), coalesce=False),
+                # signed and non GET requests are never coalesced
+                client.safe_request("GET", url, t_out=KrakenFullResponse(Response()), auth_headers={"API-Key": "key"}),
+                client.safe_request("GET", url, t_out=KrakenFullResponse(Response()), auth_headers={"API-Key": "key"}),
+                client.safe_request("POST", url, t_out=KrakenFullResponse(Response())),
+                client.safe_request("POST", url, t_out=KrakenFullResponse(Response())),
+            )
+
+        # disabled by default
+        async with backend() as client:
+            await asyncio.gather(*(client.safe_request("GET", url, t_out=KrakenFullResponse(Response())) for _ in range(2)))
+
+    assert len(hits) == 8
+    assert client.coalescer.stats()["coalesced"] == 0
@@ -0,0 +1,91 @@
+import json
+
+import aiohttp
+import httpx
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from crypto_dom.client import HttypeClient
+from crypto_dom.decoders import get_decoder
+from crypto_dom.kraken import KrakenFullResponse
+from crypto_dom.kraken.market_data.asset_pairs import Response, URL, METHOD
+from crypto_dom.kraken.pairs import DATA_ASSETPAIRS
+
+
+# offline: responses are served from the AssetPairs json data
+
+
+with open(DATA_ASSETPAIRS, "rb") as file:
+    BODY = b'{"error": [], "result": ' + file.read() + b"}"
+
+
+def _mock_transport():
+    return httpx.MockTransport(lambda request: httpx.Response(200, content=BODY, headers={"Content-Type": "application/json"}))
+
+
+def _has_orjson():
+    try:
+        import orjson
+    except ImportError:
+        return False
+    return True
+
+
+def test_get_decoder():
+    assert get_decoder("stdlib")(b'{"a": 1}') == {"a": 1}
+    assert get_decoder("orjson" if _has_orjson() else "stdlib")(b'{"a": 1}') == {"a": 1}
+    assert get_decoder(len)(b"abc") == 3
+    with pytest.raises(ValueError):
+        get_decoder("yaml")
+
+
+DECODERS = ["stdlib", lambda body: json.loads(body.decode())]
+if _has_orjson():
+    DECODERS.append("orjson")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("decoder", DECODERS)
+async def test_httpx_decoder(decoder):
+
+    async with HttypeClient.httpx(transport=_mock_transport(), decoder=decoder) as client:
+        r = await client.safe_request(METHOD, URL, t_out=KrakenFullResponse(Response()))
+
+    assert r.is_ok(), r.value
+    assert r.value.decode_time > 0
+    assert r.value.safe_content.is_ok()
+    assert "XXBTZUSD" in r.value.safe_content.value
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("decoder", DECODERS)
+async def test_aiohttp_decoder(decoder):
+
+    async def handler(request):
+        return web.Response(body=BODY, content_type="application/json")
+
+    app = web.Application()
+    app.router.add_get("/0/public/AssetPairs", handler)
+
+    async with TestServer(app) as server:
+        async with HttypeClient.aiohttp(decoder=decoder) as client:
+            r = await client.safe_request(METHOD, str(server.make_url("/0/public/AssetPairs")), t_out=KrakenFullResponse(Response()))
+
+    assert r.is_ok(), r.value
+    assert r.value.decode_time > 0
+    assert r.value.safe_content.is_ok()
+    assert "XXBTZUSD" in r.value.safe_content.value
+
+
+@pytest.mark.asyncio
+async def test_decode_error():
+
+    def failing(body):
+        raise ValueError("not json")
+
+    async with HttypeClient.httpx(transport=_mock_transport(), decoder=failing) as client:
+        r = await client.safe_request(METHOD, URL)
+
+    assert r.is_err()
+    assert isinstance(r.value, ValueError)
@@ -0,0 +1,133 @@
+import asyncio
+import concurrent.futures
+import gc
+import json
+import os
+import time
+from decimal import Decimal
+
+import httpx
+import pytest
+
+from crypto_dom.client import HttypeClient
+from crypto_dom.path import APP_PATH
+from crypto_dom.validation import ValidationPolicy
+from crypto_dom.binance import BinanceFull
+from crypto_dom.binance.market_data import exchange_info, average_price
+
+
+# offline: a large exchangeInfo response (1505 symbols) and a small averagePrice response
+# are served by a mock transport, the large one takes ~50ms to decode and validate
+#
+# Note: compiled pydantic holds the GIL while validating, so a thread pool
+# shortens loop stalls without removing them
+
+
+with open(os.path.join(APP_PATH, "binance", "_data_symbols.json")) as file:
+    LARGE = json.dumps({
+        "timezone": "UTC",
+        "serverTime": 1_600_000_000_000,
+        "rateLimits": [],
+        "exchangeFilters": [],
+        "symbols": json.load(file),
+    }).encode()
+
+SMALL = b'{"mins": 5, "price": "9.35751834"}'
+
+SMALL_URL = "https://api.binance.com/api/v3/avgPrice"
+
+
+def _handler(request):
+    body = SMALL if str(request.url).startswith(SMALL_URL) else LARGE
+    return httpx.Response(200, content=body)
+
+
+async def _loop_stall(done: asyncio.Event) -> float:
+    "longest time the event loop was blocked while `done` is not set"
+
+    stall = 0.0
+    while not done.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        stall = max(stall, time.perf_counter() - start - 0.001)
+    return stall
+
+
+async def _run(**client_kwargs):
+    "(max loop stall, small request latency, large response) with a large and a small request running concurrently"
+
+    done = asyncio.Event()
+    stall = asyncio.create_task(_loop_stall(done))
+
+    async with HttypeClient.httpx(transport=httpx.MockTransport(_handler), **client_kwargs) as client:
+
+        # the small request is scheduled 20ms after the large one, while it is being processed
+        start = time.perf_counter() + 0.02
+
+        async def small():
+            await asyncio.sleep(start - time.perf_counter())
+            r = await client.safe_request("GET", SMALL_URL, t_out=BinanceFull(average_price.Response()), params={"symbol": "BTCUSDT"})
+            return r, time.perf_counter() - start
+
+        large = client.safe_request(exchange_info.METHOD, exchange_info.URL, t_out=BinanceFull(exchange_info.Response()))
+        large_result, (small_result, small_latency) = await asyncio.gather(large, small())
+
+    done.set()
+    assert small_result.is_ok() and small_result.value.safe_content.is_ok()
+    return await stall, small_latency, large_result
+
+
+@pytest.mark.asyncio
+async def test_offload_keeps_loop_responsive():
+
+    # collections of the heap left by other tests hold the GIL, wherever decoding runs
+    gc.collect()
+    gc.disable()
+    try:
+        inline_stall, inline_latency, inline = await _run()
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            offload_stall, offload_latency, offloaded = await _run(offload_threshold=64 * 1024, executor=executor)
+    finally:
+        gc.enable()
+
+    print(f"\nLoop stall: inline {inline_stall*1000:.1f}ms - offloaded {offload_stall*1000:.1f}ms")
+    print(f"Small request latency: inline {inline_latency*1000:.1f}ms - offloaded {offload_latency*1000:.1f}ms")
+
+    # same awaitable result
+    assert inline.is_ok() and offloaded.is_ok()
+    assert inline.value.safe_content.value == offloaded.value.safe_content.value
+
+    assert offload_stall < inline_stall / 2
+    assert offload_latency < inline_latency / 2
+
+
+@pytest.mark.asyncio
+async def test_offload_to_process_pool():
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=1) as executor:
+        async with HttypeClient.httpx(transport=httpx.MockTransport(_handler), offload_threshold=0, executor=executor) as client:
+            raw = await client.safe_request("GET", SMALL_URL)
+            validated = await client.safe_request("GET", SMALL_URL, t_out=BinanceFull(average_price.Response(), validation="sampled"))
+
+    assert raw.is_ok()
+    assert raw.value.safe_content == {"mins": 5, "price": "9.35751834"}
+    assert validated.is_ok()
+    assert validated.value.safe_content.value.price == Decimal("9.35751834")
+
+
+@pytest.mark.asyncio
+async def test_sampled_validation_in_process_pool():
+
+    policy = ValidationPolicy("sampled", sample_every=3)
+    t_out = BinanceFull(average_price.Response(), validation=policy)
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=2) as executor:
+        async with HttypeClient.httpx(transport=httpx.MockTransport(_handler), offload_threshold=0, executor=executor) as client:
+            results = [await client.safe_request("GET", SMALL_URL, t_out=t_out) for _ in range(6)]
+
+    assert all(r.value.safe_content.is_ok() for r in results)
+    # sampled here, not once per worker copy
+    assert policy.stats() == {"mode": "sampled", "validated": 2, "failed": 0, "skipped": 4}
+    assert type(results[0].value.safe_content.value.price) is Decimal
+    assert type(results[1].value.safe_content.value.price) is str
@@ -0,0 +1,65 @@
+import base64
+
+import httpx
+import pytest
+
+from crypto_dom.client import HttypeClient
+from crypto_dom.kraken import KrakenFullResponse
+from crypto_dom.kraken.__sign import Signer as KrakenSigner, auth_headers
+from crypto_dom.kraken.user_data import account_balance
+from crypto_dom.binance.__sign import Signer as BinanceSigner, auth_payload, auth_signature
+
+
+@pytest.mark.asyncio
+async def test_signed_bytes_are_sent():
+
+    sent = []
+
+    def handler(request):
+        sent.append(request)
+        if "kraken" in request.url.host:
+            return httpx.Response(200, json={"error": [], "result": {"ZUSD": "1.0"}})
+        return httpx.Response(200, json=[])
+
+    secret = base64.b64encode(b"secret").decode()
+    kraken_signer = KrakenSigner("key", secret)
+    binance_signer = BinanceSigner("key", "secret")
+
+    async with HttypeClient.httpx(transport=httpx.MockTransport(handler)) as client:
+        r = await client.safe_request(
+            account_balance.METHOD, account_balance.URL,
+            t_in=account_balance.Request, t_out=KrakenFullResponse(account_balance.Response()),
+            data={"nonce": 1616492376594}, signer=kraken_signer
+        )
+        assert r.value.safe_content.is_ok()
+
+        url = "https://api.binance.com/api/v3/openOrders"
+        r = await client.safe_request("GET", url, params={"symbol": "BTCUSDT", "timestamp": 1499827319559}, signer=binance_signer)
+        assert r.is_ok()
+
+    kraken, binance = sent
+    assert kraken.content == b"nonce=1616492376594"
+    assert kraken.headers["API-Sign"] == auth_headers(account_balance.URL, {"nonce": 1616492376594}, key="key", secret=secret)["API-Sign"]
+    assert kraken.headers["Content-Type"] == "application/x-www-form-urlencoded"
+
+    query = binance_signer.sign("GET", url, {"symbol": "BTCUSDT", "timestamp": 1499827319559})[0].split("?", 1)[1]
+    assert binance.url.query.decode() == query
+    assert binance.headers["X-MBX-APIKEY"] == "key"
+
+
+def test_binance_signer_appends_to_a_query_string():
+
+    signer = BinanceSigner("key", "secret")
+    data = {"symbol": "BTCUSDT", "timestamp": 1499827319559}
+
+    url, body, _ = signer.sign("GET", "https://api.binance.com/api/v3/openOrders?recvWindow=5000", data)
+    assert body is None
+    assert url.startswith("https://api.binance.com/api/v3/openOrders?recvWindow=5000&symbol=BTCUSDT&")
+    assert url.count("?") == 1
+
+    # the signature covers the whole query string
+    query = "recvWindow=5000&symbol=BTCUSDT&timestamp=1499827319559"
+    assert url.endswith(f"&signature={auth_signature('', {'recvWindow': 5000, **data}, secret='secret')}")
+    assert url.split("?", 1)[1].startswith(query)
+
+    assert auth_payload("", data, secret="secret")[-1] == ("signature", auth_signature("", data, secret="secret"))
@@ -0,0 +1,127 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from crypto_dom.cache import ResponseCache
+from crypto_dom.client import HttypeClient
+from crypto_dom.disk_cache import DiskCache
+from crypto_dom.result import Ok
+from crypto_dom.kraken import KrakenFullResponse
+from crypto_dom.kraken.market_data.asset_pairs import Response
+from crypto_dom.kraken.pairs import DATA_ASSETPAIRS
+
+
+with open(DATA_ASSETPAIRS) as file:
+    BODY = json.dumps({"error": [], "result": json.load(file)}).encode()
+
+
+# cold start of a new process, the exchange (local stand-in server) is down:
+# the first request is served from disk, the background refresh fails
+COLD_START = textwrap.dedent("""
+    import asyncio, json, sys
+
+    from crypto_dom.cache import ResponseCache
+    from crypto_dom.client import HttypeClient
+    from crypto_dom.disk_cache import DiskCache
+    from crypto_dom.kraken import KrakenFullResponse
+    from crypto_dom.kraken.market_data.asset_pairs import Response
+
+    directory, url = sys.argv[1:]
+
+    async def main():
+        cache = ResponseCache(ttls={url: 300}, disk=DiskCache(directory, max_ages={url: 3600}))
+        async with HttypeClient.httpx(cache=cache) as client:
+            r = await client.safe_request("GET", url, t_out=KrakenFullResponse(Response()))
+            await asyncio.sleep(0.2)
+        content = r.value.safe_content.value
+        print(json.dumps({
+            "from_disk": r.value.from_disk,
+            "pair_decimals": content["XXBTZUSD"].pair_decimals,
+            "cache": cache.stats(),
+        }))
+
+    asyncio.run(main())
+""")
+
+
+@pytest.mark.asyncio
+async def test_cold_start_without_network(tmp_path):
+
+    hits = []
+
+    async def pairs(request):
+        hits.append(request.path)
+        return web.Response(body=BODY, content_type="application/json")
+
+    app = web.Application()
+    app.router.add_get("/0/public/AssetPairs", pairs)
+
+    # first process: fetched from the exchange, written to disk
+    async with TestServer(app) as server:
+        url = str(server.make_url("/0/public/AssetPairs"))
+        disk = DiskCache(str(tmp_path), max_ages={url: 3600})
+        cache = ResponseCache(ttls={url: 300}, disk=disk)
+
+        async with HttypeClient.httpx(cache=cache) as client:
+            r = await client.safe_request("GET", url, t_out=KrakenFullResponse(Response()))
+            assert r.is_ok() and r.value.safe_content.is_ok()
+            await asyncio.sleep(0.2)
+
+    assert hits == ["/0/public/AssetPairs"]
+    assert disk.stats() == {"loads": 0, "stores": 1, "errors": 0}
+
+    # new process
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    out = subprocess.run([sys.executable, "-c", COLD_START, str(tmp_path), url], capture_output=True, env=env, timeout=60)
+    assert out.returncode == 0, out.stderr.decode()
+
+    result = json.loads(out.stdout)
+    assert result["from_disk"] is True
+    assert result["pair_decimals"] == 1
+    assert result["cache"]["disk_hits"] == 1
+    assert result["cache"]["misses"] == 0
+    assert result["cache"]["refresh_errors"] == 1
+    assert hits == ["/0/public/AssetPairs"]
+
+
+class _Response:
+    status_code = 200
+    safe_content = Ok({"XXBTZUSD": 1})
+
+
+def test_expired_corrupted_and_unselected(tmp_path):
+
+    url = "https://api.kraken.com/0/public/AssetPairs"
+    key = ("GET", url)
+    disk = DiskCache(str(tmp_path), max_ages={url: 3600})
+
+    assert disk.load(key, url) is None
+    assert disk.store(key, url, Ok(_Response()))
+    r = disk.load(key, url)
+    assert r.value.safe_content == Ok({"XXBTZUSD": 1}) and r.value.from_disk
+
+    # endpoints without a max age are not persisted
+    assert not disk.store(key, "https://api.kraken.com/0/public/Ticker", Ok(_Response()))
+
+    # the max age is read from the header of the file
+    DiskCache(str(tmp_path), max_ages={url: -1}).store(key, url, Ok(_Response()))
+    assert disk.load(key, url) is None
+
+    disk.store(key, url, Ok(_Response()))
+    with open(disk.path(key), "r+b") as file:
+        file.seek(-1, os.SEEK_END)
+        last = file.read(1)[0]
+        file.seek(-1, os.SEEK_END)
+        file.write(bytes([last ^ 0xFF]))
+    assert disk.load(key, url) is None
+    assert disk.errors == 1
+
+    disk.clear()
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,103 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+# import time of a fresh interpreter, as reported by `python -X importtime`
+# (self and cumulative times in microseconds, one line per imported module)
+
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+# time spent in crypto_dom modules themselves, third party imports excluded
+BUDGET_MS = 50
+
+ENDPOINTS = [
+    "crypto_dom.kraken.market_data.ohlc",
+    "crypto_dom.kraken.user_trading.add_order",
+    "crypto_dom.binance.market_data.klines",
+    "crypto_dom.binance.spot_account.new_order",
+]
+
+
+def _importtime(statement: str):
+    "[(module, self_us, cumulative_us)] for a fresh interpreter running `statement`"
+
+    env = {**os.environ, "PYTHONPATH": SRC}
+    env.pop("CRYPTO_DOM_STACKPRINTER", None)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        env=env, capture_output=True, text=True, check=True
+    )
+
+    report = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        report.append((module.strip(), int(self_us), int(cumulative_us)))
+    return report
+
+
+def _own_ms(report) -> float:
+    return sum(self_us for module, self_us, _ in report if module.startswith("crypto_dom")) / 1000
+
+
+def _print_report(name, report, top=10):
+    total = report[-1][2] / 1000
+    print(f"\nimport {name}: total {total:.1f}ms - crypto_dom {_own_ms(report):.1f}ms")
+    for module, self_us, cumulative_us in sorted(report, key=lambda r: r[2], reverse=True)[:top]:
+        print(f"    {cumulative_us / 1000:8.2f}ms  {module}")
+
+
+def test_packages_are_lazy():
+    statement = (
+        "import sys, crypto_dom, crypto_dom.kraken, crypto_dom.binance;"
+        "print(','.join(m for m in ('pydantic', 'stackprinter', 'numpy') if m in sys.modules))"
+    )
+    env = {**os.environ, "PYTHONPATH": SRC}
+    env.pop("CRYPTO_DOM_STACKPRINTER", None)
+    out = subprocess.run([sys.executable, "-c", statement], env=env, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == ""
+
+
+def test_client_does_not_load_exchange_definitions():
+    statement = (
+        "import sys, crypto_dom.client;"
+        "print(','.join(m for m in sys.modules if m.endswith('definitions') and m.startswith('crypto_dom.')))"
+    )
+    env = {**os.environ, "PYTHONPATH": SRC}
+    env.pop("CRYPTO_DOM_STACKPRINTER", None)
+    out = subprocess.run([sys.executable, "-c", statement], env=env, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == ""
+
+
+def test_lazy_attribute_access():
+    import crypto_dom.kraken
+    import crypto_dom.binance
+
+    from crypto_dom.kraken._response import KrakenFullResponse
+    from crypto_dom.binance._response import BinanceFull
+
+    assert crypto_dom.kraken.KrakenFullResponse is KrakenFullResponse
+    assert crypto_dom.binance.BinanceFull is BinanceFull
+    assert crypto_dom.kraken.market_data.ohlc.URL == "https://api.kraken.com/0/public/OHLC"
+    assert "ohlc" in dir(crypto_dom.kraken.market_data)
+
+    with pytest.raises(AttributeError):
+        crypto_dom.kraken.not_an_endpoint
+
+
+@pytest.mark.parametrize("module", ENDPOINTS)
+def test_endpoint_import_time(module):
+
+    statement = f"import sys, {module}; assert 'stackprinter' not in sys.modules and 'numpy' not in sys.modules"
+
+    # first run compiles the bytecode, keep the best of the next runs
+    _importtime(statement)
+    report = min((_importtime(statement) for _ in range(3)), key=_own_ms)
+
+    _print_report(module, report)
+    assert _own_ms(report) < BUDGET_MS
@@ -0,0 +1,57 @@
+import multiprocessing
+
+import pytest
+
+from crypto_dom.nonce import NonceGenerator
+
+
+def test_nonces_are_strictly_increasing_per_key():
+
+    nonces = NonceGenerator(clock=lambda: 1_600_000_000_123_456_789)
+
+    assert [nonces.next("a") for _ in range(3)] == [1_600_000_000_123, 1_600_000_000_124, 1_600_000_000_125]
+    assert nonces.next("b") == 1_600_000_000_123
+    assert nonces.stats()["bumped"] == 2
+
+    assert NonceGenerator("us", clock=lambda: 1_600_000_000_123_456_789).next() == 1_600_000_000_123_456
+
+    with pytest.raises(ValueError):
+        NonceGenerator("s")
+
+
+def _draw(directory, n, queue):
+    nonces = NonceGenerator("us", directory=directory)
+    queue.put([nonces.next("key") for _ in range(n)])
+
+
+def test_shared_nonces_are_unique_across_processes(tmp_path):
+
+    queue = multiprocessing.get_context("spawn").Queue()
+    processes = [
+        multiprocessing.get_context("spawn").Process(target=_draw, args=(str(tmp_path), 500, queue))
+        for _ in range(4)
+    ]
+    for p in processes:
+        p.start()
+    drawn = [queue.get(timeout=30) for _ in processes]
+    for p in processes:
+        p.join()
+
+    for sequence in drawn:
+        assert sequence == sorted(sequence)
+    every = [nonce for sequence in drawn for nonce in sequence]
+    assert len(set(every)) == len(every) == 2000
+    assert NonceGenerator("us", directory=str(tmp_path)).last("key") == max(every)
+
+
+def test_shared_nonces_survive_a_restart(tmp_path):
+
+    nonces = NonceGenerator(directory=str(tmp_path), clock=lambda: 2_000_000_000_000_000_000)
+    last = nonces.next("key")
+    nonces.close()
+
+    # restarted with a clock that went back
+    restarted = NonceGenerator(directory=str(tmp_path), clock=lambda: 1_000_000_000_000_000_000)
+    assert restarted.last("key") == last
+    assert restarted.next("key") == last + 1
+    assert restarted.next("other") == 1_000_000_000_000
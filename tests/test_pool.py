@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from crypto_dom.pool import PoolManager
+
+
+# offline: requests go to a local server, which answers after `DELAY` seconds
+
+
+DELAY = 0.05
+
+
+def _app():
+    async def handler(request):
+        await asyncio.sleep(DELAY)
+        return web.json_response({"error": [], "result": {"unixtime": 1616336594}})
+
+    app = web.Application()
+    app.router.add_get("/0/public/Time", handler)
+    return app
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["httpx", "aiohttp"])
+async def test_connections_are_reused(backend):
+
+    async with TestServer(_app()) as server:
+        url = str(server.make_url("/0/public/Time"))
+
+        async with PoolManager(backend=backend) as manager:
+            client = manager.client(url)
+            assert manager.client(url) is client
+
+            for _ in range(10):
+                r = await client.safe_request("GET", url)
+                assert r.is_ok(), r.value
+                assert r.value.safe_content["result"]["unixtime"] == 1616336594
+
+            stats = manager.stats()[manager.host(url)]
+
+    assert stats["requests"] == 10
+    assert stats["connections"] == 1
+    assert stats["reuse_ratio"] == 0.9
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["httpx", "aiohttp"])
+async def test_max_connections_and_wait_time(backend):
+
+    async with TestServer(_app()) as server:
+        url = str(server.make_url("/0/public/Time"))
+
+        async with PoolManager(backend=backend, max_connections=2) as manager:
+            client = manager.client(url)
+            results = await asyncio.gather(*(client.safe_request("GET", url) for _ in range(6)))
+            stats = manager.stats()[manager.host(url)]
+
+    assert all(r.is_ok() for r in results)
+    assert stats["connections"] == 2
+    # 3 rounds of 2 concurrent requests
+    assert stats["wait_time"] >= DELAY
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["httpx", "aiohttp"])
+async def test_prewarm(backend):
+
+    async with TestServer(_app()) as server:
+        url = str(server.make_url("/0/public/Time"))
+
+        async with PoolManager(backend=backend) as manager:
+            await manager.prewarm([url], connections=3)
+            assert manager.stats()[manager.host(url)]["connections"] == 3
+
+            client = manager.client(url)
+            await asyncio.gather(*(client.safe_request("GET", url) for _ in range(3)))
+            stats = manager.stats()[manager.host(url)]
+
+    # no new connection after prewarm
+    assert stats["connections"] == 3
+    assert stats["requests"] == 6
+
+
+def test_invalid_options():
+    with pytest.raises(ValueError):
+        PoolManager(backend="requests")
+    with pytest.raises(ValueError):
+        PoolManager(backend="aiohttp", http2=True)
@@ -0,0 +1,169 @@
+import asyncio
+
+import httpx
+import pytest
+
+from crypto_dom.client import HttypeClient
+from crypto_dom.result import Ok, Err
+from crypto_dom.retry import RetryPolicy, classify
+from crypto_dom.binance import BinanceFull
+from crypto_dom.binance.market_data import average_price
+from crypto_dom.binance.spot_account import new_order
+from crypto_dom.kraken import KrakenFullResponse
+from crypto_dom.kraken.market_data import ticker
+from crypto_dom.kraken.user_trading import add_order
+
+
+def _policy(**kwargs):
+    delays = []
+
+    async def sleep(delay):
+        delays.append(delay)
+
+    return RetryPolicy(sleep=sleep, **kwargs), delays
+
+
+def _client(responses, policy):
+    "mock client sending `responses` in order, a response is (status, json, headers) or an exception"
+
+    sent = []
+
+    def handler(request):
+        response = responses[min(len(sent), len(responses) - 1)]
+        sent.append(request)
+        if isinstance(response, Exception):
+            raise response
+        status, content, headers = response
+        return httpx.Response(status, json=content, headers=headers)
+
+    return HttypeClient.httpx(transport=httpx.MockTransport(handler), retry_policy=policy), sent
+
+
+KRAKEN_OK = (200, {"error": [], "result": {}}, {})
+BINANCE_PRICE = (200, {"mins": 5, "price": "1.5"}, {})
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("response, t_out, decision", [
+    ((200, {"error": ["EAPI:Rate limit exceeded"]}, {}), KrakenFullResponse(ticker.Response()), "retry"),
+    ((200, {"error": ["EAPI:Invalid nonce"]}, {}), KrakenFullResponse(ticker.Response()), "retry"),
+    ((200, {"error": ["EGeneral:Temporary lockout"]}, {}), KrakenFullResponse(ticker.Response()), "retry"),
+    ((500, {"error": ["EGeneral:Internal error"]}, {}), KrakenFullResponse(ticker.Response()), "retry_idempotent"),
+    ((200, {"error": ["EOrder:Insufficient funds"]}, {}), KrakenFullResponse(ticker.Response()), "fatal"),
+    ((429, {"code": -1003, "msg": "Too many requests"}, {"Retry-After": "3"}), BinanceFull(average_price.Response()), "retry"),
+    ((400, {"code": -1021, "msg": "Timestamp outside of the recvWindow"}, {}), BinanceFull(average_price.Response()), "retry"),
+    ((503, {"code": -1007, "msg": "Timeout waiting for response"}, {}), BinanceFull(average_price.Response()), "retry_idempotent"),
+    ((400, {"code": -1121, "msg": "Invalid symbol"}, {}), BinanceFull(average_price.Response()), "fatal"),
+    ((502, {}, {}), None, "retry_idempotent"),
+    ((404, {}, {}), None, "fatal"),
+    (BINANCE_PRICE, BinanceFull(average_price.Response()), "success"),
+    (httpx.ConnectError("refused"), None, "retry"),
+    (httpx.ReadTimeout("timeout"), None, "retry_idempotent"),
+])
+async def test_classify(response, t_out, decision):
+
+    client, _ = _client([response], None)
+    async with client:
+        r = await client.safe_request("GET", average_price.URL, t_out=t_out)
+
+    classification = classify(r)
+    assert classification.decision == decision, classification
+    if decision == "retry" and not isinstance(response, Exception) and response[0] == 429:
+        assert classification.retry_after == 3
+
+
+@pytest.mark.asyncio
+async def test_retries_with_backoff_and_retry_after():
+
+    policy, delays = _policy(max_attempts=4, base_delay=1)
+    client, sent = _client([(502, {}, {}), (429, {"code": -1003, "msg": "Too many requests"}, {"Retry-After": "7"}), BINANCE_PRICE], policy)
+
+    async with client:
+        r = await client.safe_request("GET", average_price.URL, t_out=BinanceFull(average_price.Response()))
+
+    assert r.value.safe_content.is_ok()
+    assert len(sent) == 3
+    assert 0 <= delays[0] <= 1 and delays[1] == 7
+    assert policy.stats() == {
+        "retries": 2, "gave_up": 0, "budget_exhausted": 0, "retry_after_exceeded": 0,
+        "reasons": {"http 502": 1, "http 429": 1}
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status, retry_after", [(418, "7200"), (429, "31")])
+async def test_retry_after_longer_than_max_delay_is_not_waited(status, retry_after):
+
+    policy, delays = _policy(max_attempts=4, max_delay=30)
+    client, sent = _client([(status, {"code": -1003, "msg": "Way too many requests"}, {"Retry-After": retry_after}), BINANCE_PRICE], policy)
+
+    async with client:
+        r = await client.safe_request("GET", average_price.URL, t_out=BinanceFull(average_price.Response()))
+
+    assert r.value.status_code == status
+    assert len(sent) == 1 and delays == []
+    assert policy.stats()["retry_after_exceeded"] == 1
+    assert policy.delay(1, retry_after=7200) == 30
+
+
+@pytest.mark.asyncio
+async def test_coalesced_requests_are_retried():
+
+    policy, delays = _policy(max_attempts=3)
+    client, sent = _client([(503, {}, {}), BINANCE_PRICE], policy)
+    client.coalesce = True
+
+    async with client:
+        results = await asyncio.gather(*(
+            client.safe_request("GET", average_price.URL, params={"symbol": "BTCUSDT"}, t_out=BinanceFull(average_price.Response()))
+            for _ in range(3)
+        ))
+
+    # one request, retried once, shared by the 3 callers
+    assert len(sent) == 2
+    assert all(r.value.safe_content.is_ok() for r in results)
+    assert policy.stats()["retries"] == 1
+    assert client.coalescer.stats()["coalesced"] == 2
+
+
+@pytest.mark.asyncio
+async def test_orders_are_not_retried_blindly():
+
+    policy, _ = _policy()
+
+    # the order may have been placed
+    client, sent = _client([(500, {"error": ["EGeneral:Internal error"]}, {}), KRAKEN_OK], policy)
+    async with client:
+        r = await client.safe_request(add_order.METHOD, add_order.URL, t_out=KrakenFullResponse(add_order.Response()), headers={"API-Key": "key"})
+    assert len(sent) == 1
+    assert classify(r).decision == "retry_idempotent"
+
+    # the order was not processed
+    client, sent = _client([(200, {"error": ["EOrder:Rate limit exceeded"]}, {}), KRAKEN_OK], policy)
+    async with client:
+        await client.safe_request(add_order.METHOD, add_order.URL, t_out=KrakenFullResponse(add_order.Response()))
+    assert len(sent) == 2
+
+    client, sent = _client([httpx.ReadTimeout("timeout"), BINANCE_PRICE], policy)
+    async with client:
+        await client.safe_request(new_order.METHOD, new_order.URL)
+    assert len(sent) == 1
+
+    assert policy.is_idempotent(new_order.METHOD, f"{new_order.URL}?symbol=BTCUSDT") is False
+    assert policy.is_idempotent("GET", new_order.URL) is True
+
+
+@pytest.mark.asyncio
+async def test_attempts_and_budget():
+
+    policy, _ = _policy(max_attempts=3, budget=3)
+    client, sent = _client([(503, {}, {})], policy)
+
+    async with client:
+        await client.safe_request("GET", average_price.URL)
+        assert len(sent) == 3
+        await client.safe_request("GET", average_price.URL)
+
+    # 2 retries for the first request, 1 left in the budget of the endpoint for the second
+    assert len(sent) == 5
+    assert (policy.retries, policy.gave_up, policy.budget_exhausted) == (3, 1, 1)
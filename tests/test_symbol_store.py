@@ -0,0 +1,96 @@
+import json
+import os
+from decimal import Decimal
+
+import pytest
+
+from crypto_dom.path import APP_PATH
+from crypto_dom.symbol_store import SymbolStore, write_store, BINANCE_SYMBOLS, KRAKEN_PAIRS
+from crypto_dom.binance.__write_symbols import _write_binance_symbols_store
+from crypto_dom.kraken.__write_assetpairs import _write_kraken_pairs_store
+
+
+with open(os.path.join(APP_PATH, "binance", "_data_symbols.json")) as file:
+    BINANCE_DATA = json.load(file)
+
+with open(os.path.join(APP_PATH, "kraken", "_data_assetpairs.json")) as file:
+    KRAKEN_DATA = json.load(file)
+
+
+def test_binance_store_matches_json(tmp_path):
+    filename = str(tmp_path / "symbols.bin")
+    _write_binance_symbols_store(filename, BINANCE_DATA)
+
+    with SymbolStore(filename) as store:
+        assert len(store) == len(BINANCE_DATA)
+        assert list(store) == [s["symbol"] for s in BINANCE_DATA]
+
+        for symbol_data in BINANCE_DATA:
+            record = store[symbol_data["symbol"]]
+            filters = {f["filterType"]: f for f in symbol_data["filters"]}
+
+            assert record["status"] == symbol_data["status"]
+            assert record["baseAsset"] == symbol_data["baseAsset"]
+            assert record["quoteAsset"] == symbol_data["quoteAsset"]
+            assert record["baseAssetPrecision"] == symbol_data["baseAssetPrecision"]
+            assert record["ocoAllowed"] is symbol_data["ocoAllowed"]
+            assert record["tickSize"] == Decimal(filters["PRICE_FILTER"]["tickSize"])
+            assert record["stepSize"] == Decimal(filters["LOT_SIZE"]["stepSize"])
+            assert record["minNotional"] == Decimal(filters["MIN_NOTIONAL"]["minNotional"])
+            assert record["icebergParts"] == filters["ICEBERG_PARTS"]["limit"]
+
+            if "MARKET_LOT_SIZE" in filters:
+                assert record["marketMaxQty"] == Decimal(filters["MARKET_LOT_SIZE"]["maxQty"])
+            else:
+                assert record["marketMaxQty"] is None
+
+
+def test_kraken_store_matches_json(tmp_path):
+    filename = str(tmp_path / "pairs.bin")
+    _write_kraken_pairs_store(filename, KRAKEN_DATA)
+
+    with SymbolStore(filename) as store:
+        assert len(store) == len(KRAKEN_DATA)
+        for pair, data in KRAKEN_DATA.items():
+            assert store.field(pair, "altname") == data["altname"]
+            assert store.field(pair, "base") == data["base"]
+            assert store.field(pair, "pair_decimals") == data["pair_decimals"]
+            assert store.field(pair, "wsname") == data.get("wsname")
+
+
+def test_lookups(tmp_path):
+    filename = str(tmp_path / "store.bin")
+    rows = [
+        {"name": "A", "base": "X", "size": "0.1", "count": 3},
+        {"name": "B", "base": "Y", "size": None},
+        {"name": "C", "base": "X", "size": "10", "count": -4},
+    ]
+    write_store(filename, "test", "name", [("name", "str"), ("base", "asset"), ("size", "dec"), ("count", "i64")], rows)
+
+    with SymbolStore(filename) as store:
+        assert store.kind == "test"
+        assert store["A"] == {"name": "A", "base": "X", "size": Decimal("0.1"), "count": 3}
+        assert store["B"] == {"name": "B", "base": "Y", "size": None, "count": None}
+        assert store.field("C", "count") == -4
+        assert "D" not in store
+        assert store.get("D") is None
+        with pytest.raises(KeyError):
+            store["D"]
+
+
+def test_invalid_store(tmp_path):
+    with pytest.raises(ValueError):
+        write_store(str(tmp_path / "dup.bin"), "test", "name", [("name", "str")], [{"name": "A"}, {"name": "A"}])
+
+    filename = tmp_path / "invalid.bin"
+    filename.write_bytes(b"NOPE" + bytes(60))
+    with pytest.raises(ValueError):
+        SymbolStore(str(filename))
+
+
+@pytest.mark.parametrize("filename", [BINANCE_SYMBOLS, KRAKEN_PAIRS])
+def test_shipped_stores(filename):
+    with SymbolStore(filename) as store:
+        assert len(store) > 0
+        key = next(iter(store))
+        assert store[key][store.key] == key
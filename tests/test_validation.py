@@ -0,0 +1,113 @@
+import copy
+import json
+import os
+
+import pydantic
+import pytest
+import yaml
+
+from crypto_dom.result import Ok, Err
+from crypto_dom.validation import ValidationPolicy
+from crypto_dom.kraken import KrakenFullResponse
+from crypto_dom.kraken.market_data.ticker import Response as TickerResp, _Ticker
+from crypto_dom.kraken.market_data.ohlc import Response as OhlcResp
+from crypto_dom.binance import BinanceFull
+from crypto_dom.binance.market_data.exchange_info import Response as ExchInfoResp, _SymbolsInfo
+from crypto_dom.binance.market_data.trades import Response as TradesResp
+
+
+TESTS = os.path.dirname(__file__)
+
+
+def _cassette_json(exchange: str, name: str):
+    path = os.path.join(TESTS, exchange, "cassettes", f"test_{exchange}_response_models", "public", name)
+    with open(path) as file:
+        return json.loads(yaml.safe_load(file)["interactions"][0]["response"]["content"])
+
+
+kraken_ticker = _cassette_json("kraken", "test_ticker_response_model.yaml")
+kraken_ohlc = _cassette_json("kraken", "test_ohlc_response_model.yaml")
+binance_exchange_info = _cassette_json("binance", "test_exchange_info_response_model.yaml")
+binance_trades = _cassette_json("binance", "test_trades_response_model.yaml")
+
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        ValidationPolicy("lenient")
+
+
+def test_strict_validates_every_response():
+    model = KrakenFullResponse(TickerResp())
+    for _ in range(3):
+        assert isinstance(model(kraken_ticker), Ok)
+
+    assert model.validation.stats() == {"mode": "strict", "validated": 3, "failed": 0, "skipped": 0}
+
+
+def test_trusted_builds_nested_models():
+    strict = KrakenFullResponse(TickerResp())(kraken_ticker).value
+    trusted = KrakenFullResponse(TickerResp(), validation="trusted")(kraken_ticker).value
+
+    assert trusted.keys() == strict.keys()
+    for pair in strict:
+        assert isinstance(getattr(trusted, pair), _Ticker)
+
+    info = BinanceFull(ExchInfoResp(), validation="trusted")(binance_exchange_info).value
+    assert isinstance(info.symbols[0], _SymbolsInfo)
+    assert info.symbols[0].symbol == binance_exchange_info["symbols"][0]["symbol"]
+
+
+@pytest.mark.parametrize("full_model, response_model, payload", [
+    (KrakenFullResponse, OhlcResp, kraken_ohlc),
+    (BinanceFull, TradesResp, binance_trades),
+])
+def test_sampled_validates_one_in_n(full_model, response_model, payload):
+    model = full_model(response_model(), validation=ValidationPolicy("sampled", sample_every=5))
+    for _ in range(20):
+        assert isinstance(model(payload), Ok)
+
+    assert model.validation.stats() == {"mode": "sampled", "validated": 4, "failed": 0, "skipped": 16}
+
+
+def test_sampled_catches_schema_drift():
+    policy = ValidationPolicy("sampled", sample_every=3)
+    model = KrakenFullResponse(TickerResp(), validation=policy)
+
+    drifted = copy.deepcopy(kraken_ticker)
+    for ticker in drifted["result"].values():
+        ticker["o"] = ["not", "a", "price"]
+
+    results = [model(drifted) for _ in range(6)]
+
+    # first response is sampled and fails, following ones are validated until one passes
+    assert all(isinstance(r, Err) for r in results)
+    assert policy.failed == policy.validated == 6
+
+    assert isinstance(model(kraken_ticker), Ok)
+    assert isinstance(model(drifted), Ok)   # back to sampling, not validated
+    assert policy.skipped == 1
+
+
+def test_unsupported_model_is_always_validated():
+
+    class _Wrapper:
+        def __call__(self, response):
+            return TickerResp()(response)
+
+    model = KrakenFullResponse(_Wrapper(), validation="trusted")
+    assert isinstance(model(kraken_ticker), Ok)
+    assert model.validation.validated == 1
+
+
+def test_model_instance_wrapper_is_always_validated():
+
+    # inherits `BaseModel.construct`, which is not a trusted path
+    class _Wrapper(pydantic.BaseModel):
+        def __call__(self, response):
+            return TickerResp()(response)
+
+    model = KrakenFullResponse(_Wrapper(), validation="trusted")
+    result = model(kraken_ticker)
+    assert isinstance(result, Ok)
+    assert isinstance(getattr(result.value, next(iter(kraken_ticker["result"]))), _Ticker)
+    assert model.validation.validated == 1